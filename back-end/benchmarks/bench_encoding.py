@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark payload size and encode time of the history response formats
+"""
+
+import sys
+import os
+import timeit
+
+import numpy as np
+from fastapi.responses import JSONResponse
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.candles import Candles
+from utils.encoding import EncodedCache, encode_candles, unpack_columns, RECORDS_JSON, COLUMNS_JSON, BINARY
+
+def make_candles(count, seed=0):
+    rng = np.random.default_rng(seed)
+    close = np.round(np.cumsum(rng.normal(0, 300, count)) + 50000, 2)
+    volume = np.round(rng.uniform(10_000, 40_000, count), 5)
+    return Candles(
+        open_time=1_700_000_000_000 + np.arange(count, dtype=np.int64) * 86_400_000,
+        open=np.round(close * rng.uniform(0.98, 1.02, count), 2),
+        high=np.round(close * 1.03, 2),
+        low=np.round(close * 0.97, 2),
+        close=close,
+        volume=volume,
+        quote_volume=np.round(volume * close, 8),
+        trades=rng.integers(1_000_000, 5_000_000, count),
+    )
+
+def best_of(func, repeat=5):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def main():
+    print(f"{'candles':>8} {'format':<28} {'bytes':>9} {'encode (ms)':>12}")
+
+    for count in (90, 1000):
+        candles = make_candles(count)
+        df = candles.to_frame()
+        cache = EncodedCache()
+        cache.get("key", 1, lambda: encode_candles(candles, BINARY))
+
+        decoded = unpack_columns(encode_candles(candles, BINARY))
+        assert np.array_equal(decoded["Close"], candles.close), "Binary round trip must be exact"
+
+        cases = [
+            ("DataFrame records (before)", lambda: JSONResponse(content=df.copy().to_dict(orient="records")).body),
+            ("JSON records", lambda: encode_candles(candles, RECORDS_JSON)),
+            ("JSON columns", lambda: encode_candles(candles, COLUMNS_JSON)),
+            ("binary columns", lambda: encode_candles(candles, BINARY)),
+            ("cached (any format)", lambda: cache.get("key", 1, None)),
+        ]
+        for name, func in cases:
+            size = len(func())
+            print(f"{count:>8} {name:<28} {size:>9} {best_of(func) * 1e3:>12.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark event-loop latency for live updates while long histories are requested,
+with the heavy work inline versus offloaded to the bounded executors
+"""
+
+import asyncio
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_encoding import make_candles
+from core.executors import blocking, compute, shutdown_executors
+from services.indicator_engine import IndicatorEngine
+from utils.encoding import encode_candles, RECORDS_JSON
+from utils.http_cache import EncodedBody
+
+TICK = 0.001  # A live update is due every millisecond
+REQUESTS = 20
+
+def history_body(candles):
+    encoded = EncodedBody(encode_candles(candles, RECORDS_JSON))
+    encoded.variant("gzip")
+    return encoded
+
+async def inline_request(candles):
+    history_body(candles)
+    IndicatorEngine.from_candles(candles)
+
+async def offloaded_request(candles):
+    encoded = EncodedBody(await compute.run(encode_candles, candles, RECORDS_JSON))
+    await blocking.run(encoded.variant, "gzip")
+    await compute.run(IndicatorEngine.from_candles, candles)
+
+async def measure(request, candles):
+    """Lateness of 1ms live ticks while REQUESTS history requests are served"""
+    lateness = []
+    done = False
+
+    async def ticker():
+        while not done:
+            due = time.perf_counter() + TICK
+            await asyncio.sleep(TICK)
+            lateness.append(time.perf_counter() - due)
+
+    tick_task = asyncio.ensure_future(ticker())
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        await request(candles)
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+    done = True
+    await tick_task
+    return np.percentile(lateness, 50) * 1e3, np.percentile(lateness, 99) * 1e3, max(lateness) * 1e3, elapsed * 1e3
+
+async def run():
+    print(f"{'candles':>8} {'mode':<10} {'tick p50 (ms)':>14} {'tick p99 (ms)':>14} {'tick max (ms)':>14} {'requests (ms)':>14}")
+    await offloaded_request(make_candles(10))  # Start the pools before timing
+    for count in (90, 3000):
+        candles = make_candles(count)
+        for name, request in (("inline", inline_request), ("offloaded", offloaded_request)):
+            p50, p99, worst, elapsed = await measure(request, candles)
+            print(f"{count:>8} {name:<10} {p50:>14.3f} {p99:>14.3f} {worst:>14.3f} {elapsed:>14.1f}")
+    shutdown_executors()
+
+if __name__ == "__main__":
+    asyncio.run(run())
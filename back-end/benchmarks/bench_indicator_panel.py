@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark indicators for many symbols: one engine per symbol versus one vectorized panel
+"""
+
+import sys
+import os
+import timeit
+
+import numpy as np
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_encoding import make_candles
+from services.indicator_engine import IndicatorEngine
+from services.indicator_panel import IndicatorPanel
+from utils.data_loader import calculate_rsi_wilder
+
+def best_of(func, repeat=5):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def pandas_row(df):
+    """One full recomputation per symbol, as calculate_indicators originally did"""
+    close = df["Close"]
+    sma = close.rolling(window=14).mean()
+    ema = close.ewm(span=14, adjust=False).mean()
+    rsi = calculate_rsi_wilder(close, 14)
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    signal = macd.ewm(span=9, adjust=False).mean()
+    return sma.iloc[-1], ema.iloc[-1], rsi.iloc[-1], macd.iloc[-1], signal.iloc[-1]
+
+def main():
+    print(f"{'symbols':>8} {'method':<28} {'seed (ms)':>10} {'evaluate (ms)':>14}")
+
+    for count in (3, 50, 200):
+        candles_list = [make_candles(30, seed) for seed in range(count)]
+        frames = [candles.to_frame() for candles in candles_list]
+        closes = np.array([candles.close[-1] for candles in candles_list]) * 1.001
+        engines = [IndicatorEngine.from_candles(candles) for candles in candles_list]
+        panel = IndicatorPanel.from_candles(candles_list)
+
+        cases = [
+            ("pandas per symbol", None, lambda: [pandas_row(df) for df in frames]),
+            ("engine per symbol",
+             lambda: [IndicatorEngine.from_candles(candles) for candles in candles_list],
+             lambda: [engine.evaluate(close) for engine, close in zip(engines, closes.tolist())]),
+            ("panel", lambda: IndicatorPanel.from_candles(candles_list), lambda: panel.evaluate(closes)),
+        ]
+        for name, seed, evaluate in cases:
+            seed_ms = f"{best_of(seed) * 1e3:>10.3f}" if seed is not None else f"{'-':>10}"
+            print(f"{count:>8} {name:<28} {seed_ms} {best_of(evaluate) * 1e3:>14.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark the vectorized Wilder RSI against the original per-element loop
+"""
+
+import sys
+import os
+import timeit
+
+import numpy as np
+import pandas as pd
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_loader import calculate_rsi_wilder, rsi_wilder
+
+def calculate_rsi_wilder_loop(prices: pd.Series, period: int = 14) -> pd.Series:
+    """The previous .iloc based implementation, kept as the reference"""
+    delta = prices.diff()
+    gain = delta.where(delta > 0, 0.0)
+    loss = -delta.where(delta < 0, 0.0)
+    avg_gain = gain.rolling(window=period, min_periods=period).mean()
+    avg_loss = loss.rolling(window=period, min_periods=period).mean()
+    rsi = pd.Series(index=prices.index, dtype=float)
+    avg_gain.iloc[period] = gain.iloc[:period+1].mean()
+    avg_loss.iloc[period] = loss.iloc[:period+1].mean()
+    for i in range(period+1, len(prices)):
+        avg_gain.iloc[i] = (avg_gain.iloc[i-1] * (period - 1) + gain.iloc[i]) / period
+        avg_loss.iloc[i] = (avg_loss.iloc[i-1] * (period - 1) + loss.iloc[i]) / period
+        rs = avg_gain.iloc[i] / avg_loss.iloc[i] if avg_loss.iloc[i] != 0 else 0
+        rsi.iloc[i] = 100 - (100 / (1 + rs))
+    return rsi
+
+def best_of(func, repeat=5):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def main():
+    rng = np.random.default_rng(42)
+    print(f"{'candles':>8} {'loop (ms)':>12} {'vectorized (ms)':>16} {'speedup':>9} {'50 symbols 2-D (ms)':>20}")
+
+    for candles in (30, 365, 3000):
+        prices = pd.Series(np.round(np.cumsum(rng.normal(0, 300, candles)) + 50000, 2))
+        panel = np.round(np.cumsum(rng.normal(0, 300, (candles, 50)), axis=0) + 50000, 2)
+
+        expected = calculate_rsi_wilder_loop(prices)
+        assert calculate_rsi_wilder(prices).equals(expected), "Vectorized RSI must match the loop exactly"
+        for column in range(panel.shape[1]):
+            assert np.array_equal(rsi_wilder(panel)[:, column], rsi_wilder(panel[:, column]), equal_nan=True)
+
+        loop_time = best_of(lambda: calculate_rsi_wilder_loop(prices), repeat=3)
+        fast_time = best_of(lambda: calculate_rsi_wilder(prices))
+        panel_time = best_of(lambda: rsi_wilder(panel))
+        print(f"{candles:>8} {loop_time * 1e3:>12.3f} {fast_time * 1e3:>16.3f} {loop_time / fast_time:>8.0f}x {panel_time * 1e3:>20.3f}")
+
+if __name__ == "__main__":
+    main()
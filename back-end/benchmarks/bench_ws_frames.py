@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark encode cost and bytes on the wire of JSON versus binary WebSocket frames
+"""
+
+import sys
+import os
+import timeit
+import zlib
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_encoding import make_candles
+from services.delta_feed import DeltaFeed
+from utils.frames import BINARY_FRAMES, JSON_FRAMES, encode_message, encode_price, encode_rows
+
+def best_of(func, repeat=5):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def deflated_size(frame):
+    """Size after permessage-deflate without context takeover (what a JSON frame costs when negotiated)"""
+    if isinstance(frame, str):
+        frame = frame.encode("utf-8")
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    return len(compressor.compress(frame) + compressor.flush())
+
+def main():
+    records = make_candles(90).to_records()
+    row = {"timestamp": records[-1]["timestamp"], "SMA": 64210.5, "EMA": 64380.25, "RSI": 58.3,
+           "MACD": 120.4, "MACD_Signal": 98.7, "Signal": 0}
+
+    feed = DeltaFeed()
+    snapshot = feed.update(records)
+    delta = feed.update(records[:-1] + [dict(records[-1], Close=records[-1]["Close"] + 1)])
+
+    cases = [
+        ("live-price", lambda fmt: encode_price("BTC", 64321.5, 1_750_000_000.123, fmt)),
+        ("data row", lambda fmt: encode_rows([row], fmt)),
+        ("raw-data full (90)", lambda fmt: encode_rows(records, fmt)),
+        ("raw-data snapshot", lambda fmt: encode_message(snapshot, fmt)),
+        ("raw-data delta", lambda fmt: encode_message(delta, fmt)),
+    ]
+
+    print(f"{'payload':<20} {'json':>7} {'json+deflate':>13} {'binary':>7} {'json (us)':>10} {'binary (us)':>12}")
+    for name, encode in cases:
+        text, binary = encode(JSON_FRAMES), encode(BINARY_FRAMES)
+        json_time = best_of(lambda: encode(JSON_FRAMES)) * 1e6
+        binary_time = best_of(lambda: encode(BINARY_FRAMES)) * 1e6
+        print(f"{name:<20} {len(text.encode()):>7} {deflated_size(text):>13} {len(binary):>7} "
+              f"{json_time:>10.1f} {binary_time:>12.1f}")
+
+if __name__ == "__main__":
+    main()
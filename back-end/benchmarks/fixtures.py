@@ -0,0 +1,151 @@
+"""
+Offline fixtures for the benchmark suite: recorded klines, a fake Binance REST client,
+trade streams and WebSocket clients that only count what they are sent
+"""
+
+import bisect
+import json
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import DATA_DIR
+from utils.candle_file import read_csv_candles
+from utils.candles import Candles, FIELDS
+
+DAY_MS = 86_400_000
+# Trade streams captured from Binance by benchmarks/record_trades.py
+RECORDINGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings")
+
+def today_ms():
+    now_ms = int(time.time() * 1000)
+    return now_ms - now_ms % DAY_MS
+
+def recorded_candles(symbol="BTCUSDT"):
+    """Daily candles recorded from Binance (data/{symbol}.csv)"""
+    return read_csv_candles(os.path.join(DATA_DIR, f"{symbol}.csv"))
+
+def history(count, symbol="BTCUSDT"):
+    """``count`` daily candles ending with today's, built from the recorded ones.
+
+    The recording is used as is for its most recent days; older days replay its
+    day-over-day moves backwards, cyclically and without their trend, so long
+    histories keep realistic prices.
+    Timestamps are moved to end today, so the kline store treats them as current.
+    """
+    recorded = recorded_candles(symbol)
+    n = len(recorded)
+    source = (np.arange(count) - count) % n  # Recorded row each day is modelled on
+    moves = recorded.close[1:] / recorded.close[:-1]
+    drift = np.exp(np.log(moves).mean())  # Taken out of the replayed moves, so prices don't trend away
+
+    close = np.empty(count)
+    close[-1] = recorded.close[-1]
+    for day in range(count - 2, -1, -1):
+        move = moves[(source[day + 1] - 1) % (n - 1)]
+        close[day] = close[day + 1] / (move if day >= count - n else move / drift)
+    scale = close / recorded.close[source]
+
+    return Candles(
+        open_time=today_ms() - np.arange(count - 1, -1, -1, dtype=np.int64) * DAY_MS,
+        open=np.round(recorded.open[source] * scale, 2),
+        high=np.round(recorded.high[source] * scale, 2),
+        low=np.round(recorded.low[source] * scale, 2),
+        close=np.round(close, 2),
+        volume=recorded.volume[source],
+        quote_volume=recorded.quote_volume[source],
+        trades=recorded.trades[source],
+    )
+
+def kline_rows(candles):
+    """Candles as rows of the Binance klines endpoint, strings where Binance sends strings"""
+    columns = {name: getattr(candles, name).tolist() for name, _, _ in FIELDS}
+    return [
+        [open_time, str(open_), str(high), str(low), str(close), str(volume), open_time + DAY_MS - 1,
+         str(quote_volume), trades, "0", "0", "0"]
+        for open_time, open_, high, low, close, volume, quote_volume, trades in zip(*columns.values())
+    ]
+
+class FakeBinance:
+    """Serves ``days`` of daily klines per symbol in place of the shared REST client"""
+
+    def __init__(self, days=3000):
+        self.days = days
+        self.rows = {}  # {symbol: kline rows}
+        self.open_times = {}
+        self.requests = 0
+        self._original = None
+
+    def _rows(self, symbol):
+        if symbol not in self.rows:
+            rows = self.rows[symbol] = kline_rows(history(self.days))
+            self.open_times[symbol] = [row[0] for row in rows]
+        return self.rows[symbol]
+
+    async def get_historical_klines(self, symbol, interval, start_ms=None, end_ms=None):
+        self.requests += 1
+        rows = self._rows(symbol)
+        open_times = self.open_times[symbol]
+        first = 0 if start_ms is None else bisect.bisect_left(open_times, start_ms)
+        last = len(rows) if end_ms is None else bisect.bisect_right(open_times, end_ms)
+        return rows[first:last]
+
+    def install(self):
+        from utils.binance_rest import client
+        self._original = client.get_historical_klines
+        client.get_historical_klines = self.get_historical_klines
+
+    def uninstall(self):
+        from utils.binance_rest import client
+        if self._original is not None:
+            client.get_historical_klines = self._original
+            self._original = None
+
+def trade_stream(symbol="BTCUSDT", count=1000, seed=0):
+    """Trade payloads as the stream delivers them, priced around the last recorded close.
+
+    A recording from benchmarks/record_trades.py is replayed when there is one, scaled
+    so its first trade matches the close; otherwise a seeded random walk stands in.
+    """
+    last_close = float(recorded_candles(symbol).close[-1])
+    path = os.path.join(RECORDINGS_DIR, f"{symbol}_trades.jsonl")
+    if os.path.exists(path):
+        with open(path) as f:
+            recorded = [json.loads(line) for line in f if line.strip()]
+        scale = last_close / float(recorded[0]["p"])
+        return [
+            {**payload, "p": f"{float(payload['p']) * scale:.2f}"}
+            for payload in (recorded[index % len(recorded)] for index in range(count))
+        ]
+
+    rng = np.random.default_rng(seed)
+    prices = last_close * np.exp(np.cumsum(rng.normal(0, 0.0002, count)))
+    quantities = rng.lognormal(-5, 1.5, count)
+    times = today_ms() + np.cumsum(rng.integers(0, 50, count))
+    return [
+        {"e": "trade", "s": symbol, "p": f"{price:.2f}", "q": f"{quantity:.5f}", "T": int(trade_time)}
+        for price, quantity, trade_time in zip(prices, quantities, times)
+    ]
+
+class CountingWebSocket:
+    """A connected client that accepts every frame at once and only counts them"""
+
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+
+    async def send_text(self, frame):
+        self.frames += 1
+        self.bytes += len(frame)
+
+    async def send_bytes(self, frame):
+        self.frames += 1
+        self.bytes += len(frame)
+
+    async def close(self, code=1000):
+        pass
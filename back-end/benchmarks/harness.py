@@ -0,0 +1,147 @@
+"""
+Benchmark registry, timing and statistics for the offline suite (benchmarks/suite.py)
+"""
+
+import asyncio
+import gc
+import itertools
+import math
+import platform
+import statistics
+import sys
+import os
+import time
+
+# Registered benchmarks, in definition order: [(name, setup, {param: [values]})]
+_benchmarks = []
+
+# A sample times enough calls to take at least this long, so timer resolution doesn't matter
+MIN_SAMPLE_SECONDS = 0.02
+SAMPLES = 15
+# Significance level of the rank test that separates a real change from noise
+ALPHA = 0.01
+
+def benchmark(name, **params):
+    """Register an async generator as a benchmark, run once per combination of ``params``.
+
+    The generator does its setup, yields the function to time (sync or async, no
+    arguments), and does its teardown when resumed:
+
+        @benchmark("api_to_df/hit", days=[30, 365])
+        async def api_to_df_hit(days):
+            await api_to_df("BTCUSDT", days)
+            yield lambda: api_to_df("BTCUSDT", days)
+    """
+    def register(setup):
+        _benchmarks.append((name, setup, params))
+        return setup
+    return register
+
+def cases(pattern=None):
+    """[(case name, setup, kwargs)] for every registered benchmark and parameter combination"""
+    found = []
+    for name, setup, params in _benchmarks:
+        for values in itertools.product(*params.values()):
+            kwargs = dict(zip(params, values))
+            case = name + "".join(f"[{key}={value}]" for key, value in kwargs.items())
+            if pattern is None or pattern in case:
+                found.append((case, setup, kwargs))
+    return found
+
+async def _time_calls(func, number):
+    # Timed with the collector off, like timeit: a collection landing in one sample is noise
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        if asyncio.iscoroutinefunction(func):
+            started = time.perf_counter()
+            for _ in range(number):
+                await func()
+            return time.perf_counter() - started
+        started = time.perf_counter()
+        for _ in range(number):
+            result = func()
+            if asyncio.iscoroutine(result):
+                await result
+        return time.perf_counter() - started
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+async def measure(func, samples=SAMPLES, min_sample=MIN_SAMPLE_SECONDS):
+    """(seconds per call for each sample, calls per sample), after a calibration run that also warms up"""
+    number = 1
+    while True:
+        elapsed = await _time_calls(func, number)
+        if elapsed >= min_sample:
+            break
+        number = number * 10 if elapsed < min_sample / 10 else number * 2
+    times = []
+    for _ in range(samples):
+        gc.collect()
+        times.append(await _time_calls(func, number) / number)
+    return times, number
+
+async def run_case(setup, kwargs, samples=SAMPLES):
+    steps = setup(**kwargs)
+    func = await steps.__anext__()
+    try:
+        return await measure(func, samples)
+    finally:
+        await anext(steps, None)  # Teardown
+
+def summarize(times):
+    q1, median, q3 = statistics.quantiles(times, n=4, method="inclusive")
+    return {"median": median, "q1": q1, "q3": q3, "min": min(times), "samples": len(times)}
+
+def mann_whitney(a, b):
+    """Two-sided p-value of the Mann-Whitney U test (normal approximation with tie correction).
+
+    Rank based, so a few outlier samples from a busy machine don't decide the outcome.
+    """
+    n1, n2 = len(a), len(b)
+    pooled = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+    ranks = [0.0] * len(pooled)
+    ties = 0.0
+    index = 0
+    while index < len(pooled):
+        end = index
+        while end + 1 < len(pooled) and pooled[end + 1][0] == pooled[index][0]:
+            end += 1
+        rank = (index + end) / 2 + 1
+        for position in range(index, end + 1):
+            ranks[position] = rank
+        count = end - index + 1
+        ties += count ** 3 - count
+        index = end + 1
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, pooled) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return max(0.0, min(1.0, math.erfc(z / math.sqrt(2))))
+
+def compare(times, baseline_times, tolerance):
+    """("faster" | "slower" | "same", median ratio): a change counts only if it is significant and beyond ``tolerance``"""
+    ratio = statistics.median(times) / statistics.median(baseline_times)
+    if abs(ratio - 1) <= tolerance or mann_whitney(times, baseline_times) >= ALPHA:
+        return "same", ratio
+    return ("slower" if ratio > 1 else "faster"), ratio
+
+def environment():
+    """Where a baseline was recorded; comparisons across machines are only indicative"""
+    return {
+        "python": platform.python_version(),
+        "implementation": sys.implementation.name,
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "cpus": os.cpu_count(),
+    }
+
+def format_seconds(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+End-to-end WebSocket load test: the app under uvicorn, fed by a local Binance stand-in trading at
+a fixed rate, serving thousands of clients across /ws/live-price, /ws/data and /ws/raw-data.
+Reports tick-to-client latency, throughput, server memory per connection and CPU (Linux only)
+
+    python benchmarks/load_test.py                                    # 1000 clients, 50 trades/s, 30 s
+    python benchmarks/load_test.py --clients 5000 --rate 200 --duration 60
+    python benchmarks/load_test.py --mix live-price=1 --send-interval 0 --output report.json
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import resource
+import socket
+import subprocess
+import sys
+import os
+import time
+import urllib.request
+
+import websockets
+
+BACK_END = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Add the back-end directory to Python path
+sys.path.append(BACK_END)
+
+from benchmarks.mock_binance import MockBinance
+from services.subscriptions import PING_MESSAGE
+
+ENDPOINTS = ("live-price", "data", "raw-data")
+PONG_MESSAGE = json.dumps({"type": "pong"})
+PERCENTILES = (("p50", 0.5), ("p99", 0.99), ("p999", 0.999))
+READY_TIMEOUT = 60.0
+
+class EndpointStats:
+    def __init__(self):
+        self.clients = 0
+        self.connected = 0
+        self.failed = 0
+        self.dropped = 0  # Closed by the server while the test was running
+        self.frames = 0
+        self.bytes = 0
+        self.latencies = []
+        self.untraced = []  # (ticker, wall time, monotonic time) of frames timed after the run
+        self.lower_bound = False
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+def parse_mix(value):
+    """{endpoint: weight} from "live-price=6,data=3,raw-data=1" """
+    mix = {}
+    for item in value.split(","):
+        endpoint, _, weight = item.partition("=")
+        if endpoint.strip() not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint {endpoint.strip()!r}, expected one of {', '.join(ENDPOINTS)}")
+        mix[endpoint.strip()] = float(weight or 1)
+    return mix
+
+def split_clients(total, mix):
+    """Clients per endpoint, proportional to the weights (largest remainder)"""
+    weight = sum(mix.values())
+    shares = {endpoint: total * share / weight for endpoint, share in mix.items()}
+    counts = {endpoint: int(share) for endpoint, share in shares.items()}
+    for endpoint in sorted(shares, key=lambda endpoint: counts[endpoint] - shares[endpoint])[:total - sum(counts.values())]:
+        counts[endpoint] += 1
+    return counts
+
+def raise_fd_limit(needed):
+    # Every client holds a socket here and another one in the server
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    if hard != resource.RLIM_INFINITY and hard < needed:
+        print(f"⚠️ Open file limit is {hard}, {needed} clients will not all connect (raise it with ulimit -n)")
+
+def rss_bytes(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+
+def cpu_seconds(pid):
+    """User + system CPU time of a process, from /proc/<pid>/stat"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(mock, symbols, port, send_interval):
+    env = {
+        **os.environ,
+        "BINANCE_STREAM_URL": mock.stream_url,
+        "BINANCE_REST_URL": mock.rest_url,
+        "SYMBOL_UNIVERSE": ",".join(symbols),
+        "PINNED_SYMBOLS": ",".join(symbols),
+        "INGEST_MODE": "local",
+        "KLINE_DATA_DIR": "",  # Candles come from the stand-in, nothing is written to disk
+    }
+    if send_interval is not None:
+        env["WS_SEND_INTERVAL"] = str(send_interval)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACK_END, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+def _is_ready(url):
+    try:
+        with urllib.request.urlopen(f"{url}/api/ready", timeout=1) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+async def wait_ready(server, url, mock):
+    """Until the caches are warm and the upstream stream is connected to the stand-in"""
+    started = time.monotonic()
+    while time.monotonic() - started < READY_TIMEOUT:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+        if mock.connections and await asyncio.to_thread(_is_ready, url):
+            return
+        await asyncio.sleep(0.1)
+    raise RuntimeError(f"The app was not ready within {READY_TIMEOUT:.0f}s")
+
+class LoadTest:
+    def __init__(self, mock, url, connect_concurrency):
+        self.mock = mock
+        self.url = url.replace("http://", "ws://")
+        self.stats = {endpoint: EndpointStats() for endpoint in ENDPOINTS}
+        self.recording = False
+        self.closing = False
+        self.handled = {}  # {ticker: [(server time a trade was handled, monotonic time it was sent)]}
+        self._connect_slots = asyncio.Semaphore(connect_concurrency)
+
+    async def client(self, endpoint, symbol):
+        stats = self.stats[endpoint]
+        ticker = f"{symbol}USDT"
+        sent = self.mock.sent
+        try:
+            async with self._connect_slots:
+                ws = await websockets.connect(f"{self.url}/ws/{endpoint}?ticker={ticker}",
+                                              open_timeout=30, ping_interval=None, max_size=None)
+        except (OSError, asyncio.TimeoutError, websockets.WebSocketException):
+            stats.failed += 1
+            return
+        stats.connected += 1
+        try:
+            async for frame in ws:
+                received = time.monotonic()
+                if frame == PING_MESSAGE:
+                    await ws.send(PONG_MESSAGE)
+                    continue
+                if endpoint == "live-price":
+                    # Prices are unique per trade, and the timestamp is when the server handled it;
+                    # traced from the warm-up on, for the first data frames measured
+                    message = json.loads(frame)
+                    trade_sent = sent.get(ticker, {}).get(message["price"])
+                    handled = self.handled.setdefault(ticker, [])
+                    if trade_sent is not None and (not handled or trade_sent > handled[-1][1]):
+                        handled.append((message["timestamp"], trade_sent))  # Once per trade
+                if not self.recording:
+                    continue
+                stats.frames += 1
+                stats.bytes += len(frame)
+                if endpoint != "live-price":
+                    stats.untraced.append((ticker, time.time(), received))
+                elif trade_sent is not None:
+                    stats.latencies.append(received - trade_sent)
+        except websockets.ConnectionClosed:
+            if not self.closing:
+                stats.dropped += 1
+        finally:
+            await ws.close()
+
+    def trace(self):
+        """Time data and raw-data frames from the trade they follow.
+
+        They don't say which trade that is, but every trade's frames are built when the
+        server handles it and an outbox only sends its newest frame: a frame follows the
+        newest trade handled before it arrived, learnt from the live-price frames. Symbols
+        without live-price clients are timed from their newest trade sent (a lower bound).
+        """
+        for endpoint, stats in self.stats.items():
+            for ticker, arrived, received in stats.untraced:
+                trades = self.handled.get(ticker)
+                index = bisect.bisect_right(trades, (arrived, float("inf"))) if trades else 0
+                if index:
+                    stats.latencies.append(received - trades[index - 1][1])
+                else:
+                    stats.lower_bound = True
+                    trade_sent = self.mock.latest_before(ticker, received)
+                    if trade_sent is not None:
+                        stats.latencies.append(received - trade_sent)
+            stats.untraced.clear()
+
+    def summary(self, duration):
+        rows = {}
+        for endpoint, stats in [*self.stats.items(), ("all", None)]:
+            if stats is None:
+                stats = EndpointStats()
+                for part in self.stats.values():
+                    for field in ("clients", "connected", "failed", "dropped", "frames", "bytes"):
+                        setattr(stats, field, getattr(stats, field) + getattr(part, field))
+                    stats.latencies += part.latencies
+                    stats.lower_bound |= part.lower_bound
+            if not stats.clients:
+                continue
+            ordered = sorted(stats.latencies)
+            rows[endpoint] = {
+                "clients": stats.clients, "connected": stats.connected, "failed": stats.failed, "dropped": stats.dropped,
+                "frames_per_second": stats.frames / duration, "bytes_per_second": stats.bytes / duration,
+                "latency": {name: percentile(ordered, fraction) for name, fraction in PERCENTILES},
+                "latency_lower_bound": stats.lower_bound,
+            }
+        return rows
+
+def format_latency(seconds, lower_bound=False):
+    return "-" if seconds is None else f"{'≥' if lower_bound else ''}{seconds * 1000:.1f} ms"
+
+def format_bytes(count):
+    for unit, scale in (("GB", 1 << 30), ("MB", 1 << 20), ("KB", 1 << 10)):
+        if count >= scale:
+            return f"{count / scale:.1f} {unit}"
+    return f"{count:.0f} B"
+
+def print_report(report):
+    print(f"\n{'endpoint':<12} {'clients':>8} {'failed':>7} {'dropped':>8} {'frames/s':>10} {'bytes/s':>10} "
+          f"{'p50':>10} {'p99':>10} {'p999':>10}")
+    for endpoint, row in report["endpoints"].items():
+        latencies = [format_latency(row["latency"][name], row["latency_lower_bound"]) for name, _ in PERCENTILES]
+        print(f"{endpoint:<12} {row['connected']:>8} {row['failed']:>7} {row['dropped']:>8} "
+              f"{row['frames_per_second']:>10.0f} {format_bytes(row['bytes_per_second']):>10} "
+              + " ".join(f"{latency:>10}" for latency in latencies))
+    if report["endpoints"]["all"]["latency_lower_bound"]:
+        print("   ≥: some symbols had no live-price clients to trace trades through, timed from their newest trade")
+
+    server = report["server"]
+    print(f"\n📈 Trades sent: {report['trades_per_second']:.1f}/s")
+    if server["rss_idle"] is not None:
+        print(f"🧠 Server RSS: {format_bytes(server['rss_idle'])} idle, {format_bytes(server['rss_connected'])} with clients, "
+              f"{format_bytes(server['rss_end'])} at the end ({format_bytes(server['bytes_per_connection'])} per connection)")
+        print(f"⚙️ Server CPU: {server['cpu_percent']:.0f}% of one core")
+    print(f"⚙️ Load generator CPU: {report['load_generator_cpu_percent']:.0f}% of one core")
+    if report["load_generator_cpu_percent"] > 90:
+        print("⚠️ The load generator is saturated: latencies include its own queueing; use fewer clients per run")
+    elif (server["cpu_percent"] or 0) + report["load_generator_cpu_percent"] > 90 * os.cpu_count():
+        print(f"⚠️ The app and the load generator used all {os.cpu_count()} CPU(s) between them: latencies include that contention")
+
+async def run(args):
+    counts = split_clients(args.clients, args.mix)
+    raise_fd_limit(args.clients + 100)
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+
+    async with MockBinance(rate=args.rate) as mock:
+        server = start_server(mock, args.symbols, port, args.send_interval)
+        test = LoadTest(mock, url, args.connect_concurrency)
+        tasks = []
+        try:
+            print(f"🚀 Starting the app against the Binance stand-in ({mock.rest_url})...")
+            await wait_ready(server, url, mock)
+            mock.start_trading()
+            await asyncio.sleep(args.warmup)
+            rss_idle = rss_bytes(server.pid)
+
+            mix = ", ".join(f"{endpoint} {count}" for endpoint, count in counts.items())
+            print(f"🔌 Connecting {args.clients} clients ({mix}) on {', '.join(args.symbols)}...")
+            started = time.monotonic()
+            for endpoint, count in counts.items():
+                test.stats[endpoint].clients = count
+                for index in range(count):
+                    symbol = args.symbols[index % len(args.symbols)]
+                    tasks.append(asyncio.create_task(test.client(endpoint, symbol)))
+            while sum(stats.connected + stats.failed for stats in test.stats.values()) < args.clients:
+                await asyncio.sleep(0.05)
+            print(f"   Connected in {time.monotonic() - started:.1f}s")
+            await asyncio.sleep(args.warmup)
+            rss_connected = rss_bytes(server.pid)
+
+            print(f"⏱️ Measuring for {args.duration:.0f}s at {args.rate:g} trades/s...")
+            trades, server_cpu, own_cpu = mock.trades, cpu_seconds(server.pid), time.process_time()
+            test.recording = True
+            started = time.monotonic()
+            await asyncio.sleep(args.duration)
+            test.recording = False
+            duration = time.monotonic() - started
+            trades, own_cpu = mock.trades - trades, time.process_time() - own_cpu
+            server_cpu = cpu_seconds(server.pid) - server_cpu if server_cpu is not None else None
+            rss_end = rss_bytes(server.pid)
+            test.trace()
+        finally:
+            test.closing = True
+            await mock.stop_trading()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            server.terminate()
+            server.wait()
+
+    connected = sum(stats.connected for stats in test.stats.values())
+    return {
+        "clients": args.clients,
+        "symbols": args.symbols,
+        "rate": args.rate,
+        "send_interval": args.send_interval,
+        "duration": duration,
+        "trades_per_second": trades / duration,
+        "endpoints": test.summary(duration),
+        "server": {
+            "rss_idle": rss_idle,
+            "rss_connected": rss_connected,
+            "rss_end": rss_end,
+            "bytes_per_connection": (rss_connected - rss_idle) / connected if rss_idle is not None and connected else None,
+            "cpu_percent": server_cpu / duration * 100 if server_cpu is not None else None,
+        },
+        "load_generator_cpu_percent": own_cpu / duration * 100,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end WebSocket load test against a local Binance stand-in")
+    parser.add_argument("--clients", type=int, default=1000, help="Concurrent WebSocket clients")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("live-price=6,data=3,raw-data=1"),
+                        help="Share of clients per endpoint (default live-price=6,data=3,raw-data=1)")
+    parser.add_argument("--symbols", type=lambda value: value.upper().split(","), default=["BTC", "ETH", "ADA"],
+                        help="Base assets the clients watch and the stand-in trades")
+    parser.add_argument("--rate", type=float, default=50.0, help="Trades per second, spread over the symbols")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds measured")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Seconds before each memory reading and the measurement")
+    parser.add_argument("--send-interval", type=float, help="WS_SEND_INTERVAL for the app (default: the app's setting)")
+    parser.add_argument("--connect-concurrency", type=int, default=200, help="Handshakes in flight at once")
+    parser.add_argument("--output", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=1)
+        print(f"\n💾 Report saved to {args.output}")
+
+    totals = report["endpoints"]["all"]
+    if totals["failed"] or totals["dropped"]:
+        print(f"\n❌ {totals['failed']} client(s) failed to connect, {totals['dropped']} dropped by the server")
+        return False
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,189 @@
+"""
+Local stand-in for the Binance endpoints the app uses, for the load test (benchmarks/load_test.py):
+klines, 24h ticker and exchange info over REST, and the combined trade stream with
+SUBSCRIBE/UNSUBSCRIBE, emitting trades at a fixed rate
+"""
+
+import asyncio
+import bisect
+import json
+import sys
+import os
+import time
+from collections import OrderedDict
+
+from aiohttp import web, WSMsgType
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import history, trade_stream
+from utils.binance_rest import INTERVAL_MS
+
+# Intraday klines served per interval: the 1m stats window needs 24h, the aggregator up to 1000
+INTRADAY_KLINES = 1500
+# Emission times kept per symbol to match live-price frames against
+SENT_HISTORY = 100_000
+# Trade sequence numbers go in the last 6 of 8 price decimals, so every price is unique
+SEQUENCE_DIGITS = 6
+
+class MockBinance:
+    """Binance REST and combined stream on one local port, trading at ``rate`` trades/s.
+
+    Trades are spread round-robin over every stream some upstream connection
+    subscribed to. Each trade's price is unique per symbol, so a frame carrying
+    a price can be traced back to the moment its trade was sent (``sent``).
+    """
+
+    def __init__(self, rate=100.0, days=400):
+        self.rate = rate
+        self.days = days
+        self.connections = {}  # {upstream websocket: set of streams}
+        self.sent = {}  # {ticker: OrderedDict {price: monotonic time sent}}
+        self._times = {}  # {ticker: monotonic times its recent trades were sent, in order}
+        self.trades = 0
+        self._klines = {}  # {(ticker, interval): (open times, rows)}
+        self._replay = {}  # {ticker: recorded or generated trades}
+        self._emitter = None
+        self.app = web.Application()
+        self.app.router.add_get("/api/v3/klines", self.klines)
+        self.app.router.add_get("/api/v3/ticker/24hr", self.ticker)
+        self.app.router.add_get("/api/v3/exchangeInfo", self.exchange_info)
+        self.app.router.add_get("/stream", self.stream)
+
+    def _rows(self, ticker, interval):
+        # Every symbol trades like the BTC recording; intraday intervals reuse its daily moves
+        if (ticker, interval) not in self._klines:
+            step = INTERVAL_MS[interval]
+            count = self.days if interval == "1d" else INTRADAY_KLINES
+            candles = history(count)
+            now_ms = int(time.time() * 1000)
+            open_times = (now_ms - now_ms % step - (count - 1 - index) * step for index in range(count))
+            rows = [
+                [open_time, str(open_), str(high), str(low), str(close), str(volume), open_time + step - 1,
+                 str(quote_volume), trades, "0", "0", "0"]
+                for open_time, open_, high, low, close, volume, quote_volume, trades in zip(
+                    open_times, candles.open.tolist(), candles.high.tolist(), candles.low.tolist(),
+                    candles.close.tolist(), candles.volume.tolist(), candles.quote_volume.tolist(),
+                    candles.trades.tolist(),
+                )
+            ]
+            self._klines[(ticker, interval)] = ([row[0] for row in rows], rows)
+        return self._klines[(ticker, interval)]
+
+    async def klines(self, request):
+        open_times, rows = self._rows(request.query["symbol"], request.query["interval"])
+        first = bisect.bisect_left(open_times, int(request.query["startTime"])) if "startTime" in request.query else 0
+        last = bisect.bisect_right(open_times, int(request.query["endTime"])) if "endTime" in request.query else len(rows)
+        limit = int(request.query.get("limit", 500))
+        if "startTime" not in request.query:
+            first = max(first, last - limit)  # Binance returns the most recent klines
+        return web.json_response(rows[first:min(last, first + limit)])
+
+    async def ticker(self, request):
+        symbol = request.query["symbol"]
+        _, rows = self._rows(symbol, "1d")
+        row = rows[-1]
+        return web.json_response({
+            "symbol": symbol, "openPrice": row[1], "highPrice": row[2], "lowPrice": row[3], "lastPrice": row[4],
+            "volume": row[5], "quoteVolume": row[7], "count": row[8],
+        })
+
+    async def exchange_info(self, request):
+        return web.json_response({"symbols": [
+            {"symbol": f"{asset}USDT", "baseAsset": asset, "quoteAsset": "USDT", "status": "TRADING"}
+            for asset in ("BTC", "ETH", "ADA", "BNB", "SOL", "XRP", "DOGE", "DOT", "LTC", "LINK")
+        ]})
+
+    async def stream(self, request):
+        """Combined stream (/stream?streams=a@trade/b@trade) answering SUBSCRIBE and UNSUBSCRIBE"""
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        streams = self.connections[ws] = set(filter(None, request.query.get("streams", "").split("/")))
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                control = json.loads(message.data)
+                if control.get("method") == "SUBSCRIBE":
+                    streams.update(control["params"])
+                elif control.get("method") == "UNSUBSCRIBE":
+                    streams.difference_update(control["params"])
+                await ws.send_str(json.dumps({"result": None, "id": control.get("id")}))
+        finally:
+            self.connections.pop(ws, None)
+        return ws
+
+    def latest_before(self, ticker, moment):
+        """When the newest trade of ``ticker`` sent by ``moment`` (monotonic) was sent, or None"""
+        times = self._times.get(ticker, [])
+        index = bisect.bisect_right(times, moment)
+        return times[index - 1] if index else None
+
+    def _trade(self, stream):
+        ticker = stream.split("@")[0].upper()
+        replay = self._replay.get(ticker)
+        if replay is None:
+            replay = self._replay[ticker] = trade_stream("BTCUSDT", count=5000, seed=len(self._replay))
+        base = replay[self.trades % len(replay)]
+        price = f"{float(base['p']):.2f}{self.trades % 10 ** SEQUENCE_DIGITS:0{SEQUENCE_DIGITS}d}"
+        now_ms = int(time.time() * 1000)
+        payload = {**base, "e": "trade", "E": now_ms, "s": ticker, "t": self.trades, "p": price, "T": now_ms}
+        return ticker, float(price), json.dumps({"stream": stream, "data": payload})
+
+    async def _send(self, stream):
+        ticker, price, message = self._trade(stream)
+        sent = self.sent.setdefault(ticker, OrderedDict())
+        now = time.monotonic()
+        sent[price] = now
+        if len(sent) > SENT_HISTORY:
+            sent.popitem(last=False)
+        times = self._times.setdefault(ticker, [])
+        times.append(now)
+        if len(times) > 2 * SENT_HISTORY:
+            del times[:SENT_HISTORY]
+        self.trades += 1
+        for ws, streams in list(self.connections.items()):
+            if stream in streams and not ws.closed:
+                await ws.send_str(message)
+
+    async def _emit(self):
+        # Trades are due at a steady rate; a late wake-up sends the backlog at once
+        started, emitted = time.monotonic(), 0
+        while True:
+            streamed = sorted(set().union(*self.connections.values()))
+            if not streamed:
+                started, emitted = time.monotonic(), 0
+            for _ in range(int((time.monotonic() - started) * self.rate) - emitted if streamed else 0):
+                await self._send(streamed[emitted % len(streamed)])
+                emitted += 1
+            await asyncio.sleep(min(1 / self.rate, 0.01))
+
+    def start_trading(self):
+        if self._emitter is None:
+            self._emitter = asyncio.get_running_loop().create_task(self._emit())
+
+    async def stop_trading(self):
+        if self._emitter is not None:
+            self._emitter.cancel()
+            try:
+                await self._emitter
+            except asyncio.CancelledError:
+                pass
+            self._emitter = None
+
+    async def __aenter__(self):
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = self.runner.addresses[0][1]
+        self.rest_url = f"http://127.0.0.1:{port}"
+        self.stream_url = f"ws://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop_trading()
+        for ws in list(self.connections):
+            await ws.close()
+        await self.runner.cleanup()
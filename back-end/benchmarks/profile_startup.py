@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Profile worker startup: import time per module, and the time from launching uvicorn
+to the first served request, against the BOOT_BUDGET
+"""
+
+import socket
+import subprocess
+import sys
+import os
+import time
+import urllib.request
+
+BACK_END = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Add the back-end directory to Python path
+sys.path.append(BACK_END)
+
+from config.settings import BOOT_BUDGET
+
+TOP_MODULES = 15
+
+def import_profile():
+    """[(cumulative ms, module)] for main and its direct imports, from ``python -X importtime``"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACK_END, capture_output=True, text=True, check=True,
+    )
+    children = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nesting is shown by indentation, and a module is listed after everything it imports
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entry = (int(cumulative) / 1000, name.strip())
+        if depth == 1:
+            children.append(entry)
+        elif depth == 0:
+            if entry[1] == "main":
+                return [entry] + children
+            children = []  # Imported by the interpreter before main
+    raise RuntimeError("main was not imported")
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def time_to_first_request(timeout=30.0):
+    """Seconds from launching uvicorn until GET / answers 200"""
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACK_END, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError(f"No response within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+def main():
+    print("📦 Import time of main and its direct imports (cumulative)")
+    modules = import_profile()
+    for elapsed, name in sorted(modules, reverse=True)[:TOP_MODULES]:
+        print(f"   {elapsed:8.1f} ms  {name}")
+
+    print("\n🚀 Launching uvicorn...")
+    elapsed = time_to_first_request()
+    print(f"   First request served after {elapsed * 1000:.0f} ms (budget {BOOT_BUDGET * 1000:.0f} ms)")
+
+    if elapsed > BOOT_BUDGET:
+        print("❌ Worker boot is over budget")
+        return False
+    print("✅ Worker boot is within budget")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
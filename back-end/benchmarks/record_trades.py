@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Record a Binance trade stream for the offline benchmarks (needs network access)
+
+    python benchmarks/record_trades.py BTCUSDT 5000   # -> benchmarks/recordings/BTCUSDT_trades.jsonl
+"""
+
+import asyncio
+import json
+import sys
+import os
+
+import websockets
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import RECORDINGS_DIR
+from config.settings import BINANCE_STREAM_URL
+from services.stream_manager import stream_name
+
+async def record(symbol, count):
+    os.makedirs(RECORDINGS_DIR, exist_ok=True)
+    path = os.path.join(RECORDINGS_DIR, f"{symbol}_trades.jsonl")
+    async with websockets.connect(f"{BINANCE_STREAM_URL}/ws/{stream_name(symbol)}") as ws:
+        with open(path, "w") as f:
+            for recorded in range(count):
+                f.write(json.dumps(json.loads(await ws.recv())) + "\n")
+                if (recorded + 1) % 500 == 0:
+                    print(f"   {recorded + 1}/{count} trades")
+    print(f"✅ Recorded {count} {symbol} trades to {path}")
+
+def main():
+    symbol = sys.argv[1].upper() if len(sys.argv) > 1 else "BTCUSDT"
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    asyncio.run(record(symbol, count))
+
+if __name__ == "__main__":
+    main()
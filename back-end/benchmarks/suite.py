@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite: kline cache paths, indicators, RSI, history serialization and
+WebSocket fan-out, run against recorded klines and a fake Binance, compared with a stored baseline
+
+    python benchmarks/suite.py                 # Run everything, compare with benchmarks/baseline.json
+    python benchmarks/suite.py -k fanout       # Only cases whose name contains "fanout"
+    python benchmarks/suite.py --save          # Record the results as the new baseline
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import sys
+import os
+
+# Reproducible runs: no candle files from earlier runs, no process pool start-up in the timings,
+# and every update sent at once instead of throttled
+os.environ.setdefault("KLINE_DATA_DIR", "")
+os.environ.setdefault("EXECUTOR_PROCESSES", "0")
+os.environ.setdefault("WS_SEND_INTERVAL", "0")
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from starlette.requests import Request
+
+from benchmarks import harness
+from benchmarks.fixtures import FakeBinance, CountingWebSocket, history, trade_stream
+from benchmarks.harness import benchmark
+from core.executors import shutdown_executors
+from routes.binance_data import get_raw_symbol_data
+from services import technical_analysis
+from services.history import encoded_cache
+from services.live_data import flush_updates, handle_trade, price_store
+from services.subscriptions import add_connection, remove_connection
+from utils.binance_data import api_to_df, clear_cache
+from utils.data_loader import calculate_rsi_wilder
+from utils.encoding import encode_candles, RECORDS_JSON, COLUMNS_JSON, BINARY
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SYMBOL = "BTCUSDT"
+HISTORY_DAYS = [30, 365, 3000]
+
+fake_binance = FakeBinance(days=max(HISTORY_DAYS) + 10)
+trades = trade_stream(SYMBOL)
+
+def set_live_price():
+    # Indicators use the live price; without one every call logs a warning
+    trade = trades[0]
+    price_store.record_trade(SYMBOL.lower(), float(trade["p"]), trade["T"])
+
+@benchmark("api_to_df/hit", days=HISTORY_DAYS)
+async def api_to_df_hit(days):
+    await api_to_df(SYMBOL, days)
+    yield lambda: api_to_df(SYMBOL, days)
+    clear_cache()
+
+@benchmark("api_to_df/miss", days=HISTORY_DAYS)
+async def api_to_df_miss(days):
+    async def miss():
+        clear_cache(SYMBOL)
+        await api_to_df(SYMBOL, days)
+
+    yield miss
+    clear_cache()
+
+@benchmark("calculate_indicators", days=HISTORY_DAYS, engine=["cold", "warm"])
+async def calculate_indicators(days, engine):
+    set_live_price()
+    await technical_analysis.calculate_indicators(SYMBOL, days)
+
+    async def cold():
+        technical_analysis._engines.clear()  # Seed from the cached candles every time
+        await technical_analysis.calculate_indicators(SYMBOL, days)
+
+    yield cold if engine == "cold" else (lambda: technical_analysis.calculate_indicators(SYMBOL, days))
+    technical_analysis._engines.clear()
+    clear_cache()
+
+@benchmark("calculate_rsi_wilder", candles=HISTORY_DAYS)
+async def rsi(candles):
+    prices = history(candles).to_frame()["Close"]
+    yield lambda: calculate_rsi_wilder(prices)
+
+HISTORY_FORMATS = {"records": RECORDS_JSON, "columns": COLUMNS_JSON, "binary": BINARY}
+
+@benchmark("history/encode", days=[365, 3000], format=list(HISTORY_FORMATS))
+async def history_encode(days, format):
+    candles = history(days)
+    media_type = HISTORY_FORMATS[format]
+    yield lambda: encode_candles(candles, media_type)
+
+def history_request(accept):
+    headers = [(b"accept", accept.encode()), (b"accept-encoding", b"gzip"), (b"user-agent", b"bench")]
+    return Request({"type": "http", "method": "GET", "path": f"/api/raw-data/{SYMBOL}", "headers": headers, "query_string": b""})
+
+@benchmark("history/endpoint", days=[365, 3000], body=["cached", "encoded"])
+async def history_endpoint(days, body):
+    request = history_request(RECORDS_JSON)
+    await get_raw_symbol_data(request, SYMBOL, days=days, interval="1d")
+
+    async def encoded():
+        encoded_cache.clear()  # Encode and gzip the body on every request
+        await get_raw_symbol_data(request, SYMBOL, days=days, interval="1d")
+
+    yield encoded if body == "encoded" else (lambda: get_raw_symbol_data(request, SYMBOL, days=days, interval="1d"))
+    encoded_cache.clear()
+    clear_cache()
+
+@benchmark("fanout", endpoint=["live-price", "data"], subscribers=[10, 100, 1000])
+async def fanout(endpoint, subscribers):
+    """One trade delivered to every subscriber of the symbol, sends included"""
+    set_live_price()
+    clients = [CountingWebSocket() for _ in range(subscribers)]
+    with contextlib.redirect_stdout(io.StringIO()):  # One log line per connection
+        for client in clients:
+            add_connection(client, [SYMBOL.removesuffix("USDT")], endpoint)
+    replay = iter(trades * 1000)
+
+    async def tick():
+        await handle_trade(next(replay))
+        await flush_updates()
+        await asyncio.sleep(0)  # Let every writer task send its frame
+
+    await tick()
+    yield tick
+    with contextlib.redirect_stdout(io.StringIO()):
+        for client in clients:
+            remove_connection(client)
+    clear_cache()
+
+async def run(pattern, samples):
+    fake_binance.install()
+    results = {}
+    try:
+        for case, setup, kwargs in harness.cases(pattern):
+            times, number = await harness.run_case(setup, kwargs, samples)
+            results[case] = {**harness.summarize(times), "number": number, "times": times}
+            yield case, results[case]
+    finally:
+        fake_binance.uninstall()
+        shutdown_executors()
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite")
+    parser.add_argument("-k", dest="pattern", help="Only run cases whose name contains this")
+    parser.add_argument("--samples", type=int, default=harness.SAMPLES, help="Samples per case")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Median change ignored as noise (0.15 = 15%%)")
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline file to compare with or save to")
+    parser.add_argument("--save", action="store_true", help="Save the results as the baseline")
+    args = parser.parse_args()
+
+    baseline = None if args.save else load_baseline(args.baseline)
+    if baseline is not None and baseline["environment"] != harness.environment():
+        print(f"⚠️ Baseline recorded on {baseline['environment']}, comparisons are only indicative")
+
+    print(f"{'case':<52} {'median':>10} {'IQR':>8} {'vs baseline':>16}")
+    results = {}
+    regressions = []
+    async def collect():
+        async for case, result in run(args.pattern, args.samples):
+            results[case] = result
+            spread = (result["q3"] - result["q1"]) / result["median"] * 100
+            verdict = ""
+            previous = baseline["results"].get(case) if baseline is not None else None
+            if previous is not None:
+                status, ratio = harness.compare(result["times"], previous["times"], args.tolerance)
+                verdict = {"same": "~", "faster": "✅", "slower": "❌"}[status] + f" {ratio:.2f}x"
+                if status == "slower":
+                    regressions.append(case)
+            print(f"{case:<52} {harness.format_seconds(result['median']):>10} {spread:>7.1f}% {verdict:>16}")
+
+    asyncio.run(collect())
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump({"environment": harness.environment(), "results": results}, f, indent=1)
+        print(f"\n💾 Baseline saved to {args.baseline}")
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+        return False
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
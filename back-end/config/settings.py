@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 # API Configuration
 API_SECRET_KEY = os.getenv("API_SECRET_KEY", "your-secret-key-here")
@@ -14,4 +15,63 @@ CORS_ORIGINS = ["http://localhost:5173","https://crypto-dashboard-nine-kohl.verc
 
 # Binance Configuration
 BINANCE_API_KEY = os.getenv("BINANCE_API_KEY")
-BINANCE_API_SECRET = os.getenv("BINANCE_API_SECRET")
\ No newline at end of file
+BINANCE_API_SECRET = os.getenv("BINANCE_API_SECRET")
+
+# WebSocket delivery
+WS_SEND_INTERVAL = float(os.getenv("WS_SEND_INTERVAL", "1.0"))  # Minimum seconds between sends per connection
+WS_OUTBOX_SIZE = int(os.getenv("WS_OUTBOX_SIZE", "8"))  # Distinct pending updates kept per connection
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "5.0"))  # Seconds a single send may take
+WS_SLOW_CONSUMER_POLICY = os.getenv("WS_SLOW_CONSUMER_POLICY", "disconnect")  # "disconnect" or "conflate"
+WS_COMPRESS_MIN_BYTES = int(os.getenv("WS_COMPRESS_MIN_BYTES", "1024"))  # Deflate binary WebSocket frames at least this large
+
+# Binance stream ingest
+BINANCE_STREAM_URL = os.getenv("BINANCE_STREAM_URL", "wss://stream.binance.com:9443")
+INGEST_PING_INTERVAL = float(os.getenv("INGEST_PING_INTERVAL", "20.0"))  # Seconds between pings on each upstream connection
+INGEST_STALL_TIMEOUT = float(os.getenv("INGEST_STALL_TIMEOUT", "30.0"))  # Reconnect if a ping goes unanswered for this long
+INGEST_MIN_BACKOFF = float(os.getenv("INGEST_MIN_BACKOFF", "1.0"))
+INGEST_MAX_BACKOFF = float(os.getenv("INGEST_MAX_BACKOFF", "60.0"))
+
+# Symbol universe and upstream stream sharding
+SYMBOL_UNIVERSE = os.getenv("SYMBOL_UNIVERSE", "BTC,ETH,ADA")  # Comma separated base assets, or "*" for every trading USDT pair
+PINNED_SYMBOLS = os.getenv("PINNED_SYMBOLS", "BTC,ETH,ADA")  # Streamed even when nobody is watching
+STREAM_IDLE_TTL = float(os.getenv("STREAM_IDLE_TTL", "300.0"))  # Seconds a symbol keeps streaming after its last viewer
+STREAMS_PER_CONNECTION = int(os.getenv("STREAMS_PER_CONNECTION", "200"))  # Binance allows 1024 per connection
+STREAM_CONTROL_INTERVAL = float(os.getenv("STREAM_CONTROL_INTERVAL", "0.25"))  # Binance allows 5 control messages/s
+
+# Multi-worker deployment: one ingest process (python ingest.py) owns the Binance streams
+INGEST_MODE = os.getenv("INGEST_MODE", "local")  # "local" streams in this process, "worker" receives trades from ingest.py
+INGEST_SOCKET = os.getenv("INGEST_SOCKET", os.path.join(tempfile.gettempdir(), "crypto-dashboard-ingest.sock"))
+INGEST_CLIENT_BUFFER = int(os.getenv("INGEST_CLIENT_BUFFER", str(4 * 1024 * 1024)))  # Drop a worker this many bytes behind
+
+# Binance REST
+BINANCE_REST_URL = os.getenv("BINANCE_REST_URL", "https://api.binance.com")
+BINANCE_REST_POOL_SIZE = int(os.getenv("BINANCE_REST_POOL_SIZE", "10"))  # Keep-alive connections
+BINANCE_REST_TIMEOUT = float(os.getenv("BINANCE_REST_TIMEOUT", "10.0"))
+BINANCE_WEIGHT_LIMIT = int(os.getenv("BINANCE_WEIGHT_LIMIT", "5000"))  # Binance allows 6000 per minute per IP
+
+# Kline cache
+KLINE_CACHE_MAX_BYTES = int(os.getenv("KLINE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # Memory budget across symbols
+DATA_DIR = os.getenv("DATA_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"))
+KLINE_DATA_DIR = os.getenv("KLINE_DATA_DIR", os.path.join(DATA_DIR, "klines"))  # Persistent candle files; empty disables
+KLINE_REFRESH_DELAY = float(os.getenv("KLINE_REFRESH_DELAY", "5.0"))  # Seconds after the daily close before refreshing
+KLINE_REFRESH_CONCURRENCY = int(os.getenv("KLINE_REFRESH_CONCURRENCY", "8"))  # Symbols fetched at once by warm-up and refresh
+
+# Multi-symbol requests (/api/data?symbols=..., /ws/data?symbols=...)
+BATCH_MAX_SYMBOLS = int(os.getenv("BATCH_MAX_SYMBOLS", "100"))
+
+# Live candles built from the trade stream
+AGGREGATOR_CAPACITY = int(os.getenv("AGGREGATOR_CAPACITY", "1000"))  # Closed candles kept per symbol and interval
+
+# Executors for blocking and CPU-heavy work, kept off the event loop
+EXECUTOR_THREADS = int(os.getenv("EXECUTOR_THREADS", "4"))  # Blocking file I/O, response encoding and compression
+EXECUTOR_PROCESSES = int(os.getenv("EXECUTOR_PROCESSES", "2"))  # Indicator seeding over long histories; 0 uses the threads
+EXECUTOR_MAX_QUEUE = int(os.getenv("EXECUTOR_MAX_QUEUE", "32"))  # Tasks queued per pool before new ones get a 503
+EXECUTOR_BUDGET = float(os.getenv("EXECUTOR_BUDGET", "2.0"))  # Seconds a task may wait for a worker before it is dropped
+OFFLOAD_MIN_CANDLES = int(os.getenv("OFFLOAD_MIN_CANDLES", "1000"))  # Smaller indicator seeds run inline, cheaper than the hop
+
+# Worker boot
+BOOT_BUDGET = float(os.getenv("BOOT_BUDGET", "2.0"))  # Seconds from importing main to serving; slower boots are logged
+
+# HTTP caching of history responses
+HTTP_MAX_AGE = int(os.getenv("HTTP_MAX_AGE", "60"))  # Upper bound for Cache-Control max-age, in seconds
+HTTP_COMPRESS_MIN_BYTES = int(os.getenv("HTTP_COMPRESS_MIN_BYTES", "1024"))  # Smaller bodies are sent uncompressed
@@ -0,0 +1,117 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+from config.settings import EXECUTOR_THREADS, EXECUTOR_PROCESSES, EXECUTOR_MAX_QUEUE, EXECUTOR_BUDGET
+from core.metrics import Counter, Gauge
+
+class Overloaded(Exception):
+    """A pool is saturated: its queue is full, or a task waited longer than its budget"""
+
+    def __init__(self, pool, reason):
+        super().__init__(f"{pool} pool overloaded: {reason}")
+        self.pool = pool
+
+class _Expired(Exception):
+    pass
+
+def _run_by(deadline, func, args, kwargs):
+    # Runs in the worker; skips work whose caller has already been told to retry
+    if time.time() > deadline:
+        raise _Expired()
+    return func(*args, **kwargs)
+
+class BoundedExecutor:
+    """A thread or process pool with a queue limit and a latency budget per task.
+
+    ``run`` sheds a task with Overloaded instead of queueing it when ``max_queue`` tasks
+    are already waiting or running, and drops a queued task that has not started within
+    its budget, so a burst of heavy requests turns into fast 503s rather than latency
+    for everyone. The pool is created on first use.
+    """
+
+    def __init__(self, name, factory, max_queue=EXECUTOR_MAX_QUEUE, budget=EXECUTOR_BUDGET):
+        self.name = name
+        self.factory = factory
+        self.max_queue = max_queue
+        self.budget = budget
+        self.pool = None
+        self.pending = 0
+        self.completed = 0
+        self.shed = 0
+        self.expired = 0
+
+    async def run(self, func, *args, budget=None, **kwargs):
+        """``func(*args, **kwargs)`` in the pool; for process pools func and its arguments must pickle"""
+        if self.pending >= self.max_queue:
+            self.shed += 1
+            raise Overloaded(self.name, f"{self.pending} tasks queued")
+        if self.pool is None:
+            self.pool = self.factory()
+
+        deadline = time.time() + (self.budget if budget is None else budget)
+        self.pending += 1
+        try:
+            future = self.pool.submit(_run_by, deadline, func, args, kwargs)
+            result = await asyncio.wrap_future(future)
+        except _Expired:
+            self.expired += 1
+            raise Overloaded(self.name, "task waited past its latency budget")
+        except BrokenExecutor:
+            self.pool = None  # A worker died; start a fresh pool on the next task
+            raise
+        finally:
+            self.pending -= 1
+        self.completed += 1
+        return result
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    def info(self):
+        return {
+            "pending": self.pending,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "shed": self.shed,
+            "expired": self.expired,
+        }
+
+def _process_pool():
+    # Spawned, not forked: the server process has an event loop and threads running
+    return ProcessPoolExecutor(EXECUTOR_PROCESSES, mp_context=multiprocessing.get_context("spawn"))
+
+# Blocking file I/O, response encoding and compression
+blocking = BoundedExecutor("blocking", lambda: ThreadPoolExecutor(EXECUTOR_THREADS, thread_name_prefix="blocking"))
+
+# Indicator seeding over long histories and many symbols: pure Python loops that hold the GIL
+compute = BoundedExecutor("compute", _process_pool) if EXECUTOR_PROCESSES > 0 else blocking
+
+async def warm_up():
+    """Start the worker processes now, so the first heavy request doesn't pay for spawning them"""
+    if compute is blocking:
+        return
+    try:
+        await asyncio.gather(*(compute.run(int, budget=60.0) for _ in range(EXECUTOR_PROCESSES)))
+    except Exception as e:
+        print(f"Could not start the compute pool: {e}")
+
+def executor_info():
+    """Queue and shedding counters per pool, exposed through /api/health"""
+    return {executor.name: executor.info() for executor in {blocking, compute}}
+
+def _task_counts():
+    return {
+        (executor.name, outcome): getattr(executor, outcome)
+        for executor in {blocking, compute} for outcome in ("completed", "shed", "expired")
+    }
+
+Counter("dashboard_executor_tasks_total", "Pool tasks by outcome", ["pool", "outcome"], collect=_task_counts)
+Gauge("dashboard_executor_pending", "Pool tasks queued or running", ["pool"],
+      collect=lambda: {(executor.name,): executor.pending for executor in {blocking, compute}})
+
+def shutdown_executors():
+    for executor in {blocking, compute}:
+        executor.shutdown()
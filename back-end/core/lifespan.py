@@ -1,8 +1,38 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from services.live_data import start_ws_in_background, SYMBOLS
+from core import startup
+from core.executors import shutdown_executors, warm_up
+from services.cache_refresh import prewarm, refresh_after_close
+from services.live_data import start_ingest, stop_ingest
+from services.rolling_stats import seed_symbols
+from services.universe import PINNED_ASSETS, ticker
+from utils.binance_rest import client
+
+async def _bring_up():
+    # Resolving a "*" universe calls Binance, so it happens after the worker is serving
+    tickers = await start_ingest()
+    # Daily candles for every symbol are loaded in the background (see /api/ready), then
+    # refreshed right after each daily close. With INGEST_MODE=worker each worker still keeps its
+    # own caches, but reads their klines through the ingest process, which asks Binance once for all
+    await prewarm(tickers)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    start_ws_in_background(SYMBOLS)
-    yield
\ No newline at end of file
+    # Nothing here waits on the network: the worker serves right away and
+    # /api/ready reports when the caches are warm
+    ingest = asyncio.create_task(_bring_up())
+    executors_warm = asyncio.create_task(warm_up())
+    cache_refresh = asyncio.create_task(refresh_after_close())
+    # 24h stats of the always-on symbols are seeded from REST once, in the background; the
+    # trade stream keeps them current. Other symbols are seeded on first read.
+    stats_seed = asyncio.create_task(seed_symbols([ticker(asset) for asset in PINNED_ASSETS]))
+    startup.ready()
+    yield
+    stats_seed.cancel()
+    executors_warm.cancel()
+    ingest.cancel()
+    cache_refresh.cancel()
+    await stop_ingest()
+    await client.close()
+    shutdown_executors()
@@ -0,0 +1,146 @@
+from bisect import bisect_left
+
+# Every metric by name, in registration order, rendered by /metrics
+_registry = {}
+
+# Latency buckets in seconds, from sub-millisecond hot paths to upstream fetches
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _format_labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help, labels=(), collect=None):
+        if name in _registry:
+            raise ValueError(f"Metric {name} is already registered")
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.collect = collect  # Reads the values at scrape time instead: () -> {label values: value}
+        self._children = {}
+        _registry[name] = self
+        # The unlabelled series exists from the start, so it is exported as 0 before the first update
+        self._default = self.labels() if not self.label_names and collect is None else None
+
+    def labels(self, *values):
+        """The series for these label values; hot paths can keep it and skip the lookup"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} takes labels {self.label_names}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def samples(self):
+        if self.collect is not None:
+            return [(self.name, values if isinstance(values, tuple) else (values,), value)
+                    for values, value in self.collect().items()]
+        return [(self.name, values, child.value) for values, child in list(self._children.items())]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for name, values, value, *extra in self.samples():
+            lines.append(f"{name}{_format_labels(self.label_names, values, *extra)} {_format_value(value)}")
+        return lines
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+class Counter(_Metric):
+    """A count that only goes up, like trades received or updates dropped.
+
+    Metrics are updated from the event loop thread, so an increment is a plain
+    attribute addition: no lock, no allocation.
+    """
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount=1):
+        """Increment the unlabelled series"""
+        self._default.inc(amount)
+
+class Gauge(_Metric):
+    """A value read when /metrics is scraped, like subscriber counts or queue depth"""
+
+    kind = "gauge"
+
+    def __init__(self, name, help, labels=(), collect=None):
+        if collect is None:
+            raise ValueError("Gauges are read at scrape time and need a collect function")
+        super().__init__(name, help, labels, collect)
+
+class _Buckets:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # The last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class Histogram(_Metric):
+    """Distribution of durations (or sizes) over fixed buckets; quantiles are computed by Prometheus"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help, labels)
+
+    def _new_child(self):
+        return _Buckets(self.buckets)
+
+    def observe(self, value):
+        """Record a value on the unlabelled series"""
+        self._default.observe(value)
+
+    def samples(self):
+        samples = []
+        for values, child in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", values, cumulative, f'le="{_format_value(float(bound))}"'))
+            samples.append((f"{self.name}_sum", values, child.sum))
+            samples.append((f"{self.name}_count", values, child.count))
+        return samples
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def render():
+    """Every registered metric in the Prometheus text exposition format"""
+    lines = []
+    for metric in list(_registry.values()):
+        try:
+            lines.extend(metric.render())
+        except Exception as e:
+            # One failing collector shouldn't hide the other metrics
+            lines.append(f"# {metric.name} unavailable: {_escape(e)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,25 @@
+import time
+from config.settings import BOOT_BUDGET
+
+# Imported first by main, so boot times count from the start of the app's imports
+_started = time.perf_counter()
+
+# Boot timings in milliseconds, exposed through /api/health
+boot = {
+    "import_ms": None,
+    "ready_ms": None,
+    "budget_ms": round(BOOT_BUDGET * 1000),
+}
+
+def _elapsed_ms():
+    return round((time.perf_counter() - _started) * 1000, 1)
+
+def imported():
+    """main has finished importing: the app object and its routes exist"""
+    boot["import_ms"] = _elapsed_ms()
+
+def ready():
+    """Lifespan startup is done: the worker serves requests from here on"""
+    boot["ready_ms"] = _elapsed_ms()
+    if boot["ready_ms"] > boot["budget_ms"]:
+        print(f"Worker boot took {boot['ready_ms']:.0f} ms, over the {boot['budget_ms']} ms budget (BOOT_BUDGET)")
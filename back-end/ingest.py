@@ -0,0 +1,29 @@
+import asyncio
+from config.settings import INGEST_SOCKET
+from services.ingest_link import IngestServer
+from services.stream_manager import StreamManager
+from services.universe import PINNED_ASSETS, load_universe, ticker
+from utils.binance_rest import client
+
+async def main():
+    """Own the Binance streams for every API worker started with INGEST_MODE=worker"""
+    manager = StreamManager()
+    tickers = await load_universe()
+    manager.configure(tickers, [ticker(asset) for asset in PINNED_ASSETS])
+
+    server = IngestServer(manager, INGEST_SOCKET)
+    await server.start()
+    manager.start(server.publish_trade, server.publish_removed)
+    print(f"Ingest process serving {len(tickers)} symbols on {INGEST_SOCKET}")
+    try:
+        await asyncio.Event().wait()  # Until interrupted
+    finally:
+        await manager.stop()
+        await server.stop()
+        await client.close()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -1,5 +1,9 @@
-from fastapi import FastAPI
+# First, so the boot timer covers every import below
+from core import startup
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from core.executors import Overloaded
 from core.lifespan import lifespan
 from middleware.security import block_unauthorized_origins
 from routes.binance_data import router as binance_router
@@ -24,7 +28,14 @@ app.add_middleware(
 
 app.middleware("http")(block_unauthorized_origins)
 
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    # Shed load quickly instead of queueing behind heavy requests
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
 # Include routers
 app.include_router(api_router)
 app.include_router(websocket_router)
 app.include_router(binance_router, prefix="/api")
+
+startup.imported()
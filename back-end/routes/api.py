@@ -1,7 +1,15 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
-from utils.binance_data import api_to_df, get_cache_info, clear_cache
-from services.live_data import SYMBOLS, price_store, volume_store
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
+from core import metrics
+from core.executors import Overloaded, executor_info
+from core.startup import boot
+from routes.binance_data import history_response, validate_ticker
+from services.cache_refresh import readiness
+from services.history import encoded_cache
+from utils.binance_data import get_cache_info, clear_cache, DEFAULT_DAYS
+from services.live_data import SYMBOLS, price_store, ingest_status
+from services.rolling_stats import rolling_volumes
+from services.stream_manager import streams
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,40 +35,58 @@ def validate_symbol(symbol: str):
     }
 
 @router.get("/api/raw-data")
-async def get_raw_data():
+async def get_raw_data(request: Request, symbol: str = "BTCUSDT", days: int = DEFAULT_DAYS):
     try:
-        df = api_to_df()
-        return JSONResponse(content=df.to_dict(orient="records"))
+        return await history_response(request, symbol, days, "1d")
+    except (Overloaded, HTTPException):
+        raise
     except Exception as e:
         logger.error(f"Erro ao gerar dados brutos da API: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno ao processar os dados brutos")
 
+@router.get("/api/ready")
+def readiness_check():
+    """503 until the startup warm-up has loaded every symbol's daily candles, then 200"""
+    return JSONResponse(status_code=200 if readiness["ready"] else 503, content=readiness)
+
 @router.get("/api/health")
 async def health_check():
     """Health check endpoint with cache and live data status"""
     try:
         cache_info = get_cache_info()
-        live_prices = {k: v for k, v in price_store.items() if v > 0}
-        live_volumes = {k: v for k, v in volume_store.items() if v > 0}
+        live_prices = price_store.live_prices()
+        live_volumes = rolling_volumes()
 
         return JSONResponse(content={
             "status": "healthy",
             "cache": cache_info,
+            "encoded_cache": encoded_cache.info(),
+            "executors": executor_info(),
+            "boot": boot,
             "live_prices": live_prices,
             "live_volumes": live_volumes,
+            "ingest": ingest_status(),
+            "streaming": streams.streaming(),
             "symbols": SYMBOLS
         })
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")
         raise HTTPException(status_code=500, detail="Health check failed")
 
+@router.get("/metrics")
+def metrics_endpoint():
+    """Counters and latency histograms in the Prometheus text format"""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 @router.post("/api/cache/clear")
-async def clear_cache_endpoint(symbol: str = None, days: int = None):
-    """Clear cache for optimization or troubleshooting"""
+async def clear_cache_endpoint(symbol: str = None, days: int = None, files: bool = False):
+    """Clear cache for optimization or troubleshooting; ``files=true`` also deletes the stored candles"""
+    if symbol:
+        symbol = validate_ticker(symbol)
     try:
-        clear_cache(symbol, days)
+        clear_cache(symbol, days, files)
         return JSONResponse(content={
-            "message": f"Cache cleared for {symbol if symbol else 'all symbols'}"
+            "message": f"Cache cleared for {symbol if symbol else 'all symbols'}" + (", candle files deleted" if files else "")
         })
     except Exception as e:
         logger.error(f"Cache clear failed: {str(e)}")
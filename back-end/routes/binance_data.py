@@ -1,24 +1,80 @@
-from fastapi import APIRouter, Query
-from fastapi.responses import JSONResponse
-from services.technical_analysis import calculate_indicators
-from utils.binance_data import api_to_df, get_today_stats
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response
+from config.settings import BATCH_MAX_SYMBOLS
+from core.executors import blocking
+from services.candle_aggregator import INTERVALS
+from services.history import encoded_history, history_max_age
+from services.rolling_stats import get_rolling_stats
+from services.technical_analysis import live_indicator_row, live_indicator_rows
+from services.universe import is_ticker
+from utils.encoding import negotiate, encode_rows, RECORDS_JSON, COLUMNS_JSON
+from utils.http_cache import conditional_response, is_not_modified, negotiate_encoding
 
 router = APIRouter()
 
+def validate_interval(interval: str):
+    if interval not in INTERVALS:
+        raise HTTPException(status_code=400, detail=f"Unsupported interval {interval}, expected one of {INTERVALS}")
+
+def validate_ticker(symbol: str):
+    """The symbol as an upper-case USDT ticker; anything else is rejected before it reaches a cache"""
+    ticker = symbol.strip().upper()
+    if not is_ticker(ticker):
+        raise HTTPException(status_code=400, detail=f"Invalid symbol {symbol}, expected a USDT pair such as BTCUSDT")
+    return ticker
+
+def parse_symbols(symbols: str):
+    """Comma separated symbols ("BTC,ETH" or "BTCUSDT,ETHUSDT") as unique USDT tickers"""
+    tickers = []
+    for symbol in symbols.split(","):
+        symbol = symbol.strip().upper()
+        if not symbol:
+            continue
+        ticker = validate_ticker(symbol if symbol.endswith("USDT") else f"{symbol}USDT")
+        if ticker not in tickers:
+            tickers.append(ticker)
+    if not tickers:
+        raise HTTPException(status_code=400, detail="No symbols given")
+    if len(tickers) > BATCH_MAX_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_SYMBOLS} symbols per request")
+    return tickers
+
+async def history_response(request: Request, symbol: str, days: int, interval: str):
+    """Candle history in the representation the Accept header asks for, with ETag/304 and compression"""
+    symbol = validate_ticker(symbol)
+    media_type = negotiate(request.headers.get("accept"))
+    encoded = await encoded_history(symbol, days, interval, media_type)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), len(encoded.body))
+    if not encoded.has_variant(encoding) and not is_not_modified(request, encoded):
+        await blocking.run(encoded.variant, encoding)  # Compressed once, off the event loop
+    return conditional_response(request, encoded, media_type, history_max_age(interval))
+
+@router.get("/data")
+async def get_batch_data(request: Request, symbols: str = Query(...), days: int = Query(default=90), interval: str = Query(default="1d")):
+    """Current indicators for several symbols, computed together in one vectorized pass"""
+    validate_interval(interval)
+    tickers = parse_symbols(symbols)
+    rows = await live_indicator_rows(tickers, days, interval)
+    rows = [{"symbol": ticker, **row} for ticker, row in zip(tickers, rows)]
+    media_type = negotiate(request.headers.get("accept"), [RECORDS_JSON, COLUMNS_JSON])
+    return Response(content=encode_rows(rows, media_type), media_type=media_type, headers={"Vary": "Accept"})
+
 @router.get("/data/{symbol}")
-def get_symbol_data(symbol: str, days: int = Query(default=90)):
-    df = calculate_indicators(symbol, days)
-    return JSONResponse(content=df.to_dict(orient="records"))
+async def get_symbol_data(request: Request, symbol: str, days: int = Query(default=90), interval: str = Query(default="1d")):
+    validate_interval(interval)
+    row = await live_indicator_row(validate_ticker(symbol), days, interval)
+    media_type = negotiate(request.headers.get("accept"), [RECORDS_JSON, COLUMNS_JSON])
+    return Response(content=encode_rows([row], media_type), media_type=media_type, headers={"Vary": "Accept"})
 
 @router.get("/raw-data/{symbol}")
-def get_raw_symbol_data(symbol: str, days: int = Query(default=90)):
-    df = api_to_df(symbol, days)
-    return JSONResponse(content=df.to_dict(orient="records"))
+async def get_raw_symbol_data(request: Request, symbol: str, days: int = Query(default=90), interval: str = Query(default="1d")):
+    validate_interval(interval)
+    return await history_response(request, symbol, days, interval)
 
 @router.get("/today-stats/{symbol}")
-def get_today_stats_endpoint(symbol: str):
-    """Get today's OHLCV statistics for a symbol"""
-    stats = get_today_stats(symbol)
+async def get_today_stats_endpoint(symbol: str):
+    """Rolling 24h OHLCV statistics for a symbol, kept up to date from the trade stream"""
+    stats = await get_rolling_stats(validate_ticker(symbol))
     if stats:
         return JSONResponse(content=stats)
     else:
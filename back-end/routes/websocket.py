@@ -1,49 +1,71 @@
-from fastapi import WebSocket, WebSocketDisconnect, Query, APIRouter
-from services.live_data import add_connection, remove_connection
+from fastapi import WebSocket, WebSocketDisconnect, Query, APIRouter, HTTPException
+from core.executors import Overloaded
+from routes.binance_data import parse_symbols, validate_ticker
+from services.subscriptions import add_connection, remove_connection, hold_connection
+from services.publisher import batch_frame, snapshot_frame, DELTA_PROTOCOL, DELTA_ENDPOINTS
+from utils.frames import JSON_FRAMES, BINARY_FRAMES, BINARY_SUBPROTOCOL
 import asyncio
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-@router.websocket("/ws/data")
-async def websocket_data_endpoint(websocket: WebSocket, ticker: str = Query("BTCUSDT")):
-    await websocket.accept()
+async def serve_subscription(websocket: WebSocket, ticker: str, endpoint: str, description: str, protocol: int = 1,
+                             fmt: str = JSON_FRAMES, tickers: list | None = None):
+    try:
+        ticker = validate_ticker(ticker)
+    except HTTPException:
+        await websocket.close(code=1008)
+        return
+    # Binary frames are requested with ?format=binary or the candles.binary subprotocol
+    if BINARY_SUBPROTOCOL in websocket.scope.get("subprotocols", []) and endpoint != "data-batch":
+        fmt = BINARY_FRAMES
+        await websocket.accept(subprotocol=BINARY_SUBPROTOCOL)
+    else:
+        await websocket.accept()
+    if fmt != BINARY_FRAMES or endpoint == "data-batch":
+        fmt = JSON_FRAMES
     
-    # Extract symbol from ticker (remove USDT suffix)
-    symbol = ticker.replace("USDT", "")
-    add_connection(websocket, symbol, "data")
+    # Extract symbols from tickers (remove USDT suffix)
+    symbols = [item.replace("USDT", "") for item in (tickers or [ticker])]
+    symbol = ",".join(symbols)
+    if endpoint not in DELTA_ENDPOINTS:
+        protocol = 1
+    outbox = add_connection(websocket, symbols, endpoint, protocol, fmt)
     
-    logger.info(f"WebSocket connection established for {symbol} technical analysis data")
+    logger.info(f"WebSocket connection established for {symbol} {description}")
 
-    try:
-        while True:
-            await asyncio.sleep(60)  # Keep connection alive
-    except WebSocketDisconnect:
-        logger.info(f"WebSocket disconnected for {symbol} technical analysis data")
-    except asyncio.CancelledError:
-        # This happens during server shutdown - it's normal
-        logger.info(f"WebSocket cancelled for {symbol} (server shutdown)")
-    except Exception as e:
-        logger.error(f"WebSocket error for {symbol}: {e}")
-    finally:
-        remove_connection(websocket)
+    async def send_snapshot():
+        # Queued ahead of later deltas; a pending snapshot is replaced by a newer one
+        outbox.offer(("snapshot", symbol, endpoint), await snapshot_frame(symbol, endpoint, fmt))
 
-@router.websocket("/ws/raw-data")
-async def websocket_raw_data_endpoint(websocket: WebSocket, ticker: str = Query("BTCUSDT")):
-    await websocket.accept()
-    
-    # Extract symbol from ticker (remove USDT suffix)
-    symbol = ticker.replace("USDT", "")
-    add_connection(websocket, symbol, "raw-data")
-    
-    logger.info(f"WebSocket connection established for {symbol} raw data")
+    async def on_message(text):
+        try:
+            message = json.loads(text)
+        except ValueError:
+            return
+        if isinstance(message, dict) and message.get("type") == "resync":
+            await send_snapshot()
 
     try:
-        while True:
-            await asyncio.sleep(60)  # Keep connection alive
+        if endpoint == "data-batch":
+            # Every symbol's current row up front, then one row per trade
+            outbox.offer(("snapshot", endpoint), await batch_frame(symbols))
+
+        on_message_handler = None
+        if protocol == DELTA_PROTOCOL:
+            await send_snapshot()
+            on_message_handler = on_message
+
+        # Returns on idle timeout, raises WebSocketDisconnect when the client goes away
+        await hold_connection(websocket, on_message_handler)
+        logger.info(f"WebSocket idle timeout for {symbol} {description}")
     except WebSocketDisconnect:
-        logger.info(f"WebSocket disconnected for {symbol} raw data")
+        logger.info(f"WebSocket disconnected for {symbol} {description}")
+    except Overloaded:
+        # 1013 Try Again Later: the snapshot could not be built under the current load
+        await websocket.close(code=1013)
     except asyncio.CancelledError:
         # This happens during server shutdown - it's normal
         logger.info(f"WebSocket cancelled for {symbol} (server shutdown)")
@@ -52,25 +74,25 @@ async def websocket_raw_data_endpoint(websocket: WebSocket, ticker: str = Query(
     finally:
         remove_connection(websocket)
 
-@router.websocket("/ws/live-price")
-async def websocket_live_price_endpoint(websocket: WebSocket, ticker: str = Query("BTCUSDT")):
-    await websocket.accept()
-    
-    # Extract symbol from ticker (remove USDT suffix)
-    symbol = ticker.replace("USDT", "")
-    add_connection(websocket, symbol, "live-price")
-    
-    logger.info(f"WebSocket connection established for {symbol} live price")
-
+@router.websocket("/ws/data")
+async def websocket_data_endpoint(websocket: WebSocket, ticker: str = Query("BTCUSDT"), protocol: int = Query(1),
+                                  format: str = Query(JSON_FRAMES), symbols: str | None = Query(None)):
+    if symbols is None:
+        await serve_subscription(websocket, ticker, "data", "technical analysis data", protocol, format)
+        return
     try:
-        while True:
-            await asyncio.sleep(60)  # Keep connection alive
-    except WebSocketDisconnect:
-        logger.info(f"WebSocket disconnected for {symbol} live price")
-    except asyncio.CancelledError:
-        # This happens during server shutdown - it's normal
-        logger.info(f"WebSocket cancelled for {symbol} (server shutdown)")
-    except Exception as e:
-        logger.error(f"WebSocket error for {symbol}: {e}")
-    finally:
-        remove_connection(websocket)
\ No newline at end of file
+        tickers = parse_symbols(symbols)
+    except HTTPException:
+        await websocket.close(code=1008)
+        return
+    await serve_subscription(websocket, ticker, "data-batch", "technical analysis data", tickers=tickers)
+
+@router.websocket("/ws/raw-data")
+async def websocket_raw_data_endpoint(websocket: WebSocket, ticker: str = Query("BTCUSDT"), protocol: int = Query(1),
+                                      format: str = Query(JSON_FRAMES)):
+    await serve_subscription(websocket, ticker, "raw-data", "raw data", protocol, format)
+
+@router.websocket("/ws/live-price")
+async def websocket_live_price_endpoint(websocket: WebSocket, ticker: str = Query("BTCUSDT"),
+                                        format: str = Query(JSON_FRAMES)):
+    await serve_subscription(websocket, ticker, "live-price", "live price", fmt=format)
@@ -0,0 +1,60 @@
+import asyncio
+import random
+import time
+from config.settings import KLINE_REFRESH_DELAY, KLINE_REFRESH_CONCURRENCY
+from utils.binance_data import cached_symbols, get_candles, refresh_candles, DEFAULT_DAYS
+from utils.binance_rest import INTERVAL_MS, KLINE_INTERVAL_1DAY
+
+DAY_MS = INTERVAL_MS[KLINE_INTERVAL_1DAY]
+
+# Startup warm-up progress, served by /api/ready
+readiness = {
+    "ready": False,
+    "warmed": 0,
+    "total": 0,
+    "failed": [],
+    "started_at": None,
+    "ready_at": None,
+}
+
+async def _bounded(coroutines):
+    semaphore = asyncio.Semaphore(KLINE_REFRESH_CONCURRENCY)
+
+    async def run(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*(run(coroutine) for coroutine in coroutines))
+
+async def prewarm(tickers, days=DEFAULT_DAYS):
+    """Load every ticker's daily candles into the cache; the API reports ready once all are tried"""
+    readiness.update(ready=False, warmed=0, total=len(tickers), failed=[], started_at=time.time(), ready_at=None)
+
+    async def warm(ticker):
+        try:
+            await get_candles(ticker, days)
+            readiness["warmed"] += 1
+        except Exception as e:
+            readiness["failed"].append(ticker)
+            print(f"Could not pre-warm {ticker} klines: {e}")
+
+    await _bounded(warm(ticker) for ticker in tickers)
+    readiness["ready"] = True
+    readiness["ready_at"] = time.time()
+    print(f"Kline cache warm: {readiness['warmed']}/{len(tickers)} symbols in {readiness['ready_at'] - readiness['started_at']:.1f}s")
+
+def seconds_until_refresh(now=None):
+    """Seconds until KLINE_REFRESH_DELAY after the next daily (00:00 UTC) close"""
+    now_ms = int((time.time() if now is None else now) * 1000)
+    next_close_ms = now_ms - now_ms % DAY_MS + DAY_MS
+    return (next_close_ms - now_ms) / 1000 + KLINE_REFRESH_DELAY
+
+async def refresh_after_close():
+    """Refresh every cached symbol right after each daily close, so no request waits on upstream"""
+    while True:
+        # Jitter spreads processes sharing the kline directory; the first to refresh serves the others
+        await asyncio.sleep(seconds_until_refresh() + random.uniform(0, KLINE_REFRESH_DELAY))
+        symbols = cached_symbols()
+        started = time.time()
+        await _bounded(refresh_candles(symbol) for symbol in symbols)
+        print(f"Refreshed {len(symbols)} symbols after the daily close in {time.time() - started:.1f}s")
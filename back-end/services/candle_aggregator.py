@@ -0,0 +1,254 @@
+import asyncio
+import time
+import numpy as np
+from config.settings import AGGREGATOR_CAPACITY
+from services.stream_manager import seeds, streams
+from utils.binance_rest import client, INTERVAL_MS
+from utils.candles import Candles, FIELDS
+
+# Finest first; every interval's buckets nest inside the next one's
+INTERVALS = ["1m", "5m", "15m", "1h", "4h", "1d"]
+
+# A candle in progress: [open_time, open, high, low, close, volume, quote_volume, trades]
+def _merge(into, part):
+    """Fold the later candle ``part`` into ``into`` (same or enclosing bucket)"""
+    if part[2] > into[2]:
+        into[2] = part[2]
+    if part[3] < into[3]:
+        into[3] = part[3]
+    into[4] = part[4]
+    into[5] += part[5]
+    into[6] += part[6]
+    into[7] += part[7]
+
+def _rebucket(candle, interval_ms):
+    candle = list(candle)
+    candle[0] -= candle[0] % interval_ms
+    return candle
+
+class _Level:
+    """Closed candles of one interval in a ring buffer, plus the candle in progress"""
+
+    def __init__(self, interval, capacity):
+        self.interval = interval
+        self.interval_ms = INTERVAL_MS[interval]
+        self.capacity = capacity
+        self.arrays = [np.zeros(capacity, dtype=dtype) for _, dtype, _ in FIELDS]
+        self.start = 0
+        self.count = 0
+        self.closed_total = 0  # Candles closed so far, used as a version
+        self.current = None
+        self.pending = None  # Part of ``current`` not yet folded into the next interval
+
+    def push_closed(self, candle):
+        index = (self.start + self.count) % self.capacity
+        for array, value in zip(self.arrays, candle):
+            array[index] = value
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+        self.closed_total += 1
+
+    def closed(self):
+        """Closed candles in time order (a copy)"""
+        order = (self.start + np.arange(self.count)) % self.capacity
+        return [array[order] for array in self.arrays]
+
+class _SymbolCandles:
+    """Live candles for one symbol at every interval.
+
+    Trades only touch the 1m candle in progress. Each interval's candle in progress
+    holds its closed children; closed candles are folded upwards once, and reads fold
+    in the unfinished children on the fly.
+    """
+
+    def __init__(self, capacity):
+        self.levels = [_Level(interval, capacity) for interval in INTERVALS]
+        self.seeded = False
+        self.generation = 0  # Bumped on every reseed
+        self.updates = 0  # Trades applied, so any change to the candles changes the version
+        self.updated_at = None  # Epoch seconds of the last trade applied, or of the seed
+
+    def add_trade(self, price, quantity, trade_time):
+        base = self.levels[0]
+        bucket = trade_time - trade_time % base.interval_ms
+        current = base.current
+        self.updates += 1
+        self.updated_at = trade_time / 1000
+
+        if current is not None and bucket == current[0]:
+            if price > current[2]:
+                current[2] = price
+            if price < current[3]:
+                current[3] = price
+            current[4] = price
+            current[5] += quantity
+            current[6] += price * quantity
+            current[7] += 1
+            pending = base.pending
+            if pending is None:
+                base.pending = [bucket, price, price, price, price, quantity, price * quantity, 1]
+            else:
+                _merge(pending, [bucket, price, price, price, price, quantity, price * quantity, 1])
+            return
+        if current is not None and bucket < current[0]:
+            return  # Late trade for a candle that already closed
+
+        self._close_before(bucket)
+        base.current = [bucket, price, price, price, price, quantity, price * quantity, 1]
+        base.pending = list(base.current)
+
+    def _close_before(self, time_ms):
+        """Close every candle in progress whose bucket ends at or before time_ms"""
+        for index, level in enumerate(self.levels):
+            current = level.current
+            if current is None or time_ms - time_ms % level.interval_ms <= current[0]:
+                break
+            if index + 1 < len(self.levels) and level.pending is not None:
+                parent = self.levels[index + 1]
+                if parent.current is None:
+                    parent.current = _rebucket(level.pending, parent.interval_ms)
+                    parent.pending = list(parent.current)
+                else:
+                    _merge(parent.current, level.pending)
+                    if parent.pending is None:
+                        parent.pending = _rebucket(level.pending, parent.interval_ms)
+                    else:
+                        _merge(parent.pending, level.pending)
+            level.push_closed(current)
+            level.current = None
+            level.pending = None
+
+    def _unfolded(self, index):
+        """Everything below ``index`` that its candle in progress does not hold yet"""
+        if index == 0:
+            return None
+        child = self.levels[index - 1]
+        below = self._unfolded(index - 1)
+        if child.pending is None:
+            return below
+        pending = list(child.pending)
+        if below is not None:
+            _merge(pending, below)
+        return pending
+
+    def live(self, index):
+        """The candle in progress at ``index``, including unfinished children"""
+        level = self.levels[index]
+        unfolded = self._unfolded(index)
+        if level.current is None:
+            return _rebucket(unfolded, level.interval_ms) if unfolded is not None else None
+        current = list(level.current)
+        if unfolded is not None:
+            _merge(current, unfolded)
+        return current
+
+    def seed(self, index, klines):
+        """Replace an interval's candles with REST klines; the last one stays in progress"""
+        level = _Level(self.levels[index].interval, self.levels[index].capacity)
+        if klines:
+            candles = Candles.from_klines(klines)
+            rows = zip(*(getattr(candles, name).tolist() for name, _, _ in FIELDS))
+            *closed, last = [list(row) for row in rows]
+            for candle in closed[-level.capacity:]:
+                level.push_closed(candle)
+            # Already counted in the enclosing interval's REST candle, so nothing is pending
+            level.current = last
+        self.levels[index] = level
+
+class CandleAggregator:
+    """Builds 1m/5m/15m/1h/4h/1d candles per symbol from the trade stream.
+
+    Each symbol is seeded once from REST so charts have history; from then on
+    candles are served from memory without upstream requests. Symbols outside the
+    stream universe are never kept and come from REST on every read.
+    """
+
+    def __init__(self, capacity=AGGREGATOR_CAPACITY):
+        self.capacity = capacity
+        self._symbols = {}
+        self._seeding = {}
+
+    def _get(self, symbol):
+        candles = self._symbols.get(symbol)
+        if candles is None:
+            candles = self._symbols[symbol] = _SymbolCandles(self.capacity)
+        return candles
+
+    def add_trade(self, symbol, price, quantity, trade_time):
+        self._get(symbol).add_trade(price, quantity, trade_time)
+
+    def forget(self, symbol):
+        """Drop a symbol whose trades are no longer streamed; the next read reseeds it"""
+        self._symbols.pop(symbol, None)
+
+    def version(self, symbol, interval):
+        """Changes whenever a candle closes (or the symbol is reseeded); None before seeding"""
+        candles = self._symbols.get(symbol)
+        if candles is None or not candles.seeded:
+            return None
+        return candles.generation, candles.levels[INTERVALS.index(interval)].closed_total
+
+    def live_version(self, symbol):
+        """Changes with every trade, including updates to the candles in progress"""
+        candles = self._symbols.get(symbol)
+        if candles is None or not candles.seeded:
+            return None
+        return candles.generation, candles.updates
+
+    def updated_at(self, symbol):
+        """Epoch seconds of the last change to a seeded symbol's candles, or None"""
+        candles = self._symbols.get(symbol)
+        if candles is None or not candles.seeded:
+            return None
+        return candles.updated_at
+
+    async def _seed(self, symbol):
+        # One kline request per interval, fetched together
+        results = await asyncio.gather(*(
+            seeds.get_klines(symbol, interval, limit=min(self.capacity + 1, 1000)) for interval in INTERVALS
+        ))
+        candles = self._get(symbol)
+        for index, klines in enumerate(results):
+            candles.seed(index, klines)
+        candles.seeded = True
+        candles.generation += 1
+        candles.updated_at = time.time()
+
+    async def ensure_seeded(self, symbol):
+        candles = self._symbols.get(symbol)
+        if candles is not None and candles.seeded:
+            return
+        task = self._seeding.get(symbol)
+        if task is None:
+            task = self._seeding[symbol] = asyncio.ensure_future(self._seed(symbol))
+            task.add_done_callback(lambda _: self._seeding.pop(symbol, None))
+        try:
+            await asyncio.shield(task)
+        except Exception as e:
+            # Serve whatever the stream has built; seeding is retried on the next read
+            print(f"Could not seed {symbol} candles from REST: {e}")
+
+    async def get(self, symbol, interval, since_ms=None):
+        """Candles for symbol/interval in time order; the last one is still in progress"""
+        if interval not in INTERVALS:
+            raise ValueError(f"Unsupported interval: {interval}")
+        if not streams.allowed(symbol.upper()):
+            # Outside the universe no trades arrive, so seeded candles would go stale: read REST every time
+            klines = await client.get_klines(symbol, interval, limit=min(self.capacity + 1, 1000))
+            result = Candles.from_klines(klines)
+            return result.since(since_ms) if since_ms is not None else result
+        await self.ensure_seeded(symbol)
+
+        candles = self._get(symbol)
+        index = INTERVALS.index(interval)
+        arrays = candles.levels[index].closed()
+        live = candles.live(index)
+        if live is not None:
+            arrays = [np.append(array, value) for array, value in zip(arrays, live)]
+
+        result = Candles(**{name: array for (name, _, _), array in zip(FIELDS, arrays)})
+        return result.since(since_ms) if since_ms is not None else result
+
+aggregator = CandleAggregator()
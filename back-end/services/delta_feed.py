@@ -0,0 +1,62 @@
+# Ordering for "first changed key": before every record, at a record, after every record
+_BEFORE_ALL = (0,)
+_AFTER_ALL = (2,)
+
+class DeltaFeed:
+    """Sequence-numbered snapshot/delta stream over a list of records sorted by timestamp.
+
+    Each update is diffed against the previous one and published as a delta holding
+    every record from the first changed one onwards, plus the window ``start``
+    (records before it are dropped). A client may apply a delta if it holds
+    ``base`` or anything newer: ``base`` is the last earlier message whose changes
+    the delta does not cover, so deltas that were conflated away are harmless.
+    """
+
+    def __init__(self, key="timestamp"):
+        self.key = key
+        self.seq = 0
+        self.records = None
+        # (seq, first changed key) of messages not yet covered by a later delta, increasing keys
+        self._uncovered = []
+
+    def snapshot(self):
+        return {"type": "snapshot", "seq": self.seq, "data": self.records or []}
+
+    def _reset(self, records):
+        self.seq += 1
+        self.records = records
+        self._uncovered = [(self.seq, _BEFORE_ALL)]  # Nothing reaches behind a snapshot
+        return self.snapshot()
+
+    def update(self, records):
+        """Adopt new records; returns the message to publish, or None if nothing changed"""
+        old = self.records
+        if old is records:
+            return None
+        if not old or not records:
+            return self._reset(records)
+
+        key = self.key
+        start = records[0][key]
+        offset = next((index for index, record in enumerate(old) if record[key] == start), None)
+        if offset is None or len(old) - offset > len(records):
+            return self._reset(records)
+
+        changed = 0
+        while changed < len(old) - offset and old[offset + changed] == records[changed]:
+            changed += 1
+        if changed == len(records) and offset == 0:
+            return None
+        # changed == 0 still makes a delta: a one-row feed (/ws/data) ticks its only row this way
+
+        self.seq += 1
+        self.records = records
+        first_changed = (1, records[changed][key]) if changed < len(records) else _AFTER_ALL
+
+        # Messages whose changes all lie inside this delta's range no longer matter
+        while self._uncovered and self._uncovered[-1][1] >= first_changed:
+            self._uncovered.pop()
+        base = self._uncovered[-1][0]
+        self._uncovered.append((self.seq, first_changed))
+
+        return {"type": "delta", "seq": self.seq, "base": base, "start": start, "data": records[changed:]}
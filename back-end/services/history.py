@@ -0,0 +1,47 @@
+import time
+from config.settings import HTTP_MAX_AGE, OFFLOAD_MIN_CANDLES
+from core.executors import compute
+from services.candle_aggregator import aggregator
+from services.stream_manager import streams
+from utils.binance_data import get_cache_fetched_at, get_versioned_candles
+from utils.binance_rest import INTERVAL_MS
+from utils.date import get_timestamp_days_ago
+from utils.encoding import EncodedCache, encode_candles
+from utils.http_cache import EncodedBody
+
+# Encoded history bodies, reused until the underlying candles change
+encoded_cache = EncodedCache()
+
+async def get_history(symbol, days, interval="1d"):
+    """(candles, version, modified_at) for symbol/interval over the last `days` days.
+
+    ``modified_at`` is when the candles last changed (epoch seconds): the fetch time of
+    the daily series, or the last trade for intraday candles. None if unknown.
+    """
+    if interval == "1d":
+        candles, version = await get_versioned_candles(symbol, days)
+        return candles, version, get_cache_fetched_at(symbol)
+    # Intraday candles are served from the live aggregator, without a REST call
+    streams.touch(symbol.upper())  # The aggregator only moves while the symbol streams
+    candles = await aggregator.get(symbol, interval, get_timestamp_days_ago(days))
+    return candles, aggregator.live_version(symbol), aggregator.updated_at(symbol)
+
+async def encoded_history(symbol, days, interval, media_type):
+    """History encoded as ``media_type`` (an EncodedBody); unchanged data reuses the bytes"""
+    candles, version, modified_at = await get_history(symbol, days, interval)
+    key = (symbol, get_timestamp_days_ago(days), interval, media_type)
+    encoded = encoded_cache.lookup(key, version)
+    if encoded is None:
+        if len(candles) < OFFLOAD_MIN_CANDLES:
+            body = encode_candles(candles, media_type)
+        else:
+            # Formatting years of candles holds the GIL for tens of milliseconds: use the compute pool
+            body = await compute.run(encode_candles, candles, media_type)
+        encoded = encoded_cache.put(key, version, EncodedBody(body, last_modified=modified_at))
+    return encoded
+
+def history_max_age(interval):
+    """Seconds clients may reuse a history response: until the next candle close, at most HTTP_MAX_AGE"""
+    interval_ms = INTERVAL_MS[interval]
+    until_close = (interval_ms - int(time.time() * 1000) % interval_ms) / 1000
+    return min(until_close, HTTP_MAX_AGE)
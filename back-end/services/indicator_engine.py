@@ -0,0 +1,233 @@
+import math
+from collections import deque
+
+import numpy as np
+from utils.candles import format_timestamps
+
+INDICATOR_COLUMNS = ["timestamp", "SMA", "EMA", "RSI", "MACD", "MACD_Signal", "Signal"]
+
+
+class _Ewm:
+    """Running ``Series.ewm(span=..., adjust=False).mean()``"""
+
+    def __init__(self, span):
+        self.alpha = 2.0 / (span + 1.0)
+        self.old_wt_factor = 1.0 - self.alpha
+        self.value = None
+
+    def step(self, value):
+        # Same update order as pandas' ewm kernel so results match bit for bit
+        weighted = self.value
+        if weighted is None:
+            return value
+        if weighted != value:
+            weighted = ((self.old_wt_factor * weighted) + (self.alpha * value)) / (self.old_wt_factor + self.alpha)
+        return weighted
+
+    def push(self, value):
+        self.value = self.step(value)
+        return self.value
+
+
+class _RollingMean:
+    """Running ``Series.rolling(window).mean()`` with pandas' compensated sums"""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.sum_x = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.nobs = 0
+        self.neg_ct = 0
+        self.same_ct = 0
+        self.prev_value = math.nan
+
+    def _state(self):
+        return [self.sum_x, self.compensation_add, self.compensation_remove,
+                self.nobs, self.neg_ct, self.same_ct, self.prev_value]
+
+    def _advance(self, state, value):
+        sum_x, comp_add, comp_remove, nobs, neg_ct, same_ct, prev_value = state
+
+        if len(self.values) == self.window:
+            old = self.values[0]
+            nobs -= 1
+            y = -old - comp_remove
+            t = sum_x + y
+            comp_remove = t - sum_x - y
+            sum_x = t
+            if math.copysign(1.0, old) < 0:
+                neg_ct -= 1
+
+        nobs += 1
+        y = value - comp_add
+        t = sum_x + y
+        comp_add = t - sum_x - y
+        sum_x = t
+        if math.copysign(1.0, value) < 0:
+            neg_ct += 1
+        same_ct = same_ct + 1 if value == prev_value else 1
+        prev_value = value
+
+        return [sum_x, comp_add, comp_remove, nobs, neg_ct, same_ct, prev_value]
+
+    @staticmethod
+    def _mean(window, state):
+        sum_x, _, _, nobs, neg_ct, same_ct, prev_value = state
+        if nobs < window or nobs == 0:
+            return math.nan
+        result = sum_x / nobs
+        if same_ct >= nobs:
+            result = prev_value
+        elif neg_ct == 0 and result < 0:
+            result = 0.0
+        elif neg_ct == nobs and result > 0:
+            result = 0.0
+        return result
+
+    def step(self, value):
+        return self._mean(self.window, self._advance(self._state(), value))
+
+    def push(self, value):
+        (self.sum_x, self.compensation_add, self.compensation_remove,
+         self.nobs, self.neg_ct, self.same_ct, self.prev_value) = self._advance(self._state(), value)
+        self.values.append(value)
+        return self._mean(self.window, self._state())
+
+
+class _WilderRsi:
+    """Running version of ``utils.data_loader.calculate_rsi_wilder``"""
+
+    def __init__(self, period):
+        self.period = period
+        self.count = 0
+        self.prev_close = None
+        self.head = []
+        self.avg_gain = math.nan
+        self.avg_loss = math.nan
+
+    def _gain_loss(self, close):
+        if self.prev_close is None:
+            return 0.0, -0.0
+        delta = close - self.prev_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else -0.0
+        return gain, loss
+
+    def _averages(self, gain, loss):
+        period = self.period
+        avg_gain = (self.avg_gain * (period - 1) + gain) / period
+        avg_loss = (self.avg_loss * (period - 1) + loss) / period
+        return avg_gain, avg_loss
+
+    def step(self, close):
+        # The first Wilder value (index == period) is left undefined, like the batch version
+        if self.count <= self.period:
+            return math.nan
+        avg_gain, avg_loss = self._averages(*self._gain_loss(close))
+        rs = avg_gain / avg_loss if avg_loss != 0 else 0
+        return 100 - (100 / (1 + rs))
+
+    def push(self, close):
+        gain, loss = self._gain_loss(close)
+        if self.count < self.period:
+            self.head.append((gain, loss))
+        elif self.count == self.period:
+            self.head.append((gain, loss))
+            gains, losses = np.array(self.head).T
+            self.avg_gain = gains.sum() / len(gains)
+            self.avg_loss = losses.sum() / len(losses)
+            self.head = []
+        else:
+            self.avg_gain, self.avg_loss = self._averages(gain, loss)
+        self.prev_close = close
+        self.count += 1
+
+
+class IndicatorEngine:
+    """Indicator state for one symbol, seeded from closed candles.
+
+    The last candle of a kline frame is the provisional "today" candle whose close
+    follows the live price. Closed candles are folded into running state once, so
+    evaluating the provisional candle is O(1) and matches a full pandas recomputation.
+    """
+
+    def __init__(self, sma_period=14, ema_period=14, rsi_period=14, macd_fast=12, macd_slow=26, macd_signal=9):
+        self.sma = _RollingMean(sma_period)
+        self.ema = _Ewm(ema_period)
+        self.rsi = _WilderRsi(rsi_period)
+        self.ema_fast = _Ewm(macd_fast)
+        self.ema_slow = _Ewm(macd_slow)
+        self.macd_signal = _Ewm(macd_signal)
+        self.closed_count = 0
+        self.first_open_time = None
+        self.open_time = None
+        self.timestamp = None
+        self.reference_close = None
+        self.version = None
+
+    @classmethod
+    def from_candles(cls, candles, **periods):
+        """Seed an engine from candles whose last entry is the provisional candle.
+
+        With no candles at all (nothing in the window) the engine evaluates to a row of None.
+        """
+        engine = cls(**periods)
+        if len(candles) == 0:
+            return engine
+        for close in candles.close[:-1].tolist():
+            engine._push(close)
+        engine.first_open_time = int(candles.open_time[0])
+        engine._set_provisional(int(candles.open_time[-1]), float(candles.close[-1]))
+        return engine
+
+    def _set_provisional(self, open_time, reference_close):
+        self.open_time = open_time
+        self.timestamp = format_timestamps([open_time])[0]
+        self.reference_close = reference_close
+
+    def _push(self, close):
+        self.sma.push(close)
+        self.ema.push(close)
+        self.rsi.push(close)
+        macd = self.ema_fast.push(close) - self.ema_slow.push(close)
+        self.macd_signal.push(macd)
+        self.closed_count += 1
+
+    def roll(self, final_close, open_time, reference_close):
+        """Close the provisional candle and start a new one"""
+        self._push(final_close)
+        self._set_provisional(open_time, reference_close)
+
+    def try_roll(self, candles):
+        """Roll forward if ``candles`` extend the seeded ones by exactly one candle"""
+        if len(candles) != self.closed_count + 2:
+            return False
+        if int(candles.open_time[0]) != self.first_open_time or int(candles.open_time[-2]) != self.open_time:
+            return False
+        self.roll(float(candles.close[-2]), int(candles.open_time[-1]), float(candles.close[-1]))
+        return True
+
+    def evaluate(self, close=None):
+        """Indicators for the provisional candle closing at ``close``"""
+        if self.open_time is None:
+            return dict.fromkeys(INDICATOR_COLUMNS)
+        if close is None:
+            close = self.reference_close
+        sma = self.sma.step(close)
+        ema = self.ema.step(close)
+        macd = self.ema_fast.step(close) - self.ema_slow.step(close)
+        row = {
+            "timestamp": self.timestamp,
+            "SMA": sma,
+            "EMA": ema,
+            "RSI": self.rsi.step(close),
+            "MACD": macd,
+            "MACD_Signal": self.macd_signal.step(macd),
+            "Signal": int(sma > ema),
+        }
+        for key, value in row.items():
+            if isinstance(value, float) and not math.isfinite(value):
+                row[key] = None
+        return row
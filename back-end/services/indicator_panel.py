@@ -0,0 +1,202 @@
+import numpy as np
+from services.indicator_engine import INDICATOR_COLUMNS
+from utils.candles import format_timestamps
+
+
+class _PanelEwm:
+    """``_Ewm`` over a vector of symbols"""
+
+    def __init__(self, span, size):
+        self.alpha = 2.0 / (span + 1.0)
+        self.old_wt_factor = 1.0 - self.alpha
+        self.value = np.full(size, np.nan)
+
+    def step(self, value):
+        weighted = self.value
+        with np.errstate(invalid="ignore"):
+            blended = ((self.old_wt_factor * weighted) + (self.alpha * value)) / (self.old_wt_factor + self.alpha)
+        return np.where(np.isnan(weighted), value, np.where(weighted != value, blended, weighted))
+
+    def push(self, value):
+        self.value = self.step(value)
+        return self.value
+
+
+class _PanelRollingMean:
+    """``_RollingMean`` over a vector of symbols sharing one history length"""
+
+    def __init__(self, window, size):
+        self.window = window
+        self.rows = []  # Last ``window`` pushed rows
+        self.sum_x = np.zeros(size)
+        self.compensation_add = np.zeros(size)
+        self.compensation_remove = np.zeros(size)
+        self.nobs = 0
+        self.neg_ct = np.zeros(size, dtype=np.int64)
+        self.same_ct = np.zeros(size, dtype=np.int64)
+        self.prev_value = np.full(size, np.nan)
+
+    def _state(self):
+        return [self.sum_x, self.compensation_add, self.compensation_remove,
+                self.nobs, self.neg_ct, self.same_ct, self.prev_value]
+
+    def _advance(self, state, value):
+        sum_x, comp_add, comp_remove, nobs, neg_ct, same_ct, prev_value = state
+
+        if len(self.rows) == self.window:
+            old = self.rows[0]
+            nobs -= 1
+            y = -old - comp_remove
+            t = sum_x + y
+            comp_remove = t - sum_x - y
+            sum_x = t
+            neg_ct = neg_ct - np.signbit(old)
+
+        nobs += 1
+        y = value - comp_add
+        t = sum_x + y
+        comp_add = t - sum_x - y
+        sum_x = t
+        neg_ct = neg_ct + np.signbit(value)
+        same_ct = np.where(value == prev_value, same_ct + 1, 1)
+        prev_value = value
+
+        return [sum_x, comp_add, comp_remove, nobs, neg_ct, same_ct, prev_value]
+
+    @staticmethod
+    def _mean(window, state):
+        sum_x, _, _, nobs, neg_ct, same_ct, prev_value = state
+        if nobs < window or nobs == 0:
+            return np.full(len(sum_x), np.nan)
+        result = sum_x / nobs
+        result = np.where(same_ct >= nobs, prev_value, result)
+        result = np.where((same_ct < nobs) & (neg_ct == 0) & (result < 0), 0.0, result)
+        return np.where((same_ct < nobs) & (neg_ct == nobs) & (result > 0), 0.0, result)
+
+    def step(self, value):
+        return self._mean(self.window, self._advance(self._state(), value))
+
+    def push(self, value):
+        (self.sum_x, self.compensation_add, self.compensation_remove,
+         self.nobs, self.neg_ct, self.same_ct, self.prev_value) = self._advance(self._state(), value)
+        self.rows.append(value)
+        if len(self.rows) > self.window:
+            self.rows.pop(0)
+
+
+class _PanelWilderRsi:
+    """``_WilderRsi`` over a vector of symbols sharing one history length"""
+
+    def __init__(self, period, size):
+        self.period = period
+        self.count = 0
+        self.prev_close = None
+        self.head = []
+        self.avg_gain = np.full(size, np.nan)
+        self.avg_loss = np.full(size, np.nan)
+
+    def _gain_loss(self, close):
+        if self.prev_close is None:
+            return np.zeros(len(close)), np.full(len(close), -0.0)
+        delta = close - self.prev_close
+        return np.where(delta > 0, delta, 0.0), np.where(delta < 0, -delta, -0.0)
+
+    def _averages(self, gain, loss):
+        period = self.period
+        return (self.avg_gain * (period - 1) + gain) / period, (self.avg_loss * (period - 1) + loss) / period
+
+    def step(self, close):
+        if self.count <= self.period:
+            return np.full(len(close), np.nan)
+        avg_gain, avg_loss = self._averages(*self._gain_loss(close))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = np.where(avg_loss != 0, avg_gain / avg_loss, 0)
+        return 100 - (100 / (1 + rs))
+
+    def push(self, close):
+        gain, loss = self._gain_loss(close)
+        if self.count <= self.period:
+            self.head.append((gain, loss))
+            if self.count == self.period:
+                # Summed along contiguous rows, the same pairwise sum the 1-D engine uses
+                gains = np.ascontiguousarray(np.array([g for g, _ in self.head]).T)
+                losses = np.ascontiguousarray(np.array([l for _, l in self.head]).T)
+                self.avg_gain = gains.sum(axis=1) / len(self.head)
+                self.avg_loss = losses.sum(axis=1) / len(self.head)
+                self.head = []
+        else:
+            self.avg_gain, self.avg_loss = self._averages(gain, loss)
+        self.prev_close = close
+        self.count += 1
+
+
+def _values(array):
+    # Python floats, with None for NaN/inf like the engine's rows
+    finite = np.isfinite(array)
+    if finite.all():
+        return array.tolist()
+    return [value if ok else None for value, ok in zip(array.tolist(), finite.tolist())]
+
+
+class IndicatorPanel:
+    """``IndicatorEngine`` for many symbols at once.
+
+    Closed candles form a time x symbol matrix that is folded into per-symbol state
+    vectors in one pass over time, so seeding costs the same few numpy operations per
+    candle for 3 symbols or 300, and evaluating every symbol's provisional candle is a
+    handful of vector operations. Results match one ``IndicatorEngine`` per symbol.
+    All symbols in a panel must have the same number of candles.
+    """
+
+    def __init__(self, size, sma_period=14, ema_period=14, rsi_period=14, macd_fast=12, macd_slow=26, macd_signal=9):
+        self.sma = _PanelRollingMean(sma_period, size)
+        self.ema = _PanelEwm(ema_period, size)
+        self.rsi = _PanelWilderRsi(rsi_period, size)
+        self.ema_fast = _PanelEwm(macd_fast, size)
+        self.ema_slow = _PanelEwm(macd_slow, size)
+        self.macd_signal = _PanelEwm(macd_signal, size)
+        self.size = size
+        self.timestamps = []
+        self.reference_close = np.full(size, np.nan)
+
+    @classmethod
+    def from_candles(cls, candles_list, **periods):
+        """Seed a panel from equal-length candles whose last entries are the provisional candles"""
+        lengths = {len(candles) for candles in candles_list}
+        if len(lengths) != 1:
+            raise ValueError(f"Panel candles must share one length, got {sorted(lengths)}")
+        panel = cls(len(candles_list), **periods)
+        if lengths == {0}:
+            return panel  # Nothing in the window: every row evaluates to None
+        closed = np.column_stack([candles.close[:-1] for candles in candles_list]).astype(float)
+        for row in closed:
+            panel._push(row)
+        panel.timestamps = format_timestamps([int(candles.open_time[-1]) for candles in candles_list])
+        panel.reference_close = np.array([float(candles.close[-1]) for candles in candles_list])
+        return panel
+
+    def _push(self, close):
+        self.sma.push(close)
+        self.ema.push(close)
+        self.rsi.push(close)
+        macd = self.ema_fast.push(close) - self.ema_slow.push(close)
+        self.macd_signal.push(macd)
+
+    def evaluate(self, close=None):
+        """Indicator rows for every symbol's provisional candle closing at ``close``"""
+        if not self.timestamps:
+            return [dict.fromkeys(INDICATOR_COLUMNS) for _ in range(self.size)]
+        close = self.reference_close if close is None else np.asarray(close, dtype=float)
+        sma = self.sma.step(close)
+        ema = self.ema.step(close)
+        macd = self.ema_fast.step(close) - self.ema_slow.step(close)
+        columns = {
+            "timestamp": self.timestamps,
+            "SMA": _values(sma),
+            "EMA": _values(ema),
+            "RSI": _values(self.rsi.step(close)),
+            "MACD": _values(macd),
+            "MACD_Signal": _values(self.macd_signal.step(macd)),
+            "Signal": (sma > ema).astype(int).tolist(),
+        }
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
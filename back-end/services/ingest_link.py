@@ -0,0 +1,343 @@
+import asyncio
+import itertools
+import json
+import os
+import random
+import time
+from config.settings import INGEST_CLIENT_BUFFER, INGEST_MIN_BACKOFF, INGEST_MAX_BACKOFF
+from services.universe import SYMBOLS, apply_assets, ticker as usdt_ticker
+from utils.binance_rest import client, BinanceRestError, KLINE_INTERVAL_1DAY, MAX_KLINES_PER_REQUEST
+
+# Seconds between upstream state broadcasts, shown by the workers' /api/health
+STATE_INTERVAL = 2.0
+# A REST read re-touches a symbol at most this often; the ingest process keeps it for STREAM_IDLE_TTL
+TOUCH_INTERVAL = 5.0
+# Kline reads are answered for every worker from one upstream request, reused for this many seconds
+KLINES_TTL = 10.0
+# Seconds a worker waits for the ingest process to answer a kline read
+KLINES_TIMEOUT = 60.0
+
+def _line(message):
+    return json.dumps(message).encode() + b"\n"
+
+class IngestServer:
+    """Shares one process's Binance streams with the API workers over a Unix socket.
+
+    Every trade is encoded once and written to each connected worker as a JSON line;
+    workers send back watch/unwatch/touch commands, which are applied to the stream
+    manager for them. A worker that falls more than INGEST_CLIENT_BUFFER bytes behind
+    is dropped rather than stalling the others; it reconnects and re-sends its watches.
+
+    The workers' REST seeds (klines for candles, 24h stats and the daily cache) are read
+    here too, so workers starting together cost one upstream request per seed, not one each.
+    """
+
+    def __init__(self, manager, path, rest=client):
+        self.manager = manager
+        self.path = path
+        self.rest = rest
+        self.clients = {}  # {writer: {ticker: watch count}}
+        self.handlers = set()
+        self.server = None
+        self._state_task = None
+        self._klines = {}  # {request key: (monotonic time, task)}
+        self._answers = set()
+
+    async def start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # Left over from a previous run
+        self.server = await asyncio.start_unix_server(self._serve, self.path)
+        self._state_task = asyncio.ensure_future(self._publish_state())
+
+    async def stop(self):
+        if self._state_task is not None:
+            self._state_task.cancel()
+        for task in list(self._answers):
+            task.cancel()
+        for writer in list(self.clients):
+            writer.close()
+        # Closed sockets end the handlers, which release their workers' watches
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _send(self, writer, line):
+        if writer.is_closing():
+            return
+        if writer.transport.get_write_buffer_size() > INGEST_CLIENT_BUFFER:
+            print("Dropping an API worker that is not keeping up with the trade stream")
+            writer.close()
+            return
+        writer.write(line)
+
+    def publish(self, message):
+        line = _line(message)
+        for writer in list(self.clients):
+            self._send(writer, line)
+
+    async def publish_trade(self, payload):
+        self.publish({"type": "trade", "data": payload})
+
+    def publish_removed(self, ticker):
+        self.publish({"type": "removed", "ticker": ticker})
+
+    def _state_message(self):
+        return {"type": "state", "ingest": self.manager.state(), "streaming": self.manager.streaming()}
+
+    async def _publish_state(self):
+        while True:
+            await asyncio.sleep(STATE_INTERVAL)
+            self.publish(self._state_message())
+
+    def _read_klines(self, symbol, interval, start_ms, end_ms, limit):
+        # One upstream request per distinct read, shared while it runs and for KLINES_TTL after
+        key = (symbol, interval, start_ms, end_ms, limit)
+        now = time.monotonic()
+        for stale in [cached for cached, (at, _) in self._klines.items() if now - at >= KLINES_TTL]:
+            del self._klines[stale]
+        entry = self._klines.get(key)
+        if entry is None:
+            if limit is None:
+                task = asyncio.ensure_future(self.rest.get_historical_klines(symbol, interval, start_ms, end_ms))
+            else:
+                task = asyncio.ensure_future(self.rest.get_klines(symbol, interval, start_ms, end_ms, limit))
+            entry = self._klines[key] = (now, task)
+
+            def failed(done):
+                # A failed read is retried by the next worker that asks
+                if (done.cancelled() or done.exception() is not None) and self._klines.get(key) is entry:
+                    del self._klines[key]
+
+            task.add_done_callback(failed)
+        return entry[1]
+
+    async def _answer_klines(self, writer, request):
+        reply = {"type": "klines", "id": request["id"]}
+        try:
+            reply["data"] = await asyncio.shield(self._read_klines(
+                request["symbol"], request["interval"], request.get("start_ms"), request.get("end_ms"), request.get("limit"),
+            ))
+        except BinanceRestError as e:
+            reply.update(status=e.status, error=e.message)  # Raised again in the worker as it was here
+        except Exception as e:
+            reply.update(status=None, error=str(e))
+        self._send(writer, _line(reply))
+
+    async def _serve(self, reader, writer):
+        watches = self.clients[writer] = {}
+        handler = asyncio.current_task()
+        self.handlers.add(handler)
+        print(f"API worker connected. Total workers: {len(self.clients)}")
+        # The ingest process owns the universe, so every worker serves the same symbols
+        self._send(writer, _line({"type": "hello", "symbols": [item["symbol"] for item in SYMBOLS]}))
+        self._send(writer, _line(self._state_message()))
+        try:
+            async for line in reader:
+                command = json.loads(line)
+                op = command["op"]
+                if op == "klines":
+                    task = asyncio.ensure_future(self._answer_klines(writer, command))
+                    self._answers.add(task)
+                    task.add_done_callback(self._answers.discard)
+                    continue
+                ticker = command["ticker"]
+                if op == "watch":
+                    watches[ticker] = watches.get(ticker, 0) + 1
+                    self.manager.watch(ticker)
+                elif op == "unwatch" and watches.get(ticker):
+                    watches[ticker] -= 1
+                    self.manager.unwatch(ticker)
+                elif op == "touch":
+                    self.manager.touch(ticker)
+        except (ConnectionError, ValueError, KeyError) as e:
+            print(f"API worker connection failed: {e}")
+        finally:
+            # The worker's subscribers are gone with it
+            self.clients.pop(writer, None)
+            self.handlers.discard(handler)
+            for ticker, count in watches.items():
+                for _ in range(count):
+                    self.manager.unwatch(ticker)
+            writer.close()
+            print(f"API worker disconnected. Total workers: {len(self.clients)}")
+
+class IngestClient:
+    """The StreamManager of an API worker: trades come from the ingest process.
+
+    Watches are reference counted locally and forwarded once per symbol, and
+    re-sent after a reconnect; trades, removals and the upstream state arrive
+    as JSON lines and are handed to the same callbacks a local manager uses.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.on_message = None
+        self.on_removed = None
+        self.task = None
+        self.writer = None
+        self._watchers = {}  # {ticker: subscriber count}
+        self._touched = {}  # {ticker: monotonic time of the last touch sent}
+        self._upstream = {"ingest": None, "streaming": []}
+        self.universe = None  # Tickers the ingest process may stream, from its hello; None allows any
+        self._requests = {}  # {request id: future of the kline read}
+        self._ids = itertools.count()
+        self._connected = asyncio.Event()
+        self.state_info = {
+            "status": "stopped",  # stopped | connecting | connected | reconnecting
+            "connected_since": None,
+            "reconnects": 0,
+            "last_error": None,
+        }
+
+    def allowed(self, ticker):
+        return self.universe is None or ticker in self.universe
+
+    def start(self, on_message, on_removed=None):
+        self.on_message = on_message
+        self.on_removed = on_removed
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        self.state_info["status"] = "stopped"
+        self.state_info["connected_since"] = None
+
+    def _send(self, op, ticker):
+        if self.writer is not None and not self.writer.is_closing():
+            self.writer.write(_line({"op": op, "ticker": ticker}))
+
+    def watch(self, ticker):
+        self._watchers[ticker] = self._watchers.get(ticker, 0) + 1
+        if self._watchers[ticker] == 1:
+            self._send("watch", ticker)
+
+    def unwatch(self, ticker):
+        count = self._watchers.get(ticker, 0) - 1
+        if count > 0:
+            self._watchers[ticker] = count
+            return
+        if self._watchers.pop(ticker, None) is not None:
+            self._send("unwatch", ticker)
+
+    def touch(self, ticker):
+        now = time.monotonic()
+        if now - self._touched.get(ticker, float("-inf")) >= TOUCH_INTERVAL:
+            self._touched[ticker] = now
+            self._send("touch", ticker)
+
+    async def get_klines(self, symbol, interval, start_ms=None, end_ms=None, limit=MAX_KLINES_PER_REQUEST):
+        """Klines read by the ingest process, as ``BinanceRestClient.get_klines``"""
+        return await self._read_klines(symbol, interval, start_ms, end_ms, limit)
+
+    async def get_historical_klines(self, symbol, interval=KLINE_INTERVAL_1DAY, start_ms=None, end_ms=None):
+        """All klines from start_ms read by the ingest process, as ``BinanceRestClient.get_historical_klines``"""
+        return await self._read_klines(symbol, interval, start_ms, end_ms, None)
+
+    async def _read_klines(self, symbol, interval, start_ms, end_ms, limit):
+        async def read():
+            await self._connected.wait()  # Reads made while (re)connecting go out once connected
+            request_id = next(self._ids)
+            future = self._requests[request_id] = asyncio.get_running_loop().create_future()
+            try:
+                self.writer.write(_line({
+                    "op": "klines", "id": request_id, "symbol": symbol, "interval": interval,
+                    "start_ms": start_ms, "end_ms": end_ms, "limit": limit,
+                }))
+                return await future
+            finally:
+                self._requests.pop(request_id, None)
+
+        try:
+            return await asyncio.wait_for(read(), KLINES_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise ConnectionError(f"No klines from the ingest process for {symbol} within {KLINES_TIMEOUT}s")
+
+    async def _handle(self, message):
+        kind = message["type"]
+        if kind == "trade":
+            await self.on_message(message["data"])
+        elif kind == "removed":
+            if self.on_removed is not None:
+                self.on_removed(message["ticker"])
+        elif kind == "state":
+            self._upstream = {"ingest": message["ingest"], "streaming": message["streaming"]}
+        elif kind == "klines":
+            future = self._requests.get(message["id"])
+            if future is None or future.done():
+                return  # Timed out meanwhile
+            if message.get("status") is not None:
+                future.set_exception(BinanceRestError(message["status"], message["error"]))
+            elif "error" in message:
+                future.set_exception(ConnectionError(f"The ingest process could not read klines: {message['error']}"))
+            else:
+                future.set_result(message["data"])
+        elif kind == "hello":
+            apply_assets(message["symbols"])
+            self.universe = {usdt_ticker(asset) for asset in message["symbols"]}
+
+    async def _session(self):
+        self.state_info["status"] = "connecting"
+        reader, writer = await asyncio.open_unix_connection(self.path)
+        try:
+            self.writer = writer
+            self._touched.clear()
+            for ticker in self._watchers:
+                self._send("watch", ticker)
+            self.state_info["status"] = "connected"
+            self.state_info["connected_since"] = time.time()
+            self._connected.set()
+            async for line in reader:
+                try:
+                    await self._handle(json.loads(line))
+                except Exception as e:
+                    print(f"Failed to handle a message from the ingest process: {e}")
+        finally:
+            self._connected.clear()
+            self.writer = None
+            writer.close()
+            # Reads the ingest process did not answer fail now rather than at their timeout
+            for future in self._requests.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Lost the ingest process"))
+
+    async def run(self):
+        """Stay connected to the ingest process, reconnecting with exponential backoff"""
+        backoff = INGEST_MIN_BACKOFF
+        while True:
+            try:
+                await self._session()
+                self.state_info["last_error"] = "Ingest process closed the connection"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.state_info["last_error"] = str(e)
+
+            connected_since = self.state_info["connected_since"]
+            if connected_since and time.time() - connected_since > INGEST_MAX_BACKOFF:
+                backoff = INGEST_MIN_BACKOFF
+
+            self.state_info["status"] = "reconnecting"
+            self.state_info["connected_since"] = None
+            self.state_info["reconnects"] += 1
+            delay = backoff * random.uniform(0.5, 1.0)
+            print(f"Lost the ingest process ({self.state_info['last_error']}), reconnecting in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            backoff = min(backoff * 2, INGEST_MAX_BACKOFF)
+
+    def streaming(self):
+        """Tickers the ingest process is streaming"""
+        return self._upstream["streaming"]
+
+    def state(self):
+        """Link state, with the ingest process's upstream state under ``upstream``"""
+        return {"mode": "worker", **self.state_info, "upstream": self._upstream["ingest"]}
@@ -1,159 +1,117 @@
 import asyncio
-import threading
-import websockets
-import json
 import time
-from datetime import datetime, timezone
-from starlette.websockets import WebSocketState
-
-price_store = {"btcusdt": 0, "ethusdt": 0, "adausdt": 0}
-volume_store = {"btcusdt": 0, "ethusdt": 0, "adausdt": 0}  # Track daily volume
-last_volume_reset = datetime.now(timezone.utc).date()  # Track when volume was last reset
-ws_task = None
-
-# Rate limiting - track last send time per connection
-last_send_times = {}  # {websocket: timestamp}
-SEND_INTERVAL = 1.0  # 1 second minimum between sends
-
-SYMBOLS = [
-    {"symbol": "BTC","stream": "btcusdt@trade", "label": "Bitcoin"},
-    {"symbol": "ETH","stream": "ethusdt@trade", "label": "Ethereum"},
-    {"symbol": "ADA","stream": "adausdt@trade", "label": "Cardano"},
-]
-
-# Store connections with their requested symbols
-connections = {}  # {websocket: {"symbol": "BTC", "endpoint": "data"}}
-
-async def binance_ws(symbols):
-    from services.technical_analysis import calculate_indicators
-    from utils.binance_data import api_to_df
-    
-    url = build_multiplexed_url(symbols)
-    async with websockets.connect(url) as ws:
-        while True:
-            msg = await ws.recv()
-            data = json.loads(msg)
-            stream = data["stream"]
-            payload = data["data"]
-            symbol = payload["s"].lower()
-
-            price = float(payload["p"])  # último preço
-            quantity = float(payload["q"])  # quantidade da transação
-
-            price_store[symbol] = price
-
-            # Check if we need to reset daily volume (new UTC day)
-            current_date = datetime.now(timezone.utc).date()
-            global last_volume_reset
-            if current_date > last_volume_reset:
-                # Reset all volumes for new day
-                for key in volume_store:
-                    volume_store[key] = 0
-                last_volume_reset = current_date
-                print(f"Volume reset for new day: {current_date}")
-
-            # Accumulate volume for the day
-            if symbol in volume_store:
-                volume_store[symbol] += quantity
-            else:
-                volume_store[symbol] = quantity
-
-            # Clean up dead connections before sending data
-            await cleanup_dead_connections()
-
-            # Send data only to connections that requested this symbol
-            symbol_upper = symbol.replace("usdt", "").upper()  # Convert btcusdt -> BTC
-            current_time = time.time()
-            
-            for conn, conn_info in list(connections.items()):
+from config.settings import INGEST_MODE
+from core.executors import Overloaded
+from core.metrics import Counter, Gauge, Histogram
+from services import rolling_stats
+from services.candle_aggregator import aggregator
+from services.price_book import PriceBook
+from services.stream_manager import streams
+from services.subscriptions import get_subscribers
+from services.universe import SYMBOLS, PINNED_ASSETS, load_universe, ticker
+from utils.binance_data import use_kline_source
+
+# Last price per symbol ("btcusdt"), with ids assigned to the whole universe up front
+price_store = PriceBook(item["stream"].split("@")[0] for item in SYMBOLS)
+
+TRADES = Counter("dashboard_upstream_trades_total", "Trade messages received from Binance", ["symbol"])
+FANOUT = Histogram("dashboard_fanout_seconds", "Time from receiving a trade to queueing its updates for every subscriber")
+Gauge("dashboard_upstream_streams", "Trade streams currently open upstream", collect=lambda: {(): len(streams.streaming())})
+Counter("dashboard_upstream_reconnects_total", "Reconnects to Binance (or, in a worker, to the ingest process)",
+      collect=lambda: {(): streams.state().get("reconnects", 0)})
+
+# Frame builds run off the receive loop, one task per (symbol, endpoint) working from the
+# newest trade only: a build waiting on REST or a reseed never holds up other symbols' trades
+_latest_trades = {}  # {(symbol, endpoint): (price, timestamp, monotonic time received)}
+_builders = {}  # {(symbol, endpoint): task}
+
+async def handle_trade(payload):
+    received = time.monotonic()
+    TRADES.labels(payload["s"]).inc()
+    symbol = payload["s"].lower()
+
+    price = float(payload["p"])  # último preço
+    quantity = float(payload["q"])  # quantidade da transação
+
+    trade_time = int(payload["T"])
+    price_store.record_trade(symbol, price, trade_time)
+    aggregator.add_trade(payload["s"], price, quantity, trade_time)
+    rolling_stats.add_trade(payload["s"], price, quantity, trade_time)
+
+    # Send data only to connections that requested this symbol
+    symbol_upper = symbol.replace("usdt", "").upper()  # Convert btcusdt -> BTC
+    current_time = time.time()
+
+    for endpoint in {endpoint for endpoint, _, _ in get_subscribers(symbol_upper)}:
+        key = (symbol_upper, endpoint)
+        _latest_trades[key] = (price, current_time, received)  # A build still pending just takes the newer trade
+        if key not in _builders:
+            _builders[key] = asyncio.get_running_loop().create_task(_build_updates(symbol_upper, endpoint))
+
+async def _build_updates(symbol, endpoint):
+    from services.publisher import build_frame
+
+    key = (symbol, endpoint)
+    try:
+        while key in _latest_trades:
+            price, timestamp, received = _latest_trades.pop(key)
+
+            # Build each payload once; every subscriber's outbox keeps only the latest frame
+            for (feed_endpoint, protocol, fmt), outboxes in get_subscribers(symbol).items():
+                if feed_endpoint != endpoint:
+                    continue
                 try:
-                    # Check if connection is still alive
-                    if conn.client_state == WebSocketState.DISCONNECTED:
-                        connections.pop(conn, None)
-                        last_send_times.pop(conn, None)
-                        continue
-                    
-                    # Rate limiting: only send if enough time has passed
-                    if conn in last_send_times:
-                        time_since_last_send = current_time - last_send_times[conn]
-                        if time_since_last_send < SEND_INTERVAL:
-                            continue  # Skip this update
-                    
-                    # Check if this connection wants this symbol
-                    if conn_info["symbol"] == symbol_upper:
-                        if conn_info["endpoint"] == "data":
-                            df = calculate_indicators(symbol.upper())  # Use full symbol like BTCUSDT
-                            await conn.send_text(df.to_json(orient="records"))
-                            last_send_times[conn] = current_time
-                        elif conn_info["endpoint"] == "raw-data":
-                            df = api_to_df(symbol.upper())  # Use full symbol like BTCUSDT
-                            await conn.send_text(df.to_json(orient="records"))
-                            last_send_times[conn] = current_time
-                        elif conn_info["endpoint"] == "live-price":
-                            # Send just the live price data
-                            price_data = {
-                                "symbol": symbol_upper,
-                                "price": price,
-                                "timestamp": current_time
-                            }
-                            await conn.send_text(json.dumps(price_data))
-                            last_send_times[conn] = current_time
-                            
+                    frame = await build_frame(symbol, endpoint, price, timestamp, protocol, fmt)
+                except Overloaded:
+                    continue  # Reseeding was shed; the next trade tries again
                 except Exception as e:
-                    # Remove broken connections
-                    print(f"Removing broken connection: {e}")
-                    connections.pop(conn, None)
-                    last_send_times.pop(conn, None)
-
-def build_multiplexed_url(symbols: list[dict]) -> str:
-    streams = "/".join(item["stream"] for item in symbols)
-    return f"wss://stream.binance.com:9443/stream?streams={streams}"
-
-def start_ws_in_background(symbols):
-    def run():
-        asyncio.run(binance_ws(symbols))
-    thread = threading.Thread(target=run, daemon=True)
-    thread.start()
-
-async def cleanup_dead_connections():
-    """Remove connections that are no longer active"""
-    dead_connections = []
-    for conn, conn_info in connections.items():
-        try:
-            if conn.client_state == WebSocketState.DISCONNECTED:
-                dead_connections.append(conn)
-        except Exception:
-            dead_connections.append(conn)
-    
-    for conn in dead_connections:
-        connections.pop(conn, None)
-        last_send_times.pop(conn, None)
-        print(f"Cleaned up dead connection. Total connections: {len(connections)}")
-
-def add_connection(websocket, symbol, endpoint):
-    """Add a connection with its requested symbol and endpoint"""
-    # Clean up any existing dead connections first
-    dead_connections = []
-    for conn in connections.keys():
-        try:
-            if conn.client_state == WebSocketState.DISCONNECTED:
-                dead_connections.append(conn)
-        except Exception:
-            dead_connections.append(conn)
-    
-    for conn in dead_connections:
-        connections.pop(conn, None)
-        last_send_times.pop(conn, None)
-    
-    connections[websocket] = {"symbol": symbol, "endpoint": endpoint}
-    last_send_times[websocket] = 0  # Initialize to allow immediate first send
-    print(f"Added connection for {symbol} ({endpoint}). Total connections: {len(connections)}")
-
-def remove_connection(websocket):
-    """Remove a connection"""
-    if websocket in connections:
-        conn_info = connections.pop(websocket)
-        last_send_times.pop(websocket, None)
-        print(f"Removed connection for {conn_info['symbol']} ({conn_info['endpoint']}). Total connections: {len(connections)}")
-    else:
-        print("Attempted to remove connection that doesn't exist")
+                    print(f"Failed to build {endpoint} update for {symbol}: {e}")
+                    continue
+                if frame is None:
+                    continue
+
+                for outbox in outboxes:
+                    outbox.offer(key, frame, received)
+
+            FANOUT.observe(time.monotonic() - received)
+    finally:
+        _builders.pop(key, None)
+
+async def flush_updates():
+    """Wait until every trade received so far has had its updates built and queued"""
+    while _builders:
+        await asyncio.gather(*list(_builders.values()), return_exceptions=True)
+
+def _stream_removed(symbol):
+    # Nobody is watching any more: drop live state so the next reader reseeds from REST
+    price_store[symbol.lower()] = 0
+    aggregator.forget(symbol)
+    rolling_stats.forget(symbol)
+
+async def start_ingest():
+    """Resolve the symbol universe and open the pinned streams on the running (server) event loop"""
+    if INGEST_MODE == "worker":
+        # The ingest process resolves the universe and streams; trades arrive over its socket,
+        # and the daily klines are read through it like the other seeds
+        use_kline_source(streams)
+        streams.start(handle_trade, _stream_removed)
+        return [ticker(item["symbol"]) for item in SYMBOLS]
+    tickers = await load_universe()
+    for item in SYMBOLS:
+        price_store.symbol_id(item["stream"].split("@")[0])
+    streams.configure(tickers, [ticker(asset) for asset in PINNED_ASSETS])
+    streams.start(handle_trade, _stream_removed)
+    return tickers
+
+async def stop_ingest():
+    """Close every upstream stream and wait for the sockets to close"""
+    await streams.stop()
+    builders = list(_builders.values())
+    for task in builders:
+        task.cancel()
+    await asyncio.gather(*builders, return_exceptions=True)
+    _latest_trades.clear()
+
+def ingest_status():
+    """Upstream connection state, exposed through /api/health"""
+    return streams.state()
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from config.settings import WS_SEND_INTERVAL, WS_OUTBOX_SIZE, WS_SEND_TIMEOUT, WS_SLOW_CONSUMER_POLICY
+from core.metrics import Counter, Histogram
+
+CONFLATED = Counter("dashboard_updates_conflated_total", "Unsent updates replaced by a newer one for the same key")
+DROPPED = Counter("dashboard_updates_dropped_total", "Unsent updates dropped because a send queue was full")
+TRADE_TO_SEND = Histogram("dashboard_trade_to_send_seconds", "Time from receiving a trade to writing its update to a client")
+
+class Outbox:
+    """Bounded send queue for one WebSocket, drained by its own writer task.
+
+    Updates are keyed (e.g. by symbol and endpoint) and the latest value wins, so a
+    connection never holds more than ``size`` unsent frames. Sends are throttled to one
+    batch per ``interval``; an update that arrives inside the window is delivered when
+    the window ends instead of being dropped.
+    """
+
+    def __init__(self, websocket, on_close=None, interval=WS_SEND_INTERVAL, size=WS_OUTBOX_SIZE,
+                 send_timeout=WS_SEND_TIMEOUT, policy=WS_SLOW_CONSUMER_POLICY):
+        self.websocket = websocket
+        self.on_close = on_close
+        self.interval = interval
+        self.size = size
+        self.send_timeout = send_timeout
+        self.policy = policy
+        self.pending = {}  # {key: (frame, monotonic time its trade was received, or None)}
+        self.conflated = 0
+        self.dropped = 0
+        self.loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._last_send = self.loop.time() - interval
+        self._closed = False
+        self._task = self.loop.create_task(self._writer())
+
+    def offer(self, key, frame, received=None):
+        """Queue a frame, replacing any unsent frame with the same key.
+
+        ``received`` is the ``time.monotonic()`` at which the trade behind the frame
+        arrived; the delay until it is written is recorded in TRADE_TO_SEND.
+        """
+        if key in self.pending:
+            self.conflated += 1
+            CONFLATED.inc()
+            del self.pending[key]  # Re-insert so the newest update goes last
+        elif len(self.pending) >= self.size:
+            self.pending.pop(next(iter(self.pending)))
+            self.dropped += 1
+            DROPPED.inc()
+        self.pending[key] = (frame, received)
+        self._wakeup.set()
+
+    async def _writer(self):
+        try:
+            while True:
+                await self._wakeup.wait()
+                if self._closed:
+                    return
+
+                # Trailing edge: wait out the throttle window, then send whatever is latest
+                delay = self._last_send + self.interval - self.loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                self._wakeup.clear()
+                frames = list(self.pending.values())
+                self.pending.clear()
+                self._last_send = self.loop.time()
+
+                for frame, received in frames:
+                    await self._send(frame)
+                    if received is not None:
+                        TRADE_TO_SEND.observe(time.monotonic() - received)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Closing WebSocket after failed send: {e}")
+            await self._shutdown()
+
+    def _write(self, frame):
+        # Binary formats produce bytes frames, JSON produces text
+        if isinstance(frame, bytes):
+            return self.websocket.send_bytes(frame)
+        return self.websocket.send_text(frame)
+
+    async def _send(self, frame):
+        if self.policy == "disconnect":
+            # A consumer that can't take a frame within the timeout has fallen behind
+            try:
+                await asyncio.wait_for(self._write(frame), timeout=self.send_timeout)
+            except asyncio.TimeoutError:
+                raise RuntimeError(f"slow consumer, send took longer than {self.send_timeout}s")
+        else:
+            # Keep the connection; updates conflate in ``pending`` while the send is in flight
+            await self._write(frame)
+
+    async def _shutdown(self):
+        try:
+            await self.websocket.close(code=1008)
+        except Exception:
+            pass
+        if self.on_close is not None:
+            self.on_close(self.websocket)
+
+    def close(self):
+        """Stop the writer task"""
+        self._closed = True
+        self._task.cancel()
+        # Before Python 3.12, wait_for swallows a cancellation that lands as the send completes;
+        # the writer then finds the outbox closed when it wakes
+        self._wakeup.set()
@@ -0,0 +1,57 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+
+class PriceBook(Mapping):
+    """Last trade price and time per symbol, in arrays indexed by a stable symbol id.
+
+    Symbols are registered once (normally the whole universe at startup), so the
+    trade path is one dict lookup plus two array stores, and snapshots over every
+    symbol are array operations. Reads like the ``{"btcusdt": price}`` dict it
+    replaces; unknown symbols read as missing, unpriced ones as 0.
+    """
+
+    def __init__(self, symbols=(), capacity=64):
+        self._ids = {}  # {"btcusdt": id}
+        self.names = []
+        self.prices = np.zeros(capacity)
+        self.trade_times = np.zeros(capacity, dtype=np.int64)
+        for symbol in symbols:
+            self.symbol_id(symbol)
+
+    def symbol_id(self, symbol):
+        """Id of ``symbol`` (e.g. "btcusdt"), registering it if new"""
+        symbol_id = self._ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._ids[symbol] = len(self.names)
+            self.names.append(symbol)
+            if symbol_id == len(self.prices):
+                # Grow by doubling so registration stays amortized O(1)
+                self.prices = np.concatenate([self.prices, np.zeros(len(self.prices))])
+                self.trade_times = np.concatenate([self.trade_times, np.zeros(len(self.trade_times), dtype=np.int64)])
+        return symbol_id
+
+    def record_trade(self, symbol, price, trade_time):
+        symbol_id = self.symbol_id(symbol)
+        self.prices[symbol_id] = price
+        self.trade_times[symbol_id] = trade_time
+
+    def __getitem__(self, symbol):
+        return float(self.prices[self._ids[symbol]])
+
+    def __setitem__(self, symbol, price):
+        symbol_id = self.symbol_id(symbol)  # May grow (replace) the arrays
+        self.prices[symbol_id] = price
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def live_prices(self):
+        """{symbol: price} for every symbol that has traded"""
+        count = len(self.names)
+        priced = np.flatnonzero(self.prices[:count] > 0)
+        return {self.names[index]: price for index, price in zip(priced.tolist(), self.prices[priced].tolist())}
@@ -0,0 +1,114 @@
+from services.delta_feed import DeltaFeed
+from services.technical_analysis import live_indicator_row, live_indicator_rows
+from utils.binance_data import get_candles, get_cache_version
+from utils.frames import JSON_FRAMES, encode_message, encode_price, encode_rows
+
+# History windows used for the live WebSocket feeds
+LIVE_DATA_DAYS = 30
+LIVE_RAW_DATA_DAYS = 90
+
+# Protocol 1 pushes the whole payload on every update; protocol 2 sends a snapshot, then deltas
+DELTA_PROTOCOL = 2
+DELTA_ENDPOINTS = ("data", "raw-data")
+
+# Last encoded frame per (symbol, endpoint, format): {(symbol, endpoint, format): (version, frame)}
+_frames = {}
+
+# Raw-data records per ticker, rebuilt only when the kline cache changes: {ticker: (version, records)}
+_raw_records = {}
+
+# Snapshot/delta state per (symbol, endpoint)
+_feeds = {}
+
+# Feed message of the latest trade, shared by every format: {(symbol, endpoint): (timestamp, message)}
+_messages = {}
+
+async def _cached_frame(key, version, build):
+    cached = _frames.get(key)
+    if cached is not None and version is not None and cached[0] == version:
+        return cached[1]
+    frame = await build()
+    _frames[key] = (version, frame)
+    return frame
+
+async def _raw_data_records(ticker):
+    version = get_cache_version(ticker, LIVE_RAW_DATA_DAYS)
+    cached = _raw_records.get(ticker)
+    if cached is not None and version is not None and cached[0] == version:
+        return cached[1]
+    records = (await get_candles(ticker, LIVE_RAW_DATA_DAYS)).to_records()
+    _raw_records[ticker] = (get_cache_version(ticker, LIVE_RAW_DATA_DAYS), records)
+    return records
+
+async def _feed_records(symbol, endpoint):
+    ticker = f"{symbol}USDT"
+    if endpoint == "data":
+        return [await live_indicator_row(ticker, LIVE_DATA_DAYS)]
+    return await _raw_data_records(ticker)
+
+def _feed(symbol, endpoint):
+    feed = _feeds.get((symbol, endpoint))
+    if feed is None:
+        feed = _feeds[(symbol, endpoint)] = DeltaFeed()
+    return feed
+
+async def _feed_message(symbol, endpoint, timestamp):
+    # Advance the feed once per trade, however many formats encode the result
+    cached = _messages.get((symbol, endpoint))
+    if cached is not None and cached[0] == timestamp:
+        return cached[1]
+    message = _feed(symbol, endpoint).update(await _feed_records(symbol, endpoint))
+    _messages[(symbol, endpoint)] = (timestamp, message)
+    return message
+
+async def snapshot_frame(symbol, endpoint, fmt=JSON_FRAMES):
+    """Full snapshot for a protocol 2 subscriber joining (or resyncing) a feed"""
+    feed = _feed(symbol, endpoint)
+    if feed.records is None:
+        feed.update(await _feed_records(symbol, endpoint))
+    return encode_message(feed.snapshot(), fmt)
+
+async def batch_frame(symbols):
+    """Current indicator rows for every symbol of a multi-symbol subscription, computed as one panel"""
+    tickers = [f"{symbol}USDT" for symbol in symbols]
+    rows = await live_indicator_rows(tickers, LIVE_DATA_DAYS)
+    return encode_rows([{"symbol": ticker, **row} for ticker, row in zip(tickers, rows)])
+
+async def build_frame(symbol, endpoint, price, timestamp, protocol=1, fmt=JSON_FRAMES):
+    """Build and encode the payload for one (symbol, endpoint) update, once for all subscribers.
+
+    Frames are text for the JSON format and bytes for the binary one. Returns None
+    when a protocol 2 feed has nothing new to send.
+    """
+    ticker = f"{symbol}USDT"
+
+    if protocol == DELTA_PROTOCOL and endpoint in DELTA_ENDPOINTS:
+        message = await _feed_message(symbol, endpoint, timestamp)
+        return encode_message(message, fmt) if message is not None else None
+
+    if endpoint == "data":
+        async def build():
+            return encode_rows([await live_indicator_row(ticker, LIVE_DATA_DAYS)], fmt)
+
+        version = get_cache_version(ticker, LIVE_DATA_DAYS)
+        return await _cached_frame((symbol, endpoint, fmt), (version, price) if version is not None else None, build)
+
+    if endpoint == "data-batch":
+        # Multi-symbol subscribers get the trading symbol's row, tagged with its ticker
+        async def build():
+            return encode_rows([{"symbol": ticker, **await live_indicator_row(ticker, LIVE_DATA_DAYS)}])
+
+        version = get_cache_version(ticker, LIVE_DATA_DAYS)
+        return await _cached_frame((symbol, endpoint, fmt), (version, price) if version is not None else None, build)
+
+    if endpoint == "raw-data":
+        async def build():
+            return encode_rows(await _raw_data_records(ticker), fmt)
+
+        # History only changes when the kline cache is refreshed
+        return await _cached_frame((symbol, endpoint, fmt), get_cache_version(ticker, LIVE_RAW_DATA_DAYS), build)
+
+    if endpoint == "live-price":
+        return encode_price(symbol, price, timestamp, fmt)
+
+    raise ValueError(f"Unknown endpoint: {endpoint}")
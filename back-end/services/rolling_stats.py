@@ -0,0 +1,207 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from services.stream_manager import seeds, streams
+
+MINUTE_MS = 60_000
+WINDOW_MINUTES = 1440  # 24 hours
+FETCHED_TTL = 60.0  # Seconds a window read from REST for a symbol outside the universe is reused
+FETCHED_MAX = 64  # Such windows kept at most, least recently used dropped first
+
+class RollingStats:
+    """Rolling 24h open/high/low/close/volume for one symbol, in one-minute buckets.
+
+    Every trade and every expired bucket is O(1): volume sums are updated in place and
+    high/low come from monotonic deques whose front is the extreme of the window.
+    """
+
+    def __init__(self, window_minutes=WINDOW_MINUTES):
+        self.window_minutes = window_minutes
+        self.buckets = deque()  # [minute, open, high, low, close, volume, quote_volume, trades]
+        self.highs = deque()  # (minute, high), decreasing
+        self.lows = deque()  # (minute, low), increasing
+        self.volume = 0.0
+        self.quote_volume = 0.0
+        self.trades = 0
+        self._expired = 0
+
+    def _track_extremes(self, minute, high, low):
+        highs = self.highs
+        while highs and highs[-1][1] <= high:
+            highs.pop()
+        highs.append((minute, high))
+        lows = self.lows
+        while lows and lows[-1][1] >= low:
+            lows.pop()
+        lows.append((minute, low))
+
+    def add_bucket(self, bucket):
+        """Append a whole minute after the last one (used to seed from 1m klines)"""
+        if self.buckets and bucket[0] <= self.buckets[-1][0]:
+            return
+        self.buckets.append(list(bucket))
+        self.volume += bucket[5]
+        self.quote_volume += bucket[6]
+        self.trades += bucket[7]
+        self._track_extremes(bucket[0], bucket[2], bucket[3])
+
+    def add_trade(self, price, quantity, trade_time):
+        minute = trade_time - trade_time % MINUTE_MS
+        last = self.buckets[-1] if self.buckets else None
+
+        if last is None or minute > last[0]:
+            self.add_bucket([minute, price, price, price, price, quantity, price * quantity, 1])
+        elif minute == last[0]:
+            if price > last[2]:
+                last[2] = price
+            if price < last[3]:
+                last[3] = price
+            last[4] = price
+            last[5] += quantity
+            last[6] += price * quantity
+            last[7] += 1
+            self.volume += quantity
+            self.quote_volume += price * quantity
+            self.trades += 1
+            self._track_extremes(minute, price, price)
+        else:
+            return  # Late trade for a minute that is already closed
+
+        self.expire(trade_time)
+
+    def expire(self, now_ms):
+        """Drop minutes that fell out of the window ending at now_ms"""
+        cutoff = now_ms - now_ms % MINUTE_MS - (self.window_minutes - 1) * MINUTE_MS
+        buckets = self.buckets
+        while buckets and buckets[0][0] < cutoff:
+            bucket = buckets.popleft()
+            self.volume -= bucket[5]
+            self.quote_volume -= bucket[6]
+            self.trades -= bucket[7]
+            self._expired += 1
+        while self.highs and self.highs[0][0] < cutoff:
+            self.highs.popleft()
+        while self.lows and self.lows[0][0] < cutoff:
+            self.lows.popleft()
+
+        # Re-add from scratch once per window so subtraction error can't accumulate
+        if self._expired >= self.window_minutes:
+            self._expired = 0
+            self.volume = math.fsum(bucket[5] for bucket in buckets)
+            self.quote_volume = math.fsum(bucket[6] for bucket in buckets)
+
+    def snapshot(self, now_ms):
+        self.expire(now_ms)
+        if not self.buckets:
+            return None
+        open_price = self.buckets[0][1]
+        close = self.buckets[-1][4]
+        return {
+            "open": open_price,
+            "high": self.highs[0][1],
+            "low": self.lows[0][1],
+            "close": close,
+            "volume": self.volume,
+            "quote_volume": self.quote_volume,
+            "trades": self.trades,
+            "price_change": close - open_price,
+            "price_change_percent": (close - open_price) / open_price * 100 if open_price else 0.0,
+            "window_start": self.buckets[0][0],
+        }
+
+# {SYMBOL: RollingStats}, fed by services.live_data
+_stats = {}
+_seeding = {}
+_seeded = set()
+
+# Windows of symbols outside the universe: nothing streams to keep them current, so each is
+# read from REST at most once per FETCHED_TTL. {SYMBOL: (monotonic time, RollingStats or None)}
+_fetched = OrderedDict()
+_fetching = {}
+
+def add_trade(symbol, price, quantity, trade_time):
+    stats = _stats.get(symbol)
+    if stats is None:
+        stats = _stats[symbol] = RollingStats()
+    stats.add_trade(price, quantity, trade_time)
+
+def forget(symbol):
+    """Drop a symbol whose trades are no longer streamed; the next read reseeds it"""
+    _stats.pop(symbol, None)
+    _seeded.discard(symbol)
+
+async def _fetch_window(symbol):
+    # 1m klines for the last 24h; trades streamed from here on extend the last minute
+    now_ms = int(time.time() * 1000)
+    start_ms = now_ms - now_ms % MINUTE_MS - (WINDOW_MINUTES - 1) * MINUTE_MS
+    klines = await seeds.get_historical_klines(symbol, "1m", start_ms=start_ms)
+
+    stats = RollingStats()
+    for k in klines:
+        stats.add_bucket([int(k[0]), float(k[1]), float(k[2]), float(k[3]), float(k[4]), float(k[5]), float(k[7]), int(k[8])])
+    return stats
+
+async def _seed(symbol):
+    _stats[symbol] = await _fetch_window(symbol)
+    _seeded.add(symbol)
+
+async def ensure_seeded(symbol):
+    if symbol in _seeded:
+        return
+    task = _seeding.get(symbol)
+    if task is None:
+        task = _seeding[symbol] = asyncio.ensure_future(_seed(symbol))
+        task.add_done_callback(lambda _: _seeding.pop(symbol, None))
+    try:
+        await asyncio.shield(task)
+    except Exception as e:
+        # Fall back to whatever the stream has accumulated; seeding is retried next time
+        print(f"Could not seed 24h stats for {symbol}: {e}")
+
+async def _fetch_unstreamed(symbol):
+    cached = _fetched.get(symbol)
+    if cached is not None and time.monotonic() - cached[0] < FETCHED_TTL:
+        _fetched.move_to_end(symbol)
+        return cached[1]
+    task = _fetching.get(symbol)
+    if task is None:
+        task = _fetching[symbol] = asyncio.ensure_future(_fetch_window(symbol))
+        task.add_done_callback(lambda _: _fetching.pop(symbol, None))
+    try:
+        stats = await asyncio.shield(task)
+    except Exception as e:
+        # Kept as well, so a symbol Binance rejects is not asked for again on every request
+        print(f"Could not fetch 24h stats for {symbol}: {e}")
+        stats = None
+    _fetched[symbol] = (time.monotonic(), stats)
+    _fetched.move_to_end(symbol)
+    while len(_fetched) > FETCHED_MAX:
+        _fetched.popitem(last=False)
+    return stats
+
+async def seed_symbols(symbols):
+    """Seed the rolling windows of the given symbols (run once at startup)"""
+    await asyncio.gather(*(ensure_seeded(symbol) for symbol in symbols))
+
+async def get_rolling_stats(symbol):
+    """Rolling 24h statistics for a symbol, or None if nothing is known yet"""
+    if streams.allowed(symbol.upper()):
+        streams.touch(symbol.upper())  # Keep its trades coming while someone is reading it
+        await ensure_seeded(symbol)
+        stats = _stats.get(symbol)
+    else:
+        stats = await _fetch_unstreamed(symbol)
+    snapshot = stats.snapshot(int(time.time() * 1000)) if stats is not None else None
+    if snapshot is None:
+        return None
+    return {
+        "symbol": symbol,
+        **snapshot,
+        "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+def rolling_volumes():
+    """{symbol: 24h volume} for every symbol with data"""
+    return {symbol: stats.volume for symbol, stats in _stats.items() if stats.buckets}
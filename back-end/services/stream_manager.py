@@ -0,0 +1,298 @@
+import asyncio
+import json
+import random
+import time
+import websockets
+from config.settings import (
+    BINANCE_STREAM_URL, INGEST_PING_INTERVAL, INGEST_STALL_TIMEOUT, INGEST_MIN_BACKOFF, INGEST_MAX_BACKOFF, INGEST_MODE, INGEST_SOCKET,
+    STREAMS_PER_CONNECTION, STREAM_IDLE_TTL, STREAM_CONTROL_INTERVAL,
+)
+from utils.binance_rest import client
+
+def stream_name(ticker):
+    return f"{ticker.lower()}@trade"
+
+def build_multiplexed_url(streams):
+    return f"{BINANCE_STREAM_URL}/stream?streams={'/'.join(streams)}"
+
+class StreamShard:
+    """One upstream connection carrying up to ``capacity`` trade streams.
+
+    Streams added or removed while connected are applied with SUBSCRIBE/UNSUBSCRIBE
+    messages, paced to Binance's limit on control messages per connection; after a
+    reconnect the current set is subscribed through the URL.
+    """
+
+    def __init__(self, index, on_message, capacity=STREAMS_PER_CONNECTION):
+        self.index = index
+        self.on_message = on_message
+        self.capacity = capacity
+        self.streams = set()  # Wanted
+        self.subscribed = set()  # Requested on the current connection
+        self.changed = asyncio.Event()
+        self.task = None
+        self._request_id = 0
+        self.state = {
+            "status": "stopped",  # stopped | idle | connecting | connected | reconnecting
+            "connected_since": None,
+            "last_message_at": None,
+            "messages": 0,
+            "reconnects": 0,
+            "last_error": None,
+        }
+
+    def has_room(self):
+        return len(self.streams) < self.capacity
+
+    def add(self, stream):
+        self.streams.add(stream)
+        self.changed.set()
+
+    def remove(self, stream):
+        self.streams.discard(stream)
+        self.changed.set()
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        self.state["status"] = "stopped"
+        self.state["connected_since"] = None
+
+    async def _control(self, ws):
+        # Bring the connection's subscriptions in line with the wanted streams
+        while True:
+            await self.changed.wait()
+            self.changed.clear()
+            if not self.streams:
+                await ws.close()
+                return
+            for method, params in (("UNSUBSCRIBE", self.subscribed - self.streams),
+                                   ("SUBSCRIBE", self.streams - self.subscribed)):
+                if not params:
+                    continue
+                self._request_id += 1
+                await ws.send(json.dumps({"method": method, "params": sorted(params), "id": self._request_id}))
+                if method == "SUBSCRIBE":
+                    self.subscribed |= params
+                else:
+                    self.subscribed -= params
+                await asyncio.sleep(STREAM_CONTROL_INTERVAL)
+
+    async def _session(self):
+        """One upstream session: returns or raises when the stream ends or stalls"""
+        self.changed.clear()
+        streams = sorted(self.streams)
+        self.state["status"] = "connecting"
+        # Liveness comes from ping/pong, not trades: a shard of quiet pairs can go minutes without
+        # a trade, while a dead connection stops answering pings, recv() raises and the close
+        # handshake is given no longer than the ping
+        async with websockets.connect(build_multiplexed_url(streams), ping_interval=INGEST_PING_INTERVAL,
+                                      ping_timeout=INGEST_STALL_TIMEOUT, close_timeout=INGEST_STALL_TIMEOUT) as ws:
+            self.subscribed = set(streams)
+            self.state["status"] = "connected"
+            self.state["connected_since"] = time.time()
+            control = asyncio.ensure_future(self._control(ws))
+            try:
+                while True:
+                    msg = await ws.recv()
+                    self.state["last_message_at"] = time.time()
+                    self.state["messages"] += 1
+                    data = json.loads(msg)
+                    if "data" in data:  # Anything else answers a SUBSCRIBE/UNSUBSCRIBE
+                        await self.on_message(data["data"])
+            finally:
+                control.cancel()
+
+    async def run(self):
+        """Keep the connection alive while it has streams, reconnecting with exponential backoff"""
+        backoff = INGEST_MIN_BACKOFF
+        while True:
+            if not self.streams:
+                self.state["status"] = "idle"
+                self.state["connected_since"] = None
+                while not self.streams:
+                    await self.changed.wait()
+                    self.changed.clear()
+
+            messages = self.state["messages"]
+            try:
+                await self._session()
+                error = "Stream closed by Binance"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = str(e)
+            if not self.streams:
+                continue  # Closed on purpose after the last stream was removed
+            self.state["last_error"] = error
+
+            # A session that delivered anything, or stayed up for a while, resets the backoff
+            connected_since = self.state["connected_since"]
+            if connected_since and (self.state["messages"] > messages or time.time() - connected_since > INGEST_MAX_BACKOFF):
+                backoff = INGEST_MIN_BACKOFF
+
+            self.state["status"] = "reconnecting"
+            self.state["connected_since"] = None
+            self.state["reconnects"] += 1
+            delay = backoff * random.uniform(0.5, 1.0)
+            print(f"Binance stream {self.index} lost ({self.state['last_error']}), reconnecting in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            backoff = min(backoff * 2, INGEST_MAX_BACKOFF)
+
+class StreamManager:
+    """Trade streams for the symbols someone is watching, spread over as many shards as needed.
+
+    A symbol streams while it has WebSocket subscribers, for ``idle_ttl`` seconds after
+    its last viewer leaves or a REST read touches it, and always if it is pinned.
+    """
+
+    def __init__(self, capacity=STREAMS_PER_CONNECTION, idle_ttl=STREAM_IDLE_TTL):
+        self.capacity = capacity
+        self.idle_ttl = idle_ttl
+        self.shards = []
+        self.universe = None  # Tickers that may be streamed; None allows any
+        self.pinned = set()
+        self.on_message = None
+        self.on_removed = None
+        self._shard_of = {}  # {ticker: shard}
+        self._watchers = {}  # {ticker: subscriber count}
+        self._expiry = {}  # {ticker: timer handle}
+        self._running = False
+
+    def configure(self, universe, pinned):
+        self.universe = set(universe)
+        self.pinned = {ticker for ticker in pinned if ticker in self.universe}
+
+    def allowed(self, ticker):
+        return self.universe is None or ticker in self.universe
+
+    def start(self, on_message, on_removed=None):
+        """Open the pinned streams and any already watched, on the running event loop"""
+        self.on_message = on_message
+        self.on_removed = on_removed
+        self._running = True
+        for ticker in sorted(self.pinned):
+            self._add(ticker)
+        for shard in self.shards:
+            shard.start()
+
+    async def stop(self):
+        self._running = False
+        for handle in self._expiry.values():
+            handle.cancel()
+        self._expiry.clear()
+        await asyncio.gather(*(shard.stop() for shard in self.shards))
+
+    def watch(self, ticker):
+        """A subscriber wants ``ticker``; streams it until the matching unwatch"""
+        if not self.allowed(ticker):
+            return
+        self._watchers[ticker] = self._watchers.get(ticker, 0) + 1
+        handle = self._expiry.pop(ticker, None)
+        if handle is not None:
+            handle.cancel()
+        self._add(ticker)
+
+    def unwatch(self, ticker):
+        count = self._watchers.get(ticker, 0) - 1
+        if count > 0:
+            self._watchers[ticker] = count
+            return
+        self._watchers.pop(ticker, None)
+        self._schedule_expiry(ticker)
+
+    def touch(self, ticker):
+        """Stream ``ticker`` for at least ``idle_ttl`` seconds from now"""
+        if not self.allowed(ticker):
+            return
+        self._add(ticker)
+        if ticker not in self._watchers:
+            self._schedule_expiry(ticker)
+
+    def _schedule_expiry(self, ticker):
+        handle = self._expiry.pop(ticker, None)
+        if handle is not None:
+            handle.cancel()
+        if ticker in self.pinned or ticker not in self._shard_of:
+            return
+        self._expiry[ticker] = asyncio.get_running_loop().call_later(self.idle_ttl, self._expire, ticker)
+
+    def _expire(self, ticker):
+        self._expiry.pop(ticker, None)
+        if ticker in self._watchers or ticker in self.pinned:
+            return
+        self._remove(ticker)
+
+    def _add(self, ticker):
+        if ticker in self._shard_of:
+            return
+        shard = next((shard for shard in self.shards if shard.has_room()), None)
+        if shard is None:
+            shard = StreamShard(len(self.shards), self._dispatch, self.capacity)
+            self.shards.append(shard)
+            if self._running:
+                shard.start()
+        shard.add(stream_name(ticker))
+        self._shard_of[ticker] = shard
+
+    def _remove(self, ticker):
+        shard = self._shard_of.pop(ticker, None)
+        if shard is None:
+            return
+        shard.remove(stream_name(ticker))
+        if self.on_removed is not None:
+            self.on_removed(ticker)
+
+    async def _dispatch(self, payload):
+        if self.on_message is not None:
+            await self.on_message(payload)
+
+    def streaming(self):
+        """Tickers currently streamed"""
+        return sorted(self._shard_of)
+
+    def state(self):
+        """Upstream state summed over shards, with the per-shard detail"""
+        shards = [{"streams": len(shard.streams), **shard.state} for shard in self.shards]
+        active = [shard for shard in shards if shard["streams"]]
+        if not self._running:
+            status = "stopped"
+        elif not active:
+            status = "idle"
+        elif all(shard["status"] == "connected" for shard in active):
+            status = "connected"
+        elif any(shard["status"] == "connected" for shard in active):
+            status = "degraded"
+        else:
+            status = active[0]["status"]
+        errors = [shard["last_error"] for shard in shards if shard["last_error"]]
+        return {
+            "status": status,
+            "streams": len(self._shard_of),
+            "connections": len(active),
+            "messages": sum(shard["messages"] for shard in shards),
+            "reconnects": sum(shard["reconnects"] for shard in shards),
+            "last_message_at": max((shard["last_message_at"] or 0 for shard in shards), default=None) or None,
+            "last_error": errors[-1] if errors else None,
+            "shards": shards,
+        }
+
+# ``seeds`` reads the klines that live state is seeded from (``get_klines``/``get_historical_klines``)
+if INGEST_MODE == "worker":
+    # API worker: the ingest process (ingest.py) owns the Binance connections and reads the seeds
+    # once for every worker
+    from services.ingest_link import IngestClient
+    streams = IngestClient(INGEST_SOCKET)
+    seeds = streams
+else:
+    streams = StreamManager()
+    seeds = client
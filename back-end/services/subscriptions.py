@@ -0,0 +1,110 @@
+import asyncio
+import json
+from fastapi import WebSocketDisconnect
+from config.settings import WS_OUTBOX_SIZE
+from core.metrics import Gauge
+from services.outbox import Outbox
+from services.stream_manager import streams
+from utils.frames import JSON_FRAMES
+
+# Subscriber outboxes indexed by symbol and feed: {"BTC": {("data", 1, "json"): {websocket: outbox}}}
+# A feed is (endpoint, protocol, format); subscribers of one feed all receive the same frames
+_by_symbol = {}
+
+# Reverse index: {websocket: {"symbols": ["BTC"], "endpoint": "data", "protocol": 1, "format": "json", "outbox": outbox}}
+connections = {}
+
+# Idle handling - ping a silent client, drop it if the pong doesn't arrive in time
+IDLE_TIMEOUT = 30.0
+PONG_TIMEOUT = 30.0
+PING_MESSAGE = json.dumps({"type": "ping"})
+
+def add_connection(websocket, symbols, endpoint, protocol=1, fmt=JSON_FRAMES):
+    """Add a connection with its requested symbols, endpoint, protocol version and frame format"""
+    # Room for one pending update per symbol, so multi-symbol connections only ever conflate
+    outbox = Outbox(websocket, on_close=remove_connection, size=max(WS_OUTBOX_SIZE, len(symbols) + 1))
+    connections[websocket] = {"symbols": symbols, "endpoint": endpoint, "protocol": protocol, "format": fmt, "outbox": outbox}
+    for symbol in symbols:
+        _by_symbol.setdefault(symbol, {}).setdefault((endpoint, protocol, fmt), {})[websocket] = outbox
+        streams.watch(f"{symbol}USDT")
+    print(f"Added connection for {', '.join(symbols)} ({endpoint}). Total connections: {len(connections)}")
+    return outbox
+
+def remove_connection(websocket):
+    """Remove a connection"""
+    conn_info = connections.pop(websocket, None)
+    if conn_info is None:
+        return
+    conn_info["outbox"].close()
+
+    feed = (conn_info["endpoint"], conn_info["protocol"], conn_info["format"])
+    for symbol in conn_info["symbols"]:
+        feeds = _by_symbol.get(symbol, {})
+        subscribers = feeds.get(feed)
+        if subscribers is not None:
+            subscribers.pop(websocket, None)
+            if not subscribers:
+                feeds.pop(feed, None)
+        if not feeds:
+            _by_symbol.pop(symbol, None)
+        streams.unwatch(f"{symbol}USDT")
+
+    print(f"Removed connection for {', '.join(conn_info['symbols'])} ({conn_info['endpoint']}). Total connections: {len(connections)}")
+
+def get_subscribers(symbol):
+    """Snapshot of {(endpoint, protocol, format): [outbox, ...]} for one symbol"""
+    return {feed: list(subscribers.values()) for feed, subscribers in list(_by_symbol.get(symbol, {}).items())}
+
+def subscriber_counts():
+    """Number of subscribers per symbol and endpoint"""
+    counts = {}
+    for symbol, feeds in list(_by_symbol.items()):
+        for (endpoint, *_), subscribers in feeds.items():
+            by_endpoint = counts.setdefault(symbol, {})
+            by_endpoint[endpoint] = by_endpoint.get(endpoint, 0) + len(subscribers)
+    return counts
+
+def _subscribers_by_endpoint():
+    counts = {}
+    for conn_info in list(connections.values()):
+        key = (conn_info["endpoint"],)
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+def _queued_by_endpoint():
+    queued = {}
+    for conn_info in list(connections.values()):
+        key = (conn_info["endpoint"],)
+        queued[key] = queued.get(key, 0) + len(conn_info["outbox"].pending)
+    return queued
+
+Gauge("dashboard_subscribers", "Open WebSocket subscriptions", ["endpoint"], collect=_subscribers_by_endpoint)
+Gauge("dashboard_send_queue_frames", "Updates waiting in send queues", ["endpoint"], collect=_queued_by_endpoint)
+Gauge("dashboard_send_queue_max_frames", "Updates waiting in the fullest send queue",
+      collect=lambda: {(): max((len(conn_info["outbox"].pending) for conn_info in list(connections.values())), default=0)})
+
+async def hold_connection(websocket, on_message=None):
+    """Wait until the client disconnects, pinging it whenever it goes quiet.
+
+    Any message from the client counts as a sign of life; a client that stays
+    silent through a ping and the pong timeout is considered dead and released.
+    Text messages are passed to ``on_message`` if given.
+    """
+    awaiting_pong = False
+    while True:
+        timeout = PONG_TIMEOUT if awaiting_pong else IDLE_TIMEOUT
+        try:
+            message = await asyncio.wait_for(websocket.receive(), timeout=timeout)
+        except asyncio.TimeoutError:
+            if awaiting_pong:
+                await websocket.close(code=1001)
+                return
+            await websocket.send_text(PING_MESSAGE)
+            awaiting_pong = True
+            continue
+
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000))
+        awaiting_pong = False
+        if on_message is not None and message.get("text"):
+            await on_message(message["text"])
@@ -1,58 +1,160 @@
-import pandas as pd
-import numpy as np
-from utils.binance_data import api_to_df
-from utils.data_loader import calculate_rsi_wilder
-from services.live_data import price_store, volume_store
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from config.settings import OFFLOAD_MIN_CANDLES
+from core.executors import compute
+from core.metrics import Histogram
+from utils.binance_data import get_candles, get_cache_version
+from utils.date import get_timestamp_days_ago
+from services.candle_aggregator import aggregator
+from services.indicator_engine import IndicatorEngine, INDICATOR_COLUMNS
+from services.indicator_panel import IndicatorPanel
+from services.live_data import price_store
+from services.stream_manager import streams
+from services.universe import is_ticker
 
-def calculate_indicators(ticker, days=30, sma_period=14, ema_period=14, rsi_period=14, macd_fast=12, macd_slow=26, macd_signal=9):
-    df = api_to_df(ticker, days) #Cached
+# Indicator engines per (ticker, days, interval, periods), reseeded when the candles change.
+# Keys come from request parameters, so the least recently used engines are dropped; the
+# bound leaves room for one live feed engine per streamed symbol
+_engines = OrderedDict()
+ENGINE_CACHE_SIZE = 256
 
+# Indicator panels per (tickers, days, interval, periods): {key: (versions, [(indices, panel), ...])}
+_panels = OrderedDict()
+PANEL_CACHE_SIZE = 32
+# Seeding one panel row costs about as much as 16 candles of a single engine (bench_indicator_panel)
+PANEL_ROW_COST = 16
+
+SEED_SECONDS = Histogram("dashboard_indicator_seed_seconds", "Time to seed indicators from the candle history", ["kind"])
+INDICATOR_SECONDS = Histogram("dashboard_indicator_seconds", "Time to compute live indicator rows, loading and seeding included", ["call"])
+
+DEFAULT_PERIODS = {
+    "sma_period": 14,
+    "ema_period": 14,
+    "rsi_period": 14,
+    "macd_fast": 12,
+    "macd_slow": 26,
+    "macd_signal": 9,
+}
+
+def _candles_version(ticker, days, interval):
+    if interval == "1d":
+        return get_cache_version(ticker, days)
+    return aggregator.version(ticker, interval)
+
+async def _load_candles(ticker, days, interval):
+    # Daily history comes from the kline cache, intraday candles from the live aggregator
+    if interval == "1d":
+        return await get_candles(ticker, days) #Cached
+    return await aggregator.get(ticker, interval, get_timestamp_days_ago(days))
+
+async def _seed(kind, from_candles, cost, *args, **periods):
+    # Seeding walks every candle in Python; long histories go to the compute pool
+    started = time.perf_counter()
+    if cost < OFFLOAD_MIN_CANDLES:
+        seeded = from_candles(*args, **periods)
+    else:
+        seeded = await compute.run(from_candles, *args, **periods)
+    SEED_SECONDS.labels(kind).observe(time.perf_counter() - started)
+    return seeded
+
+async def get_indicator_engine(ticker, days=30, interval="1d", **periods):
+    """Return the indicator engine for ticker/days/interval, seeding it from the cached candles"""
+    if not is_ticker(ticker):
+        raise ValueError(f"Invalid symbol: {ticker}")
+    periods = {**DEFAULT_PERIODS, **periods}
+    key = (ticker, days, interval, tuple(sorted(periods.items())))
+    engine = _engines.get(key)
+    version = _candles_version(ticker, days, interval)
+
+    if engine is None or version is None or engine.version != version:
+        candles = await _load_candles(ticker, days, interval)
+        version = _candles_version(ticker, days, interval)
+        if engine is None or not engine.try_roll(candles):
+            engine = await _seed("engine", IndicatorEngine.from_candles, len(candles), candles, **periods)
+        engine.version = version
+        _engines[key] = engine
+        while len(_engines) > ENGINE_CACHE_SIZE:
+            _engines.popitem(last=False)
+    _engines.move_to_end(key)
+
+    return engine
+
+def _live_close(ticker, close):
+    streams.touch(ticker.upper())  # Keep its trades coming while someone is reading it
+    if close is None or not math.isfinite(close):
+        return close  # No candles in the window, so there is nothing to check the live price against
     price = price_store.get(ticker.lower())
-    live_volume = volume_store.get(ticker.lower(), 0)
 
     # Only update if we have a valid live price
     if price and price > 0:
         # Validate price is reasonable (within 20% of last close)
-        last_close = df.loc[df.index[-1], "Close"]
-        if abs(price - last_close) / last_close <= 0.2:  # 20% threshold
-            if price >= df.loc[df.index[-1], "High"]:
-                df.loc[df.index[-1], "High"] = price
-
-            if price <= df.loc[df.index[-1], "Low"]:
-                df.loc[df.index[-1], "Low"] = price
-
-            df.loc[df.index[-1], "Close"] = price
-
-            # Update today's volume with accumulated live volume
-            if live_volume > 0:
-                # Add live volume to the cached volume for today
-                cached_volume = df.loc[df.index[-1], "Volume"]
-                df.loc[df.index[-1], "Volume"] = cached_volume + live_volume
+        if abs(price - close) / close <= 0.2:  # 20% threshold
+            close = price
         else:
             # Log suspicious price but don't update
-            print(f"Warning: Suspicious price {price} for {ticker}, last close was {last_close}")
+            print(f"Warning: Suspicious price {price} for {ticker}, last close was {close}")
     else:
         # No live price available, use cached data as-is
         print(f"No live price available for {ticker}, using cached data")
 
-    # SMA (Simple Moving Average)
-    df["SMA"] = df["Close"].rolling(window=sma_period).mean()
+    return close
+
+async def live_indicator_row(ticker, days=30, interval="1d", **periods):
+    """Indicators for the current candle using the live price, as a plain dict"""
+    started = time.perf_counter()
+    engine = await get_indicator_engine(ticker, days, interval, **periods)
+    row = engine.evaluate(_live_close(ticker, engine.reference_close))
+    INDICATOR_SECONDS.labels("row").observe(time.perf_counter() - started)
+    return row
+
+async def get_indicator_panels(tickers, days=30, interval="1d", **periods):
+    """Indicator panels covering ``tickers``, as [(ticker indices, panel), ...]"""
+    periods = {**DEFAULT_PERIODS, **periods}
+    key = (tuple(tickers), days, interval, tuple(sorted(periods.items())))
+    versions = tuple(_candles_version(ticker, days, interval) for ticker in tickers)
+    cached = _panels.get(key)
+
+    if cached is None or None in versions or cached[0] != versions:
+        candles_list = await asyncio.gather(*(_load_candles(ticker, days, interval) for ticker in tickers))
+        versions = tuple(_candles_version(ticker, days, interval) for ticker in tickers)
+
+        # A panel needs equal-length histories; recently listed symbols get a panel of their own
+        groups = {}
+        for index, candles in enumerate(candles_list):
+            groups.setdefault(len(candles), []).append(index)
+        panels = [
+            (indices, await _seed("panel", IndicatorPanel.from_candles, length * PANEL_ROW_COST,
+                                  [candles_list[index] for index in indices], **periods))
+            for length, indices in groups.items()
+        ]
+        cached = _panels[key] = (versions, panels)
+        while len(_panels) > PANEL_CACHE_SIZE:
+            _panels.popitem(last=False)
+    _panels.move_to_end(key)
 
-    # EMA (Exponential Moving Average)
-    df["EMA"] = df["Close"].ewm(span=ema_period, adjust=False).mean()
+    return cached[1]
 
-    # RSI (Relative Strength Index)
-    
-    df["RSI"] = calculate_rsi_wilder(df["Close"], rsi_period)
+async def live_indicator_rows(tickers, days=30, interval="1d", **periods):
+    """``live_indicator_row`` for many tickers, evaluated together as one vectorized panel"""
+    started = time.perf_counter()
+    rows = [None] * len(tickers)
+    for indices, panel in await get_indicator_panels(tickers, days, interval, **periods):
+        closes = [_live_close(tickers[index], close) for index, close in zip(indices, panel.reference_close.tolist())]
+        for index, row in zip(indices, panel.evaluate(closes)):
+            rows[index] = row
+    INDICATOR_SECONDS.labels("rows").observe(time.perf_counter() - started)
+    return rows
 
-    # MACD (Moving Average Convergence Divergence)
-    ema_fast = df["Close"].ewm(span=macd_fast, adjust=False).mean()
-    ema_slow = df["Close"].ewm(span=macd_slow, adjust=False).mean()
-    df["MACD"] = ema_fast - ema_slow
-    df["MACD_Signal"] = df["MACD"].ewm(span=macd_signal, adjust=False).mean()
+async def calculate_indicators(ticker, days=30, sma_period=14, ema_period=14, rsi_period=14, macd_fast=12, macd_slow=26, macd_signal=9):
+    row = await live_indicator_row(
+        ticker, days,
+        sma_period=sma_period, ema_period=ema_period, rsi_period=rsi_period,
+        macd_fast=macd_fast, macd_slow=macd_slow, macd_signal=macd_signal,
+    )
 
-    # Signal (1 se SMA > EMA, senão 0)
-    df["Signal"] = (df["SMA"] > df["EMA"]).astype(int)
+    import pandas as pd  # Only this legacy helper needs pandas; keep it out of the server's import chain
 
     # Apenas as colunas desejadas
-    return df[["timestamp","SMA", "EMA", "RSI", "MACD", "MACD_Signal", "Signal"]].iloc[[-1]].replace([np.nan, np.inf, -np.inf], None)
+    return pd.DataFrame([row], columns=INDICATOR_COLUMNS)
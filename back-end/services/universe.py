@@ -0,0 +1,71 @@
+import re
+from config.settings import SYMBOL_UNIVERSE, PINNED_SYMBOLS
+from utils.binance_rest import client
+
+QUOTE_ASSET = "USDT"
+# Binance spot tickers are upper-case letters and digits; the API serves USDT pairs
+_TICKER = re.compile(rf"[A-Z0-9]{{1,20}}{QUOTE_ASSET}")
+
+# Display names for well-known assets; anything else is labelled with its ticker
+LABELS = {
+    "BTC": "Bitcoin",
+    "ETH": "Ethereum",
+    "ADA": "Cardano",
+    "BNB": "BNB",
+    "SOL": "Solana",
+    "XRP": "XRP",
+    "DOGE": "Dogecoin",
+    "DOT": "Polkadot",
+    "LTC": "Litecoin",
+    "LINK": "Chainlink",
+}
+
+def parse_assets(value):
+    """Base assets from a comma separated list ("BTC,ETH" or "BTCUSDT,ETHUSDT")"""
+    assets = []
+    for item in value.split(","):
+        asset = item.strip().upper().removesuffix(QUOTE_ASSET)
+        if asset and asset not in assets:
+            assets.append(asset)
+    return assets
+
+def symbol_entry(asset):
+    return {"symbol": asset, "stream": f"{asset.lower()}{QUOTE_ASSET.lower()}@trade", "label": LABELS.get(asset, asset)}
+
+def ticker(asset):
+    return f"{asset}{QUOTE_ASSET}"
+
+def is_ticker(value):
+    """Whether ``value`` is shaped like a USDT pair ticker ("BTCUSDT")"""
+    return _TICKER.fullmatch(value) is not None
+
+PINNED_ASSETS = parse_assets(PINNED_SYMBOLS)
+
+# Symbols the API serves and may stream, as {"symbol", "stream", "label"} entries. With
+# SYMBOL_UNIVERSE="*" this holds the pinned symbols until load_universe has run.
+SYMBOLS = [symbol_entry(asset) for asset in (PINNED_ASSETS if SYMBOL_UNIVERSE.strip() == "*" else parse_assets(SYMBOL_UNIVERSE))]
+
+def apply_assets(assets):
+    """Replace the universe in place, so modules holding SYMBOLS see the change"""
+    SYMBOLS[:] = [symbol_entry(asset) for asset in assets]
+
+async def fetch_trading_assets():
+    """Base assets of every USDT pair currently trading on the spot market"""
+    info = await client.get_exchange_info()
+    return [
+        item["baseAsset"] for item in info["symbols"]
+        if item.get("quoteAsset") == QUOTE_ASSET and item.get("status") == "TRADING"
+        and item.get("isSpotTradingAllowed", True)
+    ]
+
+async def load_universe():
+    """Resolve SYMBOL_UNIVERSE, updating SYMBOLS in place; returns the tickers"""
+    if SYMBOL_UNIVERSE.strip() == "*":
+        try:
+            assets = await fetch_trading_assets()
+            # Pinned symbols first, so they keep the lowest ids and their order in listings
+            assets = [asset for asset in PINNED_ASSETS if asset in assets] + sorted(set(assets) - set(PINNED_ASSETS))
+            apply_assets(assets)
+        except Exception as e:
+            print(f"Could not load the symbol universe from Binance, keeping {len(SYMBOLS)} symbols: {e}")
+    return [ticker(item["symbol"]) for item in SYMBOLS]
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script for the offline benchmark suite: its statistics, fixtures and runner
+"""
+
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import os
+import tempfile
+
+BACK_END = os.path.dirname(os.path.abspath(__file__))
+
+# Add the back-end directory to Python path
+sys.path.append(BACK_END)
+
+from benchmarks import harness
+from benchmarks.fixtures import FakeBinance, history, recorded_candles, today_ms, DAY_MS
+
+def test_regression_verdicts():
+    """Only changes that are both significant and beyond the tolerance count"""
+    print("📊 Testing regression verdicts...")
+
+    rng = random.Random(0)
+    baseline = [1.0 + rng.gauss(0, 0.02) for _ in range(15)]
+    same = [1.0 + rng.gauss(0, 0.02) for _ in range(15)]
+    slower = [1.3 + rng.gauss(0, 0.02) for _ in range(15)]
+    assert harness.mann_whitney(baseline, same) > harness.ALPHA
+    assert harness.mann_whitney(baseline, slower) < 0.001
+    assert harness.compare(same, baseline, 0.1)[0] == "same"
+    assert harness.compare(slower, baseline, 0.1)[0] == "slower"
+    assert harness.compare(baseline, slower, 0.1)[0] == "faster"
+    assert harness.compare(slower, baseline, 0.5)[0] == "same", "Within tolerance"
+
+    print("✅ Noise is told apart from regressions")
+    return True
+
+def test_fixtures():
+    """Long histories extend the recorded klines up to today; the fake Binance serves ranges of them"""
+    print("🗂️ Testing fixtures...")
+
+    recorded = recorded_candles()
+    candles = history(1000)
+    assert len(candles) == 1000 and int(candles.open_time[-1]) == today_ms()
+    assert (candles.close[-len(recorded):] == recorded.close).all(), "The recording is kept as is"
+    assert (candles.low <= candles.close).all() and (candles.close <= candles.high).all()
+
+    fake = FakeBinance(days=100)
+    rows = asyncio.run(fake.get_historical_klines("BTCUSDT", "1d", start_ms=today_ms() - 9 * DAY_MS))
+    assert len(rows) == 10 and rows[-1][0] == today_ms()
+
+    print("✅ Fixtures are offline and current")
+    return True
+
+def test_suite_run():
+    """The suite runs offline, saves a baseline and compares against it"""
+    print("🏃 Testing suite run...")
+
+    with tempfile.TemporaryDirectory() as root:
+        baseline = os.path.join(root, "baseline.json")
+        command = [sys.executable, "benchmarks/suite.py", "-k", "calculate_rsi_wilder[candles=30]",
+                   "--samples", "5", "--baseline", baseline]
+        saved = subprocess.run(command + ["--save"], cwd=BACK_END, capture_output=True, text=True, timeout=120)
+        assert saved.returncode == 0, saved.stdout + saved.stderr
+        with open(baseline) as f:
+            results = json.load(f)["results"]
+        assert list(results) == ["calculate_rsi_wilder[candles=30]"] and len(results[list(results)[0]]["times"]) == 5
+
+        compared = subprocess.run(command + ["--tolerance", "10"], cwd=BACK_END, capture_output=True, text=True, timeout=120)
+        assert compared.returncode == 0 and "~" in compared.stdout, compared.stdout + compared.stderr
+
+    print("✅ Suite runs and compares")
+    return True
+
+def main():
+    """Run all benchmark suite tests"""
+    tests = [
+        ("Regression Verdicts", test_regression_verdicts),
+        ("Fixtures", test_fixtures),
+        ("Suite Run", test_suite_run),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except Exception as e:
+            print(f"❌ FAIL {test_name}: {e}")
+
+    print(f"\nPassed: {passed}/{len(tests)} tests")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -1,3 +1,4 @@
+import asyncio
 from services.technical_analysis import calculate_indicators
 
-print(calculate_indicators('BTCUSDT', days=90))
\ No newline at end of file
+print(asyncio.run(calculate_indicators('BTCUSDT', days=90)))
\ No newline at end of file
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script for the async Binance REST client against a local stub server
+"""
+
+import asyncio
+import sys
+import os
+
+from aiohttp import web
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.binance_rest import BinanceRestClient, BinanceRestError, INTERVAL_MS
+
+DAY_MS = INTERVAL_MS["1d"]
+START_MS = 1_600_000_000_000 - 1_600_000_000_000 % DAY_MS
+
+def make_kline(open_time):
+    return [open_time, "100.0", "110.0", "90.0", "105.0", "12.5", open_time + DAY_MS - 1,
+            "1312.5", 42, "6.0", "630.0", "0"]
+
+class StubBinance:
+    """Minimal stand-in for the Binance REST endpoints used by the app"""
+
+    def __init__(self, total_klines=2500, delay=0.0):
+        self.total_klines = total_klines
+        self.delay = delay
+        self.requests = []
+        self.used_weight = 0
+        self.rate_limited = False
+        self.app = web.Application()
+        self.app.router.add_get("/api/v3/klines", self.klines)
+        self.app.router.add_get("/api/v3/ticker/24hr", self.ticker)
+
+    async def klines(self, request):
+        self.requests.append(request.path)
+        self.used_weight += 2
+        if self.rate_limited:
+            return web.json_response({"code": -1003}, status=429, headers={"Retry-After": "1"})
+        await asyncio.sleep(self.delay)
+        start = int(request.query.get("startTime", START_MS))
+        limit = int(request.query["limit"])
+        first = max(0, (start - START_MS) // DAY_MS)
+        rows = [make_kline(START_MS + i * DAY_MS) for i in range(first, min(first + limit, self.total_klines))]
+        return web.json_response(rows, headers={"X-MBX-USED-WEIGHT-1M": str(self.used_weight)})
+
+    async def ticker(self, request):
+        self.requests.append(request.path)
+        await asyncio.sleep(self.delay)
+        return web.json_response({"symbol": request.query["symbol"], "openPrice": "100.0"})
+
+    async def __aenter__(self):
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = self.runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.runner.cleanup()
+
+async def check_pagination():
+    async with StubBinance(total_klines=2500) as stub:
+        client = BinanceRestClient(base_url=stub.url)
+        klines = await client.get_historical_klines("BTCUSDT", "1d", start_ms=START_MS)
+        await client.close()
+
+    assert len(klines) == 2500, f"Expected 2500 klines, got {len(klines)}"
+    assert [k[0] for k in klines] == [START_MS + i * DAY_MS for i in range(2500)], "Klines must be contiguous"
+    assert len(stub.requests) == 3, "2500 klines should take three pages"
+    assert client.limiter.used == stub.used_weight, "Limiter should track the upstream weight header"
+
+async def check_single_flight():
+    async with StubBinance(total_klines=90, delay=0.1) as stub:
+        client = BinanceRestClient(base_url=stub.url)
+        results = await asyncio.gather(*(
+            client.get_historical_klines("BTCUSDT", "1d", start_ms=START_MS) for _ in range(50)
+        ))
+        await asyncio.gather(*(client.get_ticker("BTCUSDT") for _ in range(20)))
+        await client.close()
+
+    assert all(result == results[0] for result in results), "All callers should see the same data"
+    assert stub.requests == ["/api/v3/klines", "/api/v3/ticker/24hr"], f"Expected one request each, got {stub.requests}"
+
+async def check_rate_limit():
+    async with StubBinance() as stub:
+        stub.rate_limited = True
+        client = BinanceRestClient(base_url=stub.url)
+        try:
+            await client.get_klines("BTCUSDT", "1d")
+            raise AssertionError("429 should raise BinanceRestError")
+        except BinanceRestError as e:
+            assert e.status == 429
+        assert client.limiter.blocked_until > 0, "Retry-After should pause further requests"
+        await client.close()
+
+def test_pagination():
+    """Historical klines are fetched page by page"""
+    asyncio.run(check_pagination())
+
+def test_single_flight():
+    """Concurrent misses for the same key share one upstream request"""
+    asyncio.run(check_single_flight())
+
+def test_rate_limit():
+    """A 429 response blocks the limiter for Retry-After seconds"""
+    asyncio.run(check_rate_limit())
+
+def main():
+    """Run all REST client tests"""
+    print("🔌 Testing async Binance REST client against a stub server...")
+
+    tests = [
+        ("Pagination", test_pagination),
+        ("Single Flight", test_single_flight),
+        ("Rate Limit", test_rate_limit),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"   ✅ {test_name}")
+            passed += 1
+        except Exception as e:
+            print(f"   ❌ {test_name}: {e}")
+
+    print(f"\nPassed: {passed}/{len(tests)} tests")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
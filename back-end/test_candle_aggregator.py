@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test script to verify live candles built from trades match candles computed directly
+"""
+
+import asyncio
+import math
+import random
+import sys
+import os
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services import candle_aggregator
+from services.candle_aggregator import CandleAggregator, _SymbolCandles, INTERVALS
+from services.stream_manager import streams
+from utils.binance_rest import INTERVAL_MS
+
+def make_trades(count, seed=1):
+    """Random trades with gaps from milliseconds to almost an hour"""
+    rng = random.Random(seed)
+    trade_time = 1_700_000_000_000
+    trades = []
+    for _ in range(count):
+        trade_time += rng.choice([50, 500, 5_000, 60_000, 600_000, 3_000_000])
+        trades.append((round(rng.uniform(90, 110), 2), round(rng.uniform(0.1, 2), 3), trade_time))
+    return trades
+
+def reference_candles(trades, interval):
+    """OHLCV per bucket straight from the trades"""
+    interval_ms = INTERVAL_MS[interval]
+    buckets = {}
+    for price, quantity, trade_time in trades:
+        bucket = trade_time - trade_time % interval_ms
+        candle = buckets.get(bucket)
+        if candle is None:
+            buckets[bucket] = [bucket, price, price, price, price, quantity, price * quantity, 1]
+        else:
+            candle[2] = max(candle[2], price)
+            candle[3] = min(candle[3], price)
+            candle[4] = price
+            candle[5] += quantity
+            candle[6] += price * quantity
+            candle[7] += 1
+    return [buckets[bucket] for bucket in sorted(buckets)]
+
+def aggregated_candles(symbol_candles, index):
+    level = symbol_candles.levels[index]
+    rows = [list(row) for row in zip(*(array.tolist() for array in level.closed()))]
+    live = symbol_candles.live(index)
+    return rows + [live] if live is not None else rows
+
+def assert_same(actual, expected, interval):
+    assert len(actual) == len(expected), f"{interval}: {len(actual)} candles, expected {len(expected)}"
+    for got, want in zip(actual, expected):
+        assert got[:5] == want[:5] and got[7] == want[7], f"{interval}: {got} != {want}"
+        assert math.isclose(got[5], want[5], rel_tol=1e-9) and math.isclose(got[6], want[6], rel_tol=1e-9)
+
+def test_rollup_matches_direct():
+    """Every interval, rolled up from 1m, equals bucketing the trades directly"""
+    print("🕯️ Testing roll-up against direct bucketing...")
+
+    trades = make_trades(20000)
+    symbol_candles = _SymbolCandles(capacity=100000)
+    for count, (price, quantity, trade_time) in enumerate(trades, 1):
+        symbol_candles.add_trade(price, quantity, trade_time)
+        if count % 997 == 0 or count == len(trades):
+            for index, interval in enumerate(INTERVALS):
+                assert_same(aggregated_candles(symbol_candles, index), reference_candles(trades[:count], interval), interval)
+
+    print("   ✅ All intervals identical, including the candles in progress")
+    return True
+
+def test_seeded_from_rest():
+    """Trades after a REST seed extend the seeded candles without double counting"""
+    print("\n🌱 Testing REST seeding...")
+
+    trades = make_trades(20000, seed=2)
+    split = 12345
+    symbol_candles = _SymbolCandles(capacity=100000)
+    for index, interval in enumerate(INTERVALS):
+        klines = [
+            [c[0], repr(c[1]), repr(c[2]), repr(c[3]), repr(c[4]), repr(c[5]), 0, repr(c[6]), c[7]]
+            for c in reference_candles(trades[:split], interval)
+        ]
+        symbol_candles.seed(index, klines)
+
+    for price, quantity, trade_time in trades[split:]:
+        symbol_candles.add_trade(price, quantity, trade_time)
+    for index, interval in enumerate(INTERVALS):
+        assert_same(aggregated_candles(symbol_candles, index), reference_candles(trades, interval), interval)
+
+    print("   ✅ Seeded candles continue seamlessly")
+    return True
+
+def test_ring_capacity():
+    """Only the newest candles are kept once the ring is full"""
+    print("\n🔄 Testing ring buffer capacity...")
+
+    trades = make_trades(5000, seed=3)
+    symbol_candles = _SymbolCandles(capacity=50)
+    for price, quantity, trade_time in trades:
+        symbol_candles.add_trade(price, quantity, trade_time)
+
+    expected = reference_candles(trades, "1m")
+    actual = aggregated_candles(symbol_candles, 0)
+    assert_same(actual, expected[-51:], "1m")
+
+    print("   ✅ Ring keeps the latest candles in order")
+    return True
+
+def test_outside_universe_not_kept():
+    """Streamed symbols are seeded once; others are read from REST on every request"""
+    print("\n🌐 Testing symbols outside the universe...")
+
+    requests = []
+    trades = make_trades(500, seed=4)
+
+    async def get_klines(symbol, interval, start_ms=None, end_ms=None, limit=1000):
+        requests.append((symbol, interval))
+        return [
+            [c[0], repr(c[1]), repr(c[2]), repr(c[3]), repr(c[4]), repr(c[5]), 0, repr(c[6]), c[7]]
+            for c in reference_candles(trades, interval)
+        ]
+
+    async def scenario(aggregator):
+        for _ in range(2):
+            assert len(await aggregator.get("BTCUSDT", "1h")) == len(reference_candles(trades, "1h"))
+            assert len(await aggregator.get("SOLUSDT", "1h")) == len(reference_candles(trades, "1h"))
+
+    aggregator = CandleAggregator(capacity=1000)
+    original = candle_aggregator.client.get_klines
+    candle_aggregator.client.get_klines = get_klines
+    streams.configure(["BTCUSDT"], [])
+    try:
+        asyncio.run(scenario(aggregator))
+    finally:
+        candle_aggregator.client.get_klines = original
+        streams.universe = None
+
+    assert requests.count(("BTCUSDT", "1h")) == 1 and len(requests) == len(INTERVALS) + 2, requests
+    assert requests[-1] == ("SOLUSDT", "1h") and "SOLUSDT" not in aggregator._symbols
+    assert aggregator.version("SOLUSDT", "1h") is None, "Candles nothing updates are never cacheable"
+
+    print("   ✅ Only streamed symbols are kept")
+    return True
+
+def main():
+    """Run all candle aggregator tests"""
+    tests = [
+        ("Roll-up", test_rollup_matches_direct),
+        ("REST Seed", test_seeded_from_rest),
+        ("Ring Capacity", test_ring_capacity),
+        ("Outside Universe", test_outside_universe_not_kept),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except Exception as e:
+            print(f"❌ FAIL {test_name}: {e}")
+
+    print(f"\nPassed: {passed}/{len(tests)} tests")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
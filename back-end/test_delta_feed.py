@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test script for the snapshot/delta WebSocket protocol
+"""
+
+import json
+import random
+import sys
+import os
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.delta_feed import DeltaFeed
+
+def make_record(day, close):
+    return {"timestamp": f"2025-{1 + day // 28:02d}-{1 + day % 28:02d} 00:00:00", "Open": 100.0,
+            "High": 110.0, "Low": 90.0, "Close": close, "Volume": 12345.678,
+            "Quote_asset_volume": 1234567.89, "Number_of_trades": 4321}
+
+def apply(state, message):
+    """Client side of the protocol: (seq, records) after the message, or None to resync"""
+    seq, records = state
+    if message["type"] == "snapshot":
+        return message["seq"], list(message["data"])
+    if seq is None or seq < message["base"]:
+        return None
+    if message["seq"] <= seq:
+        return state
+    data = message["data"]
+    records = [
+        record for record in records
+        if record["timestamp"] >= message["start"] and (not data or record["timestamp"] < data[0]["timestamp"])
+    ]
+    return message["seq"], records + list(data)
+
+def test_snapshot_then_deltas():
+    """Only the changed or appended candles are sent after the snapshot"""
+    print("📸 Testing snapshot and deltas...")
+
+    feed = DeltaFeed()
+    records = [make_record(day, 100.0 + day) for day in range(90)]
+    snapshot = feed.update(records)
+    assert snapshot["type"] == "snapshot" and len(snapshot["data"]) == 90
+
+    assert feed.update(records) is None, "Same records object means no message"
+    assert feed.update(list(records)) is None, "Unchanged records mean no message"
+
+    # The live candle ticks
+    records = records[:-1] + [make_record(89, 250.0)]
+    delta = feed.update(records)
+    assert delta["type"] == "delta" and delta["base"] == snapshot["seq"]
+    assert delta["data"] == [records[-1]]
+
+    # A new day rolls the window: oldest candle dropped, new one appended
+    records = records[1:] + [make_record(90, 251.0)]
+    rolled = feed.update(records)
+    assert rolled["start"] == records[0]["timestamp"] and rolled["data"] == [records[-1]]
+
+    full, small = len(json.dumps(snapshot)), len(json.dumps(delta))
+    print(f"   snapshot {full} bytes, delta {small} bytes")
+    assert small < 500 < full
+
+    print("   ✅ Deltas carry only changed candles")
+    return True
+
+def test_single_row():
+    """A one-row feed whose row ticks in place sends deltas, not snapshots"""
+    print("\n☝️ Testing single-row feed...")
+
+    feed = DeltaFeed()
+    snapshot = feed.update([make_record(0, 100.0)])
+    assert snapshot["type"] == "snapshot"
+    state = (snapshot["seq"], snapshot["data"])
+
+    for close in [101.0, 102.0, 103.0]:
+        records = [make_record(0, close)]
+        delta = feed.update(records)
+        assert delta["type"] == "delta" and delta["data"] == records, f"Tick to {close} must be a delta"
+        state = apply(state, delta)
+        assert state[1] == records
+
+    records = [make_record(1, 104.0)]
+    assert feed.update(records)["type"] == "snapshot", "A new row with no overlap resets"
+
+    print("   ✅ Single row replaced by deltas")
+    return True
+
+def test_gaps_resync():
+    """Clients missing messages either apply deltas exactly or ask for a snapshot"""
+    print("\n🔁 Testing sequence gaps...")
+
+    rng = random.Random(0)
+    feed = DeltaFeed()
+    records = [make_record(day, 100.0) for day in range(90)]
+    messages = [feed.update(records)]
+    states = {feed.seq: records}
+    next_day = 90
+    for _ in range(1000):
+        records = list(records)
+        step = rng.random()
+        if step < 0.6:
+            records[-1] = dict(records[-1], Close=records[-1]["Close"] + 1)
+        elif step < 0.8:
+            records = records[1:] + [make_record(next_day, 100.0)]
+            next_day += 1
+        elif step < 0.9:
+            records[-2] = dict(records[-2], Close=records[-2]["Close"] + 1)
+        elif len(records) > 2:
+            records = records[:-1]  # Candle removed upstream; forces a snapshot
+        message = feed.update(records)
+        if message is not None:
+            messages.append(message)
+            states[message["seq"]] = records
+
+    applied = resyncs = 0
+    for _ in range(50):
+        state = (messages[0]["seq"], messages[0]["data"])
+        for message in messages[1:]:
+            if rng.random() < 0.3:
+                continue  # Conflated or dropped
+            result = apply(state, message)
+            if result is None:
+                resyncs += 1
+                state = (message["seq"], states[message["seq"]])  # Fresh snapshot
+                continue
+            state = result
+            applied += 1
+            assert state[1] == states[state[0]], f"Client diverged at seq {state[0]}"
+
+    print(f"   {applied} deltas applied, {resyncs} resyncs")
+    assert applied > resyncs
+
+    print("   ✅ Gaps handled")
+    return True
+
+def main():
+    """Run all delta feed tests"""
+    tests = [
+        ("Snapshot and Deltas", test_snapshot_then_deltas),
+        ("Single Row", test_single_row),
+        ("Sequence Gaps", test_gaps_resync),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except Exception as e:
+            print(f"❌ FAIL {test_name}: {e}")
+
+    print(f"\nPassed: {passed}/{len(tests)} tests")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
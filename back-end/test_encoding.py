@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for response encoding and Accept header negotiation
+"""
+
+import json
+import sys
+import os
+
+import numpy as np
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.candles import Candles
+from utils.encoding import (
+    EncodedCache, encode_candles, negotiate, unpack_columns, RECORDS_JSON, COLUMNS_JSON, BINARY,
+)
+
+def make_candles(count):
+    values = np.linspace(100.0, 200.0, count)
+    return Candles(
+        open_time=1_700_000_000_000 + np.arange(count) * 86_400_000,
+        open=values, high=values + 1, low=values - 1, close=values + 0.5,
+        volume=values * 3, quote_volume=values * 300, trades=np.arange(count) * 7,
+    )
+
+def test_negotiation():
+    """Accept header picks the format, JSON records by default"""
+    print("🤝 Testing content negotiation...")
+
+    assert negotiate(None) == RECORDS_JSON
+    assert negotiate("*/*") == RECORDS_JSON
+    assert negotiate("application/octet-stream") == BINARY
+    assert negotiate(f"{COLUMNS_JSON}, application/json;q=0.5") == COLUMNS_JSON
+    assert negotiate(f"{BINARY};q=0.2, application/json") == RECORDS_JSON
+    assert negotiate(f"{BINARY};q=0") == RECORDS_JSON, "q=0 means not acceptable"
+    assert negotiate(BINARY, [RECORDS_JSON, COLUMNS_JSON]) == RECORDS_JSON, "Unsupported types fall back"
+
+    print("   ✅ Negotiation working")
+    return True
+
+def test_formats_agree():
+    """Records, columns and binary carry the same values"""
+    print("\n🧾 Testing encoded formats...")
+
+    candles = make_candles(90)
+    records = json.loads(encode_candles(candles, RECORDS_JSON))
+    columns = json.loads(encode_candles(candles, COLUMNS_JSON))
+    binary = unpack_columns(encode_candles(candles, BINARY))
+
+    assert records == candles.to_records()
+    assert list(columns) == list(records[0]) and len(columns["Close"]) == 90
+    assert [row["Close"] for row in records] == columns["Close"] == binary["Close"].tolist()
+    assert binary["timestamp"].dtype == np.int64 and binary["timestamp"][0] == 1_700_000_000_000
+    assert binary["Number_of_trades"].tolist() == candles.trades.tolist()
+    assert list(binary) == list(records[0]), "Column names must survive intact"
+
+    print("   ✅ All formats carry identical data")
+    return True
+
+def test_cache_versioning():
+    """Encoded bodies are reused until the version changes"""
+    print("\n💾 Testing encoded cache...")
+
+    cache = EncodedCache(max_entries=2)
+    builds = []
+    build = lambda: builds.append(1) or b"body"
+
+    cache.get("a", 1, build)
+    cache.get("a", 1, build)
+    assert len(builds) == 1, "Same version must be served from cache"
+    cache.get("a", 2, build)
+    assert len(builds) == 2, "New version must re-encode"
+    cache.get("b", 1, build)
+    cache.get("c", 1, build)
+    assert cache.info()["entries"] == 2, "Oldest entries are evicted"
+
+    print("   ✅ Cache versioning working")
+    return True
+
+def main():
+    """Run all encoding tests"""
+    tests = [
+        ("Negotiation", test_negotiation),
+        ("Formats", test_formats_agree),
+        ("Cache", test_cache_versioning),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except Exception as e:
+            print(f"❌ FAIL {test_name}: {e}")
+
+    print(f"\nPassed: {passed}/{len(tests)} tests")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script to verify bounded executors: results, load shedding and latency budgets
+"""
+
+import asyncio
+import pickle
+import sys
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.executors import BoundedExecutor, Overloaded
+from benchmarks.bench_encoding import make_candles
+from services.indicator_engine import IndicatorEngine
+
+def test_sheds_when_full():
+    """Tasks beyond max_queue are rejected at once, the rest complete"""
+    print("🚦 Testing queue limit...")
+
+    async def scenario():
+        release = threading.Event()
+        executor = BoundedExecutor("test", lambda: ThreadPoolExecutor(1), max_queue=2, budget=5.0)
+        running = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        try:
+            await executor.run(time.sleep, 0)
+            raise AssertionError("third task was not shed")
+        except Overloaded:
+            pass
+        release.set()
+        assert await asyncio.gather(*running) == [True, True]
+        assert executor.info()["shed"] == 1 and executor.info()["completed"] == 2
+        assert executor.pending == 0
+        executor.shutdown()
+
+    asyncio.run(scenario())
+    print("   ✅ Full queue sheds new tasks")
+    return True
+
+def test_budget_expiry():
+    """A task still queued when its budget runs out is dropped instead of run late"""
+    print("⏱️ Testing latency budget...")
+
+    async def scenario():
+        ran = []
+        executor = BoundedExecutor("test", lambda: ThreadPoolExecutor(1), max_queue=8, budget=0.05)
+        slow = asyncio.ensure_future(executor.run(time.sleep, 0.2))
+        await asyncio.sleep(0.01)
+        try:
+            await executor.run(ran.append, 1)
+            raise AssertionError("late task was not dropped")
+        except Overloaded:
+            pass
+        await slow
+        assert ran == [] and executor.info()["expired"] == 1
+        executor.shutdown()
+
+    asyncio.run(scenario())
+    print("   ✅ Expired tasks are not run")
+    return True
+
+def test_process_seed():
+    """Engines seeded in a worker process match ones seeded inline"""
+    print("🧮 Testing indicator seeding in a process pool...")
+
+    candles = make_candles(400, 3)
+    copy = pickle.loads(pickle.dumps(candles))
+    assert not copy.close.flags.writeable, "unpickled candles must stay read-only"
+
+    async def scenario():
+        executor = BoundedExecutor("test", lambda: ProcessPoolExecutor(1), budget=30.0)
+        try:
+            return await executor.run(IndicatorEngine.from_candles, candles, sma_period=10)
+        finally:
+            executor.shutdown()
+
+    engine = asyncio.run(scenario())
+    expected = IndicatorEngine.from_candles(candles, sma_period=10)
+    assert engine.evaluate(101.5) == expected.evaluate(101.5)
+    print("   ✅ Process pool engines match")
+    return True
+
+def main():
+    """Run all executor tests"""
+    tests = [
+        ("Queue Limit", test_sheds_when_full),
+        ("Latency Budget", test_budget_expiry),
+        ("Process Seeding", test_process_seed),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except Exception as e:
+            print(f"❌ FAIL {test_name}: {e}")
+
+    print(f"\nPassed: {passed}/{len(tests)} tests")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
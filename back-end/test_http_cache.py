@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test script for conditional GET (ETag / Last-Modified) and response compression
+"""
+
+import asyncio
+import gzip
+import sys
+import os
+from email.utils import formatdate
+
+from starlette.requests import Request
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.http_cache import EncodedBody, conditional_response, negotiate_encoding
+
+BODY = b'[{"timestamp":"2024-01-01 00:00:00","Close":42000.0}]' * 100
+
+def make_request(**headers):
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+def test_encoding_negotiation():
+    """gzip (or brotli) only when accepted and worth it"""
+    print("🗜️ Testing Accept-Encoding negotiation...")
+
+    assert negotiate_encoding("gzip, deflate", len(BODY)) in ("gzip", "br")
+    assert negotiate_encoding("identity", len(BODY)) is None
+    assert negotiate_encoding("gzip;q=0", len(BODY)) is None
+    assert negotiate_encoding("gzip", 10) is None, "Tiny bodies are not compressed"
+    assert negotiate_encoding(None, len(BODY)) is None
+
+    print("   ✅ Negotiation working")
+    return True
+
+def test_compressed_response():
+    """Compressed variants decode to the body and are built once"""
+    print("\n📦 Testing compressed responses...")
+
+    encoded = EncodedBody(BODY)
+    response = conditional_response(make_request(accept_encoding="gzip"), encoded, "application/json", 30)
+    assert response.status_code == 200 and response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(response.body) == BODY
+    assert response.headers["cache-control"] == "public, max-age=30"
+    assert encoded.variant("gzip") is encoded.variant("gzip"), "Compressed body should be cached"
+
+    print(f"   {len(BODY)} bytes -> {len(response.body)} bytes gzipped")
+    print("   ✅ Compression working")
+    return True
+
+def test_not_modified():
+    """Matching validators give an empty 304"""
+    print("\n♻️ Testing conditional GET...")
+
+    encoded = EncodedBody(BODY, last_modified=1_700_000_000)
+    first = conditional_response(make_request(accept_encoding="gzip"), encoded, "application/json", 30)
+    etag = first.headers["etag"]
+
+    # The compressed variant's tag still validates, with or without the weak prefix
+    for tag in [etag, f"W/{etag}", f'"{encoded.etag}"', '"other", ' + etag]:
+        response = conditional_response(make_request(if_none_match=tag), encoded, "application/json", 30)
+        assert response.status_code == 304 and response.body == b"", f"{tag} should be not modified"
+
+    changed = conditional_response(make_request(if_none_match='"other"'), encoded, "application/json", 30)
+    assert changed.status_code == 200
+
+    since = formatdate(1_700_000_000, usegmt=True)
+    assert conditional_response(make_request(if_modified_since=since), encoded, "application/json", 30).status_code == 304
+    earlier = formatdate(1_600_000_000, usegmt=True)
+    assert conditional_response(make_request(if_modified_since=earlier), encoded, "application/json", 30).status_code == 200
+
+    print("   ✅ Conditional GET working")
+    return True
+
+def test_history_last_modified():
+    """History's Last-Modified is the series' fetch time, so it survives eviction and agrees across workers"""
+    print("\n🕰️ Testing history Last-Modified...")
+
+    from benchmarks.fixtures import history as fixture_history
+    from services import history
+    from services.candle_aggregator import CandleAggregator
+    from utils.encoding import RECORDS_JSON
+
+    fetched_at = 1_700_000_000.75
+    candles = fixture_history(30)
+
+    async def versioned_candles(symbol, days):
+        return candles, 7
+
+    async def scenario():
+        saved = history.get_versioned_candles, history.get_cache_fetched_at
+        history.get_versioned_candles = versioned_candles
+        history.get_cache_fetched_at = lambda symbol: fetched_at
+        try:
+            first = await history.encoded_history("BTCUSDT", 30, "1d", RECORDS_JSON)
+            history.encoded_cache.clear()  # Evicted, as under memory pressure or in another worker
+            second = await history.encoded_history("BTCUSDT", 30, "1d", RECORDS_JSON)
+        finally:
+            history.get_versioned_candles, history.get_cache_fetched_at = saved
+            history.encoded_cache.clear()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first is not second and first.last_modified == second.last_modified == int(fetched_at)
+    response = conditional_response(make_request(if_modified_since=formatdate(fetched_at, usegmt=True)), second,
+                                    RECORDS_JSON, 60)
+    assert response.status_code == 304
+
+    # Intraday candles change with each trade
+    aggregator = CandleAggregator(capacity=10)
+    aggregator.add_trade("BTCUSDT", 100.0, 1.0, 1_700_000_123_456)
+    assert aggregator.updated_at("BTCUSDT") is None, "Unknown until seeded"
+    aggregator._get("BTCUSDT").seeded = True
+    aggregator.add_trade("BTCUSDT", 101.0, 1.0, 1_700_000_124_000)
+    assert aggregator.updated_at("BTCUSDT") == 1_700_000_124.0
+
+    print("   ✅ Last-Modified follows the candles, not the encoding")
+    return True
+
+def main():
+    """Run all HTTP cache tests"""
+    tests = [
+        ("Encoding Negotiation", test_encoding_negotiation),
+        ("Compression", test_compressed_response),
+        ("Not Modified", test_not_modified),
+        ("History Last-Modified", test_history_last_modified),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except Exception as e:
+            print(f"❌ FAIL {test_name}: {e}")
+
+    print(f"\nPassed: {passed}/{len(tests)} tests")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
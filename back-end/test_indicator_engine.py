@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the incremental indicator engine matches the pandas pipeline
+"""
+
+import asyncio
+import sys
+import os
+
+import numpy as np
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.indicator_engine import IndicatorEngine, INDICATOR_COLUMNS
+from services.indicator_panel import IndicatorPanel
+from utils.candles import Candles, FIELDS
+from utils.data_loader import calculate_rsi_wilder
+
+DAY_MS = 86_400_000
+
+def make_candles(count, seed=0):
+    rng = np.random.default_rng(seed)
+    closes = np.round(np.cumsum(rng.normal(0, 300, count)) + 50000, 2)
+    zeros = np.zeros(count)
+    return Candles(
+        open_time=1_700_000_000_000 + np.arange(count) * DAY_MS,
+        open=zeros, high=zeros, low=zeros, close=closes,
+        volume=zeros, quote_volume=zeros, trades=zeros,
+    )
+
+def pandas_indicators(df, close):
+    """Full recomputation, as calculate_indicators used to do it"""
+    df = df.copy()
+    df.loc[df.index[-1], "Close"] = close
+    df["SMA"] = df["Close"].rolling(window=14).mean()
+    df["EMA"] = df["Close"].ewm(span=14, adjust=False).mean()
+    df["RSI"] = calculate_rsi_wilder(df["Close"], 14)
+    ema_fast = df["Close"].ewm(span=12, adjust=False).mean()
+    ema_slow = df["Close"].ewm(span=26, adjust=False).mean()
+    df["MACD"] = ema_fast - ema_slow
+    df["MACD_Signal"] = df["MACD"].ewm(span=9, adjust=False).mean()
+    df["Signal"] = (df["SMA"] > df["EMA"]).astype(int)
+    last = df[INDICATOR_COLUMNS].iloc[[-1]].replace([np.nan, np.inf, -np.inf], None)
+    return last.to_dict(orient="records")[0]
+
+def test_engine_matches_pandas():
+    """Live ticks on the provisional candle give bit-identical results"""
+    print("🧮 Testing engine parity with pandas...")
+
+    for seed, count in enumerate([16, 30, 91, 365]):
+        candles = make_candles(count, seed)
+        df = candles.to_frame()
+        engine = IndicatorEngine.from_candles(candles)
+        last_close = df["Close"].iloc[-1]
+
+        for close in [last_close, last_close * 1.01, last_close * 0.97]:
+            assert engine.evaluate(close) == pandas_indicators(df, close), f"Mismatch for {count} candles"
+
+    print("   ✅ Engine output identical to pandas")
+    return True
+
+def test_engine_roll_forward():
+    """Rolling to the next candle equals reseeding from the extended candles"""
+    print("\n🔁 Testing candle roll-forward...")
+
+    candles = make_candles(120, seed=7)
+    engine = IndicatorEngine.from_candles(candles[:40])
+
+    for end in range(41, len(candles) + 1):
+        assert engine.try_roll(candles[:end]), "Extension by one candle should roll"
+        assert engine.evaluate() == IndicatorEngine.from_candles(candles[:end]).evaluate()
+
+    assert not engine.try_roll(candles[5:]), "Shifted window must not roll"
+    print("   ✅ Roll-forward matches reseeding")
+    return True
+
+def test_panel_matches_engines():
+    """A panel of symbols gives exactly the rows of one engine per symbol"""
+    print("\n🧊 Testing vectorized indicator panel...")
+
+    for count in [1, 15, 16, 30, 91]:
+        candles_list = [make_candles(count, seed) for seed in range(12)]
+        # A flat series exercises the rolling mean's equal-values path
+        flat = make_candles(count)
+        candles_list.append(Candles(**{**{name: getattr(flat, name) for name, _, _ in FIELDS}, "close": np.full(count, 100.0)}))
+
+        panel = IndicatorPanel.from_candles(candles_list)
+        for factor in [1.0, 1.02]:
+            closes = panel.reference_close * factor
+            rows = panel.evaluate(closes)
+            for candles, close, row in zip(candles_list, closes.tolist(), rows):
+                assert row == IndicatorEngine.from_candles(candles).evaluate(close), f"Mismatch for {count} candles"
+
+    try:
+        IndicatorPanel.from_candles([make_candles(30), make_candles(31)])
+        assert False, "Mixed lengths must be rejected"
+    except ValueError:
+        pass
+
+    print("   ✅ Panel rows identical to per-symbol engines")
+    return True
+
+def test_engine_cache_bounded():
+    """Sweeping request parameters keeps the engine cache bounded; malformed symbols never reach it"""
+    print("\n🧹 Testing engine cache bound...")
+
+    from services import technical_analysis
+
+    async def load_candles(ticker, days, interval):
+        return make_candles(days)
+
+    async def scenario():
+        loaded, versioned = technical_analysis._load_candles, technical_analysis._candles_version
+        technical_analysis._load_candles = load_candles
+        technical_analysis._candles_version = lambda ticker, days, interval: days
+        technical_analysis._engines.clear()
+        try:
+            for days in range(20, 20 + technical_analysis.ENGINE_CACHE_SIZE + 40):
+                await technical_analysis.get_indicator_engine("BTCUSDT", days)
+            assert len(technical_analysis._engines) == technical_analysis.ENGINE_CACHE_SIZE
+            newest = await technical_analysis.get_indicator_engine("BTCUSDT", 20 + technical_analysis.ENGINE_CACHE_SIZE + 39)
+            assert next(reversed(technical_analysis._engines.values())) is newest, "Hits are the most recently used"
+
+            for ticker in ["../etc", "BTC USDT", "BTCEUR", "A" * 30 + "USDT", ""]:
+                try:
+                    await technical_analysis.get_indicator_engine(ticker, 30)
+                    assert False, f"{ticker!r} must be rejected"
+                except ValueError:
+                    pass
+            assert len(technical_analysis._engines) == technical_analysis.ENGINE_CACHE_SIZE
+        finally:
+            technical_analysis._load_candles, technical_analysis._candles_version = loaded, versioned
+            technical_analysis._engines.clear()
+
+    asyncio.run(scenario())
+    print("   ✅ Engine cache bounded and symbols validated")
+    return True
+
+def test_empty_window():
+    """A window without candles gives rows of None instead of failing"""
+    print("\n🕳️ Testing empty candle window...")
+
+    from services import technical_analysis
+
+    empty = Candles.empty()
+    assert IndicatorEngine.from_candles(empty).evaluate() == dict.fromkeys(INDICATOR_COLUMNS)
+    assert IndicatorEngine.from_candles(empty).evaluate(100.0) == dict.fromkeys(INDICATOR_COLUMNS)
+    assert IndicatorPanel.from_candles([empty, empty]).evaluate() == [dict.fromkeys(INDICATOR_COLUMNS)] * 2
+
+    async def load_candles(ticker, days, interval):
+        return empty if days <= 0 or ticker == "OLDUSDT" else make_candles(days)
+
+    async def scenario():
+        loaded = technical_analysis._load_candles
+        technical_analysis._load_candles = load_candles
+        technical_analysis.price_store.record_trade("oldusdt", 5.0, 1_700_000_000_000)
+        try:
+            assert await technical_analysis.live_indicator_row("BTCUSDT", 0) == dict.fromkeys(INDICATOR_COLUMNS)
+            assert await technical_analysis.live_indicator_row("OLDUSDT", 30) == dict.fromkeys(INDICATOR_COLUMNS)
+            rows = await technical_analysis.live_indicator_rows(["OLDUSDT", "BTCUSDT"], 30)
+            assert rows[0] == dict.fromkeys(INDICATOR_COLUMNS) and rows[1]["SMA"] is not None
+        finally:
+            technical_analysis._load_candles = loaded
+            technical_analysis._engines.clear()
+            technical_analysis._panels.clear()
+
+    asyncio.run(scenario())
+    print("   ✅ Empty windows evaluate to None")
+    return True
+
+def main():
+    """Run all indicator engine tests"""
+    tests = [
+        ("Engine Parity", test_engine_matches_pandas),
+        ("Roll Forward", test_engine_roll_forward),
+        ("Panel Parity", test_panel_matches_engines),
+        ("Engine Cache Bound", test_engine_cache_bounded),
+        ("Empty Window", test_empty_window),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except Exception as e:
+            print(f"❌ FAIL {test_name}: {e}")
+
+    print(f"\nPassed: {passed}/{len(tests)} tests")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
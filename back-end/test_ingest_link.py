@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that API workers share the ingest process's streams over its socket
+"""
+
+import asyncio
+import sys
+import os
+import tempfile
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.ingest_link import IngestServer, IngestClient
+from services.stream_manager import StreamManager
+from utils.binance_rest import BinanceRestError
+
+async def wait_for(condition, timeout=2.0):
+    """Poll until condition() holds"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+def test_workers_share_streams():
+    """Watches from several workers are combined; trades reach every worker"""
+    print("🔗 Testing ingest process link...")
+
+    async def scenario(path):
+        manager = StreamManager(capacity=10, idle_ttl=0.05)  # Bookkeeping only, never started
+        manager.configure(["BTCUSDT", "ETHUSDT"], ["BTCUSDT"])
+        server = IngestServer(manager, path)
+        await server.start()
+
+        received = [[], []]
+        removed = []
+        workers = [IngestClient(path), IngestClient(path)]
+        for worker, trades in zip(workers, received):
+            async def on_message(payload, trades=trades):
+                trades.append(payload)
+            worker.start(on_message, removed.append)
+        await wait_for(lambda: len(server.clients) == 2)
+        assert all(worker.state()["status"] == "connected" for worker in workers)
+        # The ingest process's universe decides what a worker may stream and keep
+        await wait_for(lambda: all(worker.universe is not None for worker in workers))
+        assert workers[0].allowed("BTCUSDT") and not workers[0].allowed("SOLUSDT")
+
+        # Two viewers in one worker and one in the other: one watch each upstream
+        workers[0].watch("ETHUSDT")
+        workers[0].watch("ETHUSDT")
+        workers[1].watch("ETHUSDT")
+        await wait_for(lambda: manager._watchers.get("ETHUSDT") == 2)
+        assert manager.streaming() == ["ETHUSDT"]
+
+        trade = {"e": "trade", "s": "ETHUSDT", "p": "3000.5", "q": "0.1", "T": 1_700_000_000_000}
+        await server.publish_trade(trade)
+        await wait_for(lambda: all(received))
+        assert received == [[trade], [trade]]
+
+        # A worker that goes away releases its watches
+        await workers[1].stop()
+        await wait_for(lambda: manager._watchers.get("ETHUSDT") == 1)
+        workers[0].unwatch("ETHUSDT")
+        await asyncio.sleep(0.05)
+        assert manager.streaming() == ["ETHUSDT"], "one viewer is still watching"
+        workers[0].unwatch("ETHUSDT")
+
+        # Expiry in the ingest process is forwarded to the workers
+        manager.on_removed = server.publish_removed
+        await wait_for(lambda: removed == ["ETHUSDT"])
+        assert manager.streaming() == []
+
+        await workers[0].stop()
+        await server.stop()
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(scenario(os.path.join(directory, "ingest.sock")))
+    print("   ✅ Workers share one set of upstream streams")
+    return True
+
+class CountingRest:
+    """Answers kline reads after a short delay, counting the upstream requests"""
+
+    def __init__(self):
+        self.requests = []
+
+    async def get_klines(self, symbol, interval, start_ms=None, end_ms=None, limit=1000):
+        return await self._read(symbol, interval, limit)
+
+    async def get_historical_klines(self, symbol, interval="1d", start_ms=None, end_ms=None):
+        return await self._read(symbol, interval, None)
+
+    async def _read(self, symbol, interval, limit):
+        self.requests.append((symbol, interval, limit))
+        await asyncio.sleep(0.05)
+        if symbol == "NOPEUSDT":
+            raise BinanceRestError(400, '{"code":-1121,"msg":"Invalid symbol."}')
+        return [[1_700_000_000_000, "1.0", "2.0", "0.5", "1.5", "10.0", 0, "15.0", 3]]
+
+def test_workers_share_seeds():
+    """Kline reads from several workers go upstream once, through the ingest process"""
+    print("\n🌱 Testing shared seeds...")
+
+    async def scenario(path):
+        manager = StreamManager(capacity=10)
+        manager.configure(["BTCUSDT"], [])
+        rest = CountingRest()
+        server = IngestServer(manager, path, rest=rest)
+        await server.start()
+
+        workers = [IngestClient(path) for _ in range(4)]
+        # Asked before the link is up: sent once it connects
+        reads = [asyncio.ensure_future(worker.get_klines("BTCUSDT", "1h", limit=1000)) for worker in workers]
+        for worker in workers:
+            async def on_message(payload):
+                pass
+            worker.start(on_message)
+        results = await asyncio.wait_for(asyncio.gather(*reads), 2.0)
+        assert all(result == results[0] for result in results) and results[0][0][4] == "1.5"
+        assert rest.requests == [("BTCUSDT", "1h", 1000)], rest.requests
+
+        # A worker starting a little later reuses the answer; another read goes upstream
+        assert await workers[0].get_klines("BTCUSDT", "1h", limit=1000) == results[0]
+        await asyncio.gather(*(worker.get_historical_klines("BTCUSDT", "1d", start_ms=0) for worker in workers))
+        assert rest.requests == [("BTCUSDT", "1h", 1000), ("BTCUSDT", "1d", None)]
+
+        # Binance errors reach the worker as they would from REST, and are not kept
+        for _ in range(2):
+            try:
+                await workers[1].get_klines("NOPEUSDT", "1m", limit=10)
+                assert False, "the read fails"
+            except BinanceRestError as e:
+                assert e.status == 400 and "Invalid symbol" in str(e) and str(e).count("Binance REST error") == 1
+        assert rest.requests.count(("NOPEUSDT", "1m", 10)) == 2
+
+        for worker in workers:
+            await worker.stop()
+        await server.stop()
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(scenario(os.path.join(directory, "ingest.sock")))
+    print("   ✅ One upstream read serves every worker")
+    return True
+
+def main():
+    """Run all ingest link tests"""
+    tests = [
+        ("Shared Streams", test_workers_share_streams),
+        ("Shared Seeds", test_workers_share_seeds),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except Exception as e:
+            print(f"❌ FAIL {test_name}: {e}")
+
+    print(f"\nPassed: {passed}/{len(tests)} tests")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Test script for the canonical per-symbol kline store
+"""
+
+import asyncio
+import multiprocessing
+import sys
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.candle_file import CandleDirectory, CandleFileError, read_candles, write_candles
+from utils.candles import Candles
+from utils.kline_store import KlineStore
+
+DAY_MS = 86_400_000
+NOW_MS = 1_700_000_000_000 - 1_700_000_000_000 % DAY_MS
+
+class FakeUpstream:
+    """Daily candles up to NOW_MS; records every requested range"""
+
+    def __init__(self):
+        self.calls = []
+        self.close = 100.0
+        self.offline = False
+
+    async def fetch(self, symbol, start_ms, end_ms):
+        self.calls.append((symbol, start_ms, end_ms))
+        if self.offline:
+            raise ConnectionError("upstream unreachable")
+        end_ms = NOW_MS if end_ms is None else end_ms
+        first = start_ms + (-start_ms) % DAY_MS
+        open_times = np.arange(first, end_ms + 1, DAY_MS, dtype=np.int64)
+        prices = np.full(len(open_times), self.close)
+        return Candles(
+            open_time=open_times, open=prices, high=prices, low=prices, close=prices,
+            volume=prices, quote_volume=prices, trades=np.zeros(len(open_times)),
+        )
+
+def days_ago(days):
+    return NOW_MS - days * DAY_MS
+
+async def check_slicing_and_extension():
+    upstream = FakeUpstream()
+    store = KlineStore(upstream.fetch, max_age=3600, max_bytes=10**9)
+
+    c30, _ = await store.get("BTCUSDT", days_ago(30))
+    c10, _ = await store.get("BTCUSDT", days_ago(10))
+    assert len(c30) == 31 and len(c10) == 11, "days windows should be slices of one series"
+    assert np.shares_memory(c30.close, c10.close), "Slices should be views, not copies"
+    assert len(upstream.calls) == 1, "A shorter window must not hit upstream"
+
+    c90, _ = await store.get("BTCUSDT", days_ago(90))
+    assert len(c90) == 91
+    assert upstream.calls[-1] == ("BTCUSDT", days_ago(90), days_ago(30) - 1), "Only the missing range is fetched"
+    assert (np.diff(c90.open_time) == DAY_MS).all(), "Candles must stay sorted with no duplicates"
+    assert store.lookups == {"hit": 1, "stale": 0, "disk": 0, "miss": 2}
+
+async def check_tail_top_up():
+    upstream = FakeUpstream()
+    store = KlineStore(upstream.fetch, max_age=3600, max_bytes=10**9)
+
+    _, version = await store.get("BTCUSDT", days_ago(30))
+    store._series["BTCUSDT"].fetched_at -= 7200  # Age the cache past max_age
+    upstream.close = 101.0
+    assert store.version("BTCUSDT", days_ago(30)) is None, "Stale series should report no version"
+
+    candles, new_version = await store.get("BTCUSDT", days_ago(30))
+    assert upstream.calls[-1] == ("BTCUSDT", NOW_MS, None), "Top-up starts at the last (open) candle"
+    assert new_version != version and len(candles) == 31
+    assert candles.close[-1] == 101.0 and candles.close[0] == 100.0
+
+async def check_lru_eviction():
+    upstream = FakeUpstream()
+    probe = KlineStore(upstream.fetch, max_age=3600, max_bytes=10**9)
+    await probe.get("X", days_ago(100))
+    series_bytes = probe._series["X"].nbytes
+
+    store = KlineStore(upstream.fetch, max_age=3600, max_bytes=int(series_bytes * 3.5))
+    for symbol in ["BTCUSDT", "ETHUSDT", "ADAUSDT"]:
+        await store.get(symbol, days_ago(100))
+    await store.get("BTCUSDT", days_ago(100))  # Touch BTC so ETH is the least recently used
+    await store.get("SOLUSDT", days_ago(100))
+    assert list(store.info()) == ["ADAUSDT", "BTCUSDT", "SOLUSDT"], f"Unexpected cache contents: {list(store.info())}"
+    assert len(upstream.calls) == 5, "Touching a cached symbol must not refetch it"
+
+async def check_persistence(root):
+    upstream = FakeUpstream()
+    store = KlineStore(upstream.fetch, max_age=3600, max_bytes=10**9, disk=CandleDirectory(root))
+    fetched, _ = await store.get("BTCUSDT", days_ago(30))
+
+    # A restarted process serves the same candles from disk without going upstream
+    restarted = KlineStore(upstream.fetch, max_age=3600, max_bytes=10**9, disk=CandleDirectory(root))
+    loaded, _ = await restarted.get("BTCUSDT", days_ago(30))
+    assert len(upstream.calls) == 1, "Fresh candles on disk must not be refetched"
+    assert restarted.lookups["disk"] == 1
+    assert all((getattr(loaded, name) == getattr(fetched, name)).all() for name in Candles.__slots__)
+
+    # Once stale, the tail is topped up; with upstream down the stored candles are still served
+    restarted._series["BTCUSDT"].fetched_at -= 7200
+    upstream.offline = True
+    stale, _ = await restarted.get("BTCUSDT", days_ago(30))
+    assert len(stale) == 31, "Stored candles should be served while upstream is down"
+    await restarted.get("BTCUSDT", days_ago(30))
+    assert len(upstream.calls) == 2, "A failed top-up is not retried on every request"
+
+    # Clearing the cache empties memory but keeps the files; deleting them has to be asked for
+    restarted.clear()
+    assert restarted.symbols() == [] and CandleDirectory(root).load("BTCUSDT") is not None
+    await restarted.get("BTCUSDT", days_ago(30))
+    assert len(upstream.calls) == 2 and restarted.lookups["disk"] == 2
+    restarted.clear("BTCUSDT", files=True)
+    assert CandleDirectory(root).load("BTCUSDT") is None
+    upstream.offline = False
+    await restarted.get("BTCUSDT", days_ago(30))
+
+    # Corrupt files are rejected instead of being served
+    path = CandleDirectory(root).path("BTCUSDT")
+    with open(path, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        f.write(b"\xff")
+    try:
+        read_candles(path)
+        raise AssertionError("Checksum mismatch was not detected")
+    except CandleFileError:
+        pass
+    assert CandleDirectory(root).load("BTCUSDT") is None
+
+async def check_stale_while_revalidate():
+    upstream = FakeUpstream()
+    store = KlineStore(upstream.fetch, max_age=10**9, max_bytes=10**9,
+                       interval_ms=DAY_MS, stale_while_revalidate=DAY_MS // 1000)
+
+    _, version = await store.get("BTCUSDT", days_ago(30))
+    assert store.version("BTCUSDT", days_ago(30)) == version, "Fresh until the open candle closes"
+
+    # Fetched before the last daily close: stale, but served at once while the tail refreshes
+    store._series["BTCUSDT"].fetched_at -= DAY_MS / 1000
+    upstream.close = 101.0
+    stale, stale_version = await store.get("BTCUSDT", days_ago(30))
+    assert stale_version == version and stale.close[-1] == 100.0 and len(upstream.calls) == 1
+    assert store.lookups["stale"] == 1
+    await store.refresh("BTCUSDT")
+    await store.refresh("BTCUSDT")
+    assert len(upstream.calls) == 2, "One top-up per candle close, shared by every reader"
+    candles, new_version = await store.get("BTCUSDT", days_ago(30))
+    assert new_version != version and candles.close[-1] == 101.0
+
+    # Stale beyond the window: the request waits for the top-up again
+    store._series["BTCUSDT"].fetched_at -= 3 * DAY_MS / 1000
+    assert store.version("BTCUSDT", days_ago(30)) is None
+    upstream.close = 102.0
+    candles, _ = await store.get("BTCUSDT", days_ago(30))
+    assert candles.close[-1] == 102.0 and len(upstream.calls) == 3
+
+async def check_shared_refresh(root):
+    upstream = FakeUpstream()
+    stores = [
+        KlineStore(upstream.fetch, max_age=10**9, max_bytes=10**9, disk=CandleDirectory(root),
+                   interval_ms=DAY_MS, stale_while_revalidate=DAY_MS // 1000)
+        for _ in range(2)
+    ]
+    for store in stores:
+        await store.get("BTCUSDT", days_ago(30))
+        store._series["BTCUSDT"].fetched_at -= DAY_MS / 1000
+    await stores[0]._save(stores[0]._series["BTCUSDT"])
+    assert len(upstream.calls) == 1
+
+    # The first process to refresh after the close goes upstream; the other reads its file
+    await stores[0].refresh("BTCUSDT")
+    await stores[1].refresh("BTCUSDT")
+    assert len(upstream.calls) == 2, "Processes sharing a directory refresh a symbol once"
+    assert stores[1].version("BTCUSDT", days_ago(30)) is not None
+
+async def check_bookkeeping_bounded():
+    upstream = FakeUpstream()
+    upstream.offline = True
+    store = KlineStore(upstream.fetch, max_age=3600, max_bytes=10**9)
+    for index in range(100):
+        try:
+            await store.get(f"GONE{index}USDT", days_ago(30))
+            raise AssertionError("The fetch should have failed")
+        except ConnectionError:
+            pass
+        await store.refresh(f"GONE{index}USDT")
+    assert store._locks == {} and store._refreshes == {}, "Symbols never cached leave nothing behind"
+
+    upstream.offline = False
+    await store.get("BTCUSDT", days_ago(30))
+    store._series["BTCUSDT"].fetched_at -= 7200
+    await store.refresh("BTCUSDT")
+    assert list(store._locks) == ["BTCUSDT"] and store._refreshes == {}
+
+    # The application's store only takes tickers
+    from utils.binance_data import get_candles, refresh_candles
+    for call in (get_candles, refresh_candles):
+        try:
+            await call("../../etc/passwd")
+            raise AssertionError("A non-ticker reached the store")
+        except ValueError:
+            pass
+
+def candles_of(count, close):
+    open_times = NOW_MS - np.arange(count - 1, -1, -1, dtype=np.int64) * DAY_MS
+    prices = np.full(count, close)
+    return Candles(open_time=open_times, open=prices, high=prices, low=prices, close=prices,
+                   volume=prices, quote_volume=prices, trades=np.zeros(count))
+
+def write_repeatedly(path, writer, rounds=50):
+    # Each writer saves series of its own length and price, so a mixed-up file shows
+    for round_ in range(rounds):
+        count = 10 + writer
+        write_candles(path, candles_of(count, float(writer)), int(NOW_MS - (count - 1) * DAY_MS), float(round_))
+
+def check_written(path, writers):
+    candles, covered_from, _ = read_candles(path)
+    writer = int(candles.close[0])
+    assert 0 <= writer < writers and len(candles) == 10 + writer and (candles.close == writer).all()
+    assert covered_from == candles.open_time[0]
+    assert os.listdir(os.path.dirname(path)) == [os.path.basename(path)], "Temp files were left behind"
+
+def test_concurrent_writers():
+    """Threads and processes saving the same symbol at once never fail or leave a mixed file"""
+    writers = 8
+    with tempfile.TemporaryDirectory() as root:
+        path = CandleDirectory(root).path("BTCUSDT")
+        with ThreadPoolExecutor(writers) as pool:
+            for result in [pool.submit(write_repeatedly, path, writer) for writer in range(writers)]:
+                result.result()
+        check_written(path, writers)
+
+        processes = [multiprocessing.Process(target=write_repeatedly, args=(path, writer)) for writer in range(writers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        assert all(process.exitcode == 0 for process in processes), "A writer process failed"
+        check_written(path, writers)
+
+def test_slicing_and_extension():
+    """Any days window is served from one series, fetching only missing history"""
+    asyncio.run(check_slicing_and_extension())
+
+def test_tail_top_up():
+    """Expired series re-fetch only from the last candle"""
+    asyncio.run(check_tail_top_up())
+
+def test_stale_while_revalidate():
+    """Stale series are served while one background top-up runs after each candle close"""
+    asyncio.run(check_stale_while_revalidate())
+
+def test_shared_refresh():
+    """Processes sharing a kline directory reuse each other's refreshes"""
+    with tempfile.TemporaryDirectory() as root:
+        asyncio.run(check_shared_refresh(root))
+
+def test_lru_eviction():
+    """Whole symbols are evicted LRU-first beyond the memory budget"""
+    asyncio.run(check_lru_eviction())
+
+def test_persistence():
+    """Candles survive a restart, are served offline and are checksummed"""
+    with tempfile.TemporaryDirectory() as root:
+        asyncio.run(check_persistence(root))
+
+def test_bookkeeping_bounded():
+    """Failed and unknown symbols leave no locks or refresh tasks behind"""
+    asyncio.run(check_bookkeeping_bounded())
+
+def test_symbol_paths():
+    """Symbols that are not plain tickers never become paths, on disk or through the history routes"""
+    from fastapi import HTTPException
+    from starlette.requests import Request
+    from routes.binance_data import history_response
+
+    with tempfile.TemporaryDirectory() as root:
+        outside = os.path.join(root, "SECRET.csv")
+        with open(outside, "w") as f:
+            f.write("timestamp,Open,High,Low,Close,Volume,Quote_asset_volume,Number_of_trades\n")
+        directory = CandleDirectory(os.path.join(root, "klines"), seed_dir=os.path.join(root, "data"))
+        assert directory.path("BTCUSDT").endswith("BTCUSDT_1d.bin")
+        for symbol in ["../SECRET", "../../etc/passwd", "btc/../x", "BTC USDT"]:
+            for call in (directory.path, directory.load, directory.remove):
+                try:
+                    call(symbol)
+                    raise AssertionError(f"{symbol!r} reached the file system through {call.__name__}")
+                except ValueError:
+                    pass
+        assert os.path.exists(outside)
+
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""})
+    try:
+        asyncio.run(history_response(request, "../../../../tmp/SECRET", 5, "1d"))
+        raise AssertionError("Traversal reached the history route's cache")
+    except HTTPException as e:
+        assert e.status_code == 400
+
+def main():
+    """Run all kline store tests"""
+    print("🗃️ Testing kline store...")
+
+    tests = [
+        ("Slicing And Extension", test_slicing_and_extension),
+        ("Tail Top-up", test_tail_top_up),
+        ("Stale While Revalidate", test_stale_while_revalidate),
+        ("Shared Refresh", test_shared_refresh),
+        ("LRU Eviction", test_lru_eviction),
+        ("Persistence", test_persistence),
+        ("Concurrent Writers", test_concurrent_writers),
+        ("Symbol Paths", test_symbol_paths),
+        ("Bookkeeping Bounded", test_bookkeeping_bounded),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"   ✅ {test_name}")
+            passed += 1
+        except Exception as e:
+            print(f"   ❌ {test_name}: {e}")
+
+    print(f"\nPassed: {passed}/{len(tests)} tests")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
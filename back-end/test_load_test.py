@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for the WebSocket load test and its local Binance stand-in
+"""
+
+import asyncio
+import json
+import subprocess
+import sys
+import os
+import tempfile
+
+import aiohttp
+import websockets
+
+BACK_END = os.path.dirname(os.path.abspath(__file__))
+
+# Add the back-end directory to Python path
+sys.path.append(BACK_END)
+
+from benchmarks.fixtures import today_ms
+from benchmarks.load_test import percentile, split_clients
+from benchmarks.mock_binance import MockBinance
+
+def test_client_mix():
+    """Clients are split by weight without losing any; percentiles use the nearest rank"""
+    print("🧮 Testing client mix...")
+
+    counts = split_clients(1000, {"live-price": 6, "data": 3, "raw-data": 1})
+    assert counts == {"live-price": 600, "data": 300, "raw-data": 100}
+    counts = split_clients(10, {"live-price": 1, "data": 1, "raw-data": 1})
+    assert sum(counts.values()) == 10 and sorted(counts.values()) == [3, 3, 4]
+
+    ordered = list(range(1, 1001))
+    assert percentile(ordered, 0.5) == 500 and percentile(ordered, 0.99) == 990 and percentile(ordered, 0.999) == 999
+    assert percentile([], 0.5) is None
+
+    print("✅ Clients are split as asked")
+    return True
+
+def test_mock_binance():
+    """The stand-in serves current klines and a combined stream that follows SUBSCRIBE"""
+    print("🎭 Testing the Binance stand-in...")
+
+    async def scenario():
+        async with MockBinance(rate=200) as mock:
+            async with aiohttp.ClientSession() as session:
+                params = {"symbol": "ETHUSDT", "interval": "1d", "startTime": today_ms() - 9 * 86_400_000, "limit": 1000}
+                async with session.get(f"{mock.rest_url}/api/v3/klines", params=params) as response:
+                    rows = await response.json()
+                assert len(rows) == 10 and rows[-1][0] == today_ms()
+                params = {"symbol": "BTCUSDT", "interval": "1m", "limit": 5}
+                async with session.get(f"{mock.rest_url}/api/v3/klines", params=params) as response:
+                    rows = await response.json()
+                assert len(rows) == 5 and rows[-1][0] - rows[0][0] == 4 * 60_000, "The most recent klines"
+
+            async with websockets.connect(f"{mock.stream_url}/stream?streams=btcusdt@trade") as ws:
+                mock.start_trading()
+                first = json.loads(await ws.recv())
+                assert first["stream"] == "btcusdt@trade" and first["data"]["s"] == "BTCUSDT"
+                price = float(first["data"]["p"])
+                assert price in mock.sent["BTCUSDT"], "Every trade is traceable by its price"
+
+                await ws.send(json.dumps({"method": "SUBSCRIBE", "params": ["ethusdt@trade"], "id": 1}))
+                streams = set()
+                acknowledged = False
+                for _ in range(50):
+                    message = json.loads(await ws.recv())
+                    if "result" in message:
+                        acknowledged = message == {"result": None, "id": 1}
+                    else:
+                        streams.add(message["stream"])
+                assert acknowledged and streams == {"btcusdt@trade", "ethusdt@trade"}
+                prices = list(mock.sent["ETHUSDT"])
+                assert len(set(prices)) == len(prices)
+                assert mock.latest_before("ETHUSDT", mock.sent["ETHUSDT"][prices[0]]) == mock.sent["ETHUSDT"][prices[0]]
+
+    asyncio.run(scenario())
+    print("✅ The stand-in behaves like Binance")
+    return True
+
+def test_load_run():
+    """A small run serves every endpoint, traces every frame and measures the server"""
+    print("🏋️ Testing a small load run...")
+
+    with tempfile.TemporaryDirectory() as root:
+        output = os.path.join(root, "report.json")
+        command = [sys.executable, "benchmarks/load_test.py", "--clients", "30", "--rate", "20", "--duration", "3",
+                   "--warmup", "1", "--send-interval", "0", "--output", output]
+        result = subprocess.run(command, cwd=BACK_END, capture_output=True, text=True, timeout=180)
+        assert result.returncode == 0, result.stdout + result.stderr
+        with open(output) as f:
+            report = json.load(f)
+
+    for endpoint in ("live-price", "data", "raw-data", "all"):
+        row = report["endpoints"][endpoint]
+        assert row["connected"] == row["clients"] and row["frames_per_second"] > 0, endpoint
+        assert row["latency"]["p50"] is not None and not row["latency_lower_bound"], endpoint
+        assert 0 < row["latency"]["p50"] <= row["latency"]["p99"] <= row["latency"]["p999"] < 5, endpoint
+    assert report["trades_per_second"] > 10
+    if report["server"]["rss_idle"] is not None:
+        print(f"   {report['server']['bytes_per_connection'] / 1024:.0f} KB per connection, "
+              f"p50 {report['endpoints']['all']['latency']['p50'] * 1000:.1f} ms")
+        assert report["server"]["cpu_percent"] > 0
+
+    print("✅ Load run reports latency, throughput, memory and CPU")
+    return True
+
+def main():
+    """Run all load test tests"""
+    tests = [
+        ("Client Mix", test_client_mix),
+        ("Mock Binance", test_mock_binance),
+        ("Load Run", test_load_run),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except Exception as e:
+            print(f"❌ FAIL {test_name}: {e}")
+
+    print(f"\nPassed: {passed}/{len(tests)} tests")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script for the metrics registry, the Prometheus text output and the hot-path instrumentation
+"""
+
+import asyncio
+import sys
+import os
+import time
+import timeit
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core import metrics
+from core.metrics import Counter, Gauge, Histogram
+from services import outbox as outbox_module
+from services.outbox import Outbox
+
+def test_exposition_format():
+    """Counters, gauges and cumulative histogram buckets render in the Prometheus text format"""
+    print("📈 Testing exposition format...")
+
+    trades = Counter("test_trades_total", "Trades", ["symbol"])
+    trades.labels("BTCUSDT").inc()
+    trades.labels("BTCUSDT").inc(2)
+    Gauge("test_depth", "Depth", ["endpoint"], collect=lambda: {("live-price",): 3})
+    latency = Histogram("test_latency_seconds", "Latency", buckets=(0.01, 0.1))
+    for value in (0.005, 0.01, 0.05, 2.0):
+        latency.observe(value)
+
+    text = metrics.render()
+    assert "# TYPE test_trades_total counter" in text
+    assert 'test_trades_total{symbol="BTCUSDT"} 3\n' in text
+    assert 'test_depth{endpoint="live-price"} 3\n' in text
+    assert 'test_latency_seconds_bucket{le="0.01"} 2\n' in text, "Bounds are inclusive"
+    assert 'test_latency_seconds_bucket{le="0.1"} 3\n' in text
+    assert 'test_latency_seconds_bucket{le="+Inf"} 4\n' in text
+    assert "test_latency_seconds_count 4\n" in text
+
+    try:
+        Counter("test_trades_total", "Registered twice")
+        raise AssertionError("Duplicate metric names must be rejected")
+    except ValueError:
+        pass
+
+    print("✅ Metrics render in the Prometheus format")
+    return True
+
+def test_update_cost():
+    """Updating a counter or histogram costs nanoseconds, not microseconds"""
+    print("⏱️ Testing update cost...")
+
+    counter = Counter("test_cost_total", "Cost", ["symbol"])
+    histogram = Histogram("test_cost_seconds", "Cost")
+    rounds = 200_000
+    inc_ns = min(timeit.repeat(lambda: counter.labels("BTCUSDT").inc(), number=rounds, repeat=3)) / rounds * 1e9
+    observe_ns = min(timeit.repeat(lambda: histogram.observe(0.003), number=rounds, repeat=3)) / rounds * 1e9
+    print(f"   labelled inc: {inc_ns:.0f} ns, observe: {observe_ns:.0f} ns")
+    assert inc_ns < 2000 and observe_ns < 2000
+
+    print("✅ Metric updates are cheap")
+    return True
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, frame):
+        self.sent.append(frame)
+
+def test_outbox_metrics():
+    """Outboxes count conflated updates and record the delay from trade to send"""
+    print("📬 Testing outbox instrumentation...")
+
+    async def scenario():
+        conflated = outbox_module.CONFLATED._default.value
+        sends = outbox_module.TRADE_TO_SEND._default.count
+        websocket = FakeWebSocket()
+        outbox = Outbox(websocket, interval=0.05)
+
+        received = time.monotonic()
+        outbox.offer("BTC", "first", received)
+        await asyncio.sleep(0.01)  # The first frame goes out at once, opening the throttle window
+        outbox.offer("BTC", "second", received)
+        outbox.offer("BTC", "third", received)
+        await asyncio.sleep(0.1)
+        outbox.close()
+
+        assert websocket.sent == ["first", "third"]
+        assert outbox_module.CONFLATED._default.value == conflated + 1
+        assert outbox_module.TRADE_TO_SEND._default.count == sends + 2
+
+    asyncio.run(scenario())
+    print("✅ Outboxes are instrumented")
+    return True
+
+def main():
+    """Run all metrics tests"""
+    tests = [
+        ("Exposition Format", test_exposition_format),
+        ("Update Cost", test_update_cost),
+        ("Outbox Metrics", test_outbox_metrics),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except Exception as e:
+            print(f"❌ FAIL {test_name}: {e}")
+
+    print(f"\nPassed: {passed}/{len(tests)} tests")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
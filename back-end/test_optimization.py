@@ -3,6 +3,7 @@
 Test script to verify the optimization strategy is working correctly
 """
 
+import asyncio
 import time
 import sys
 import os
@@ -11,7 +12,8 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from utils.binance_data import api_to_df, get_cache_info, clear_cache
-from services.live_data import price_store, volume_store
+from services.live_data import price_store
+from services.rolling_stats import RollingStats
 from services.technical_analysis import calculate_indicators
 
 def test_cache_performance():
@@ -23,12 +25,12 @@ def test_cache_performance():
     
     # First call - should be slow (API call)
     start_time = time.time()
-    df1 = api_to_df("BTCUSDT", 90)
+    df1 = asyncio.run(api_to_df("BTCUSDT", 90))
     first_call_time = time.time() - start_time
     
     # Second call - should be fast (cached)
     start_time = time.time()
-    df2 = api_to_df("BTCUSDT", 90)
+    df2 = asyncio.run(api_to_df("BTCUSDT", 90))
     second_call_time = time.time() - start_time
     
     print(f"   First call (API): {first_call_time:.3f}s")
@@ -53,7 +55,7 @@ def test_live_price_integration():
     price_store["btcusdt"] = test_price
     
     # Get indicators with live price
-    result = calculate_indicators("BTCUSDT", days=30)
+    result = asyncio.run(calculate_indicators("BTCUSDT", days=30))
     
     print(f"   Live price set to: ${test_price:,.2f}")
     print(f"   Indicators calculated successfully")
@@ -83,19 +85,21 @@ def test_cache_info():
     return True
 
 def test_volume_tracking():
-    """Test that volume tracking is working"""
+    """Test that rolling 24h volume follows the trade stream"""
     print("\n📊 Testing Volume Tracking...")
 
-    # Simulate volume data
-    test_volume = 1000.0
-    volume_store["btcusdt"] = test_volume
-    price_store["btcusdt"] = 50000.0
+    # Simulate trades, the first one just over 24h before the last
+    stats = RollingStats()
+    now_ms = int(time.time() * 1000)
+    stats.add_trade(49000.0, 5.0, now_ms - 24 * 3600 * 1000 - 60_000)
+    stats.add_trade(50000.0, 1000.0, now_ms - 3600 * 1000)
+    stats.add_trade(51000.0, 2.0, now_ms)
 
-    # Get indicators with volume
-    result = calculate_indicators("BTCUSDT", days=30)
+    snapshot = stats.snapshot(now_ms)
+    assert snapshot["volume"] == 1002.0, "Trades older than 24h should drop out"
+    assert snapshot["open"] == 50000.0 and snapshot["high"] == 51000.0
 
-    print(f"   Live volume set to: {test_volume}")
-    print(f"   Volume tracking integrated")
+    print(f"   Rolling 24h volume: {snapshot['volume']}")
     print(f"   ✅ Volume tracking working")
 
     return True
@@ -106,11 +110,11 @@ def test_data_validation():
 
     # Set a reasonable price first
     price_store["btcusdt"] = 50000.0
-    result1 = calculate_indicators("BTCUSDT", days=30)
+    result1 = asyncio.run(calculate_indicators("BTCUSDT", days=30))
 
     # Now set an unreasonable price (should be rejected)
     price_store["btcusdt"] = 1000000.0  # Way too high
-    result2 = calculate_indicators("BTCUSDT", days=30)
+    result2 = asyncio.run(calculate_indicators("BTCUSDT", days=30))
 
     print("   Set unreasonable price (should be rejected)")
     print("   ✅ Data validation working")
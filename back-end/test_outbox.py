@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-connection send queue
+"""
+
+import asyncio
+import sys
+import os
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.outbox import Outbox
+
+class InstantWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, frame):
+        self.sent.append(frame)
+
+def test_close_during_send():
+    """Closing while a send completes stops the writer, even when wait_for swallows the cancellation"""
+    print("🛑 Testing close during a send...")
+
+    async def scenario():
+        outbox = Outbox(InstantWebSocket(), interval=0, policy="disconnect")
+        outbox.offer("BTC", "frame")
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)  # The writer is now inside wait_for, whose send has already completed
+        outbox.close()
+        await asyncio.sleep(0.01)
+        assert outbox._task.done(), "writer task leaked after close"
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+    print("✅ Writer stops on close")
+    return True
+
+def main():
+    """Run all outbox tests"""
+    tests = [
+        ("Close During Send", test_close_during_send),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except Exception as e:
+            print(f"❌ FAIL {test_name}: {e}")
+
+    print(f"\nPassed: {passed}/{len(tests)} tests")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test script for building live WebSocket updates once per trade and sharing them
+"""
+
+import asyncio
+import contextlib
+import io
+import sys
+import os
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services import live_data, publisher
+from services.live_data import flush_updates, handle_trade, price_store
+from services.subscriptions import add_connection, remove_connection
+
+class RecordingWebSocket:
+    """A connected client that keeps every frame it is sent"""
+
+    def __init__(self):
+        self.frames = []
+
+    async def send_text(self, frame):
+        self.frames.append(frame)
+
+    async def send_bytes(self, frame):
+        self.frames.append(frame)
+
+    async def close(self, code=1000):
+        pass
+
+def make_trade(symbol, price, trade_id):
+    return {"e": "trade", "s": symbol, "t": trade_id, "p": f"{price:.2f}", "q": "0.5", "T": 1_750_000_000_000 + trade_id}
+
+@contextlib.contextmanager
+def indicator_rows(row):
+    """Serve ``row(ticker)`` as the live indicator row, with a fixed kline cache version"""
+    live_indicator_row, get_cache_version = publisher.live_indicator_row, publisher.get_cache_version
+    publisher.live_indicator_row = lambda ticker, days: row(ticker)
+    publisher.get_cache_version = lambda ticker, days: 1
+    try:
+        yield
+    finally:
+        publisher.live_indicator_row, publisher.get_cache_version = live_indicator_row, get_cache_version
+        publisher._frames.clear()
+
+@contextlib.contextmanager
+def subscribed(clients, symbol, endpoint):
+    with contextlib.redirect_stdout(io.StringIO()):  # One log line per connection
+        for client in clients:
+            add_connection(client, [symbol], endpoint)
+    try:
+        yield
+    finally:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for client in clients:
+                remove_connection(client)
+
+async def delivered(clients, count=1):
+    """Wait until every client holds ``count`` frames"""
+    for _ in range(200):
+        if all(len(client.frames) >= count for client in clients):
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("Frames were not delivered")
+
+def test_frame_shared():
+    """Each trade's frame is computed once and the same frame goes to every subscriber"""
+    print("📣 Testing shared frames...")
+
+    calls = []
+
+    async def row(ticker):
+        calls.append(ticker)
+        return {"Close": price_store[ticker.lower()]}
+
+    async def scenario():
+        clients = [RecordingWebSocket() for _ in range(50)]
+        with indicator_rows(row), subscribed(clients, "BTC", "data"):
+            await handle_trade(make_trade("BTCUSDT", 65000.0, 1))
+            await flush_updates()
+            await delivered(clients)
+
+        assert calls == ["BTCUSDT"], f"One build for 50 subscribers, got {len(calls)}"
+        frame = clients[0].frames[0]
+        assert "65000" in frame and all(client.frames == [frame] for client in clients)
+        assert all(client.frames[0] is frame for client in clients), "Subscribers share one encoded frame"
+
+    asyncio.run(scenario())
+    print("   ✅ One build per trade, shared by every subscriber")
+    return True
+
+def test_builds_off_receive_loop():
+    """A slow build neither holds up trade ingest nor queues stale builds behind it"""
+    print("\n🧵 Testing builds off the receive loop...")
+
+    release = None
+    built = []
+
+    async def row(ticker):
+        price = price_store[ticker.lower()]
+        if ticker == "ETHUSDT":
+            await release.wait()  # A kline cache miss going to REST
+        built.append((ticker, price))
+        return {"Close": price}
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        eth, btc = [RecordingWebSocket()], [RecordingWebSocket()]
+        with indicator_rows(row), subscribed(eth, "ETH", "data"), subscribed(btc, "BTC", "live-price"):
+            await handle_trade(make_trade("ETHUSDT", 3000.0, 1))
+            await asyncio.sleep(0)  # The ETH build starts and blocks
+
+            # Ingest goes on while it is blocked: BTC is delivered, ETH trades only update the price
+            for trade_id in range(2, 7):
+                await asyncio.wait_for(handle_trade(make_trade("ETHUSDT", 3000.0 + trade_id, trade_id)), 0.1)
+            await asyncio.wait_for(handle_trade(make_trade("BTCUSDT", 65000.0, 7)), 0.1)
+            await delivered(btc)
+            assert "65000" in btc[0].frames[0] and built == [] and list(live_data._builders) == [("ETH", "data")]
+
+            release.set()
+            await flush_updates()
+            await delivered(eth)
+
+        assert built == [("ETHUSDT", 3000.0), ("ETHUSDT", 3006.0)], f"The blocked build, then the newest trade: {built}"
+        assert not live_data._builders and not live_data._latest_trades
+
+    asyncio.run(scenario())
+    print("   ✅ Trades ingested while a build waits; only the newest trade is built next")
+    return True
+
+def main():
+    """Run all publisher tests"""
+    tests = [
+        ("Shared Frames", test_frame_shared),
+        ("Builds Off Receive Loop", test_builds_off_receive_loop),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except Exception as e:
+            print(f"❌ FAIL {test_name}: {e}")
+
+    print(f"\nPassed: {passed}/{len(tests)} tests")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script to verify rolling 24h statistics against a direct recomputation
+"""
+
+import asyncio
+import math
+import random
+import sys
+import os
+import time
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services import rolling_stats
+from services.rolling_stats import RollingStats, MINUTE_MS, WINDOW_MINUTES
+from services.stream_manager import streams
+
+def direct_stats(trades, now_ms):
+    """Stats over the trades in the 24h window ending at now_ms"""
+    cutoff = now_ms - now_ms % MINUTE_MS - (WINDOW_MINUTES - 1) * MINUTE_MS
+    window = [trade for trade in trades if trade[2] >= cutoff]
+    prices = [price for price, _, _ in window]
+    return {
+        "open": prices[0],
+        "high": max(prices),
+        "low": min(prices),
+        "close": prices[-1],
+        "volume": math.fsum(quantity for _, quantity, _ in window),
+        "trades": len(window),
+    }
+
+def test_matches_direct():
+    """O(1) rolling updates agree with recomputing the window from scratch"""
+    print("📈 Testing rolling 24h window...")
+
+    rng = random.Random(4)
+    trade_time = 1_700_000_000_000
+    trades = []
+    stats = RollingStats()
+    for count in range(1, 30001):
+        trade_time += rng.choice([100, 2_000, 30_000, 400_000])
+        trade = (round(rng.uniform(90, 110), 2), round(rng.uniform(0.01, 3), 3), trade_time)
+        trades.append(trade)
+        stats.add_trade(*trade)
+
+        if count % 499 == 0:
+            snapshot = stats.snapshot(trade_time)
+            expected = direct_stats(trades, trade_time)
+            for key in ["open", "high", "low", "close", "trades"]:
+                assert snapshot[key] == expected[key], f"{key}: {snapshot[key]} != {expected[key]}"
+            assert math.isclose(snapshot["volume"], expected["volume"], rel_tol=1e-9)
+
+    print("   ✅ Rolling stats identical to recomputation")
+    return True
+
+def test_window_slides_without_trades():
+    """Reading after a quiet period still drops the expired minutes"""
+    print("\n⏳ Testing expiry on read...")
+
+    stats = RollingStats()
+    start = 1_700_000_000_000
+    stats.add_bucket([start, 100.0, 120.0, 90.0, 110.0, 5.0, 500.0, 10])
+    stats.add_trade(105.0, 1.0, start + 12 * 3600 * 1000)
+
+    assert stats.snapshot(start + 23 * 3600 * 1000)["high"] == 120.0
+    snapshot = stats.snapshot(start + 25 * 3600 * 1000)
+    assert snapshot["high"] == 105.0 and snapshot["volume"] == 1.0 and snapshot["open"] == 105.0
+    assert stats.snapshot(start + 40 * 3600 * 1000) is None, "An empty window has no stats"
+
+    print("   ✅ Expired minutes dropped on read")
+    return True
+
+def test_outside_universe_not_kept():
+    """Symbols that stream are seeded once; others are read from REST at most once per FETCHED_TTL"""
+    print("\n🌐 Testing symbols outside the universe...")
+
+    requests = []
+
+    async def get_historical_klines(symbol, interval, start_ms=None, end_ms=None):
+        requests.append(symbol)
+        open_time = int(time.time() * 1000) // MINUTE_MS * MINUTE_MS
+        return [[open_time, "100.0", "110.0", "90.0", "105.0", "2.0", 0, "210.0", 7]]
+
+    async def scenario():
+        for _ in range(2):
+            assert (await rolling_stats.get_rolling_stats("BTCUSDT"))["close"] == 105.0
+            stats = await asyncio.gather(*(rolling_stats.get_rolling_stats("SOLUSDT") for _ in range(5)))
+            assert all(entry["close"] == 105.0 for entry in stats)
+        assert requests == ["BTCUSDT", "SOLUSDT"], "Repeated reads share one REST call"
+
+        # Once the reused window is too old it is read again
+        fetched_at, window = rolling_stats._fetched["SOLUSDT"]
+        rolling_stats._fetched["SOLUSDT"] = (fetched_at - rolling_stats.FETCHED_TTL, window)
+        assert (await rolling_stats.get_rolling_stats("SOLUSDT"))["close"] == 105.0
+
+    original = rolling_stats.seeds.get_historical_klines
+    rolling_stats.seeds.get_historical_klines = get_historical_klines
+    streams.configure(["BTCUSDT"], [])
+    try:
+        asyncio.run(scenario())
+    finally:
+        rolling_stats.seeds.get_historical_klines = original
+        streams.universe = None
+        for symbol in ("BTCUSDT", "SOLUSDT"):
+            rolling_stats.forget(symbol)
+        rolling_stats._fetched.clear()
+
+    assert requests == ["BTCUSDT", "SOLUSDT", "SOLUSDT"], requests
+    assert "SOLUSDT" not in rolling_stats.rolling_volumes(), "A window nothing updates must not be kept"
+
+    print("   ✅ Only streamed symbols are kept")
+    return True
+
+def main():
+    """Run all rolling stats tests"""
+    tests = [
+        ("Rolling Window", test_matches_direct),
+        ("Expiry On Read", test_window_slides_without_trades),
+        ("Outside Universe", test_outside_universe_not_kept),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except Exception as e:
+            print(f"❌ FAIL {test_name}: {e}")
+
+    print(f"\nPassed: {passed}/{len(tests)} tests")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that importing and starting the app is lazy: no network calls,
+no heavy optional modules, and a lifespan that doesn't wait on Binance
+"""
+
+import subprocess
+import sys
+import os
+
+BACK_END = os.path.dirname(os.path.abspath(__file__))
+
+# Each check runs in a fresh interpreter, so modules imported by other tests don't count
+IMPORT_CHECK = """
+import socket, sys
+
+connections = []
+def refuse(self, address):
+    connections.append(address)
+    raise OSError("network disabled at import")
+socket.socket.connect = refuse
+
+import main
+from core.startup import boot
+
+assert not connections, f"import opened connections: {connections}"
+loaded = [name for name in ("pandas", "aiohttp") if name in sys.modules]
+assert not loaded, f"imported eagerly: {loaded}"
+assert boot["import_ms"] is not None
+"""
+
+LIFESPAN_CHECK = """
+import asyncio, time
+import services.live_data as live_data
+import utils.binance_rest as binance_rest
+
+async def unreachable(*args, **kwargs):
+    await asyncio.sleep(3600)  # Binance never answers
+
+live_data.load_universe = unreachable
+binance_rest.client._get = unreachable
+
+from main import app
+from core.lifespan import lifespan
+from core.startup import boot
+
+async def scenario():
+    started = time.perf_counter()
+    async with lifespan(app):
+        assert time.perf_counter() - started < 0.5, "startup waited on the network"
+        assert boot["ready_ms"] is not None
+
+asyncio.run(scenario())
+"""
+
+def run_check(source):
+    env = {**os.environ, "KLINE_DATA_DIR": "", "EXECUTOR_PROCESSES": "0"}
+    result = subprocess.run([sys.executable, "-c", source], cwd=BACK_END, env=env, capture_output=True, text=True, timeout=20)
+    assert result.returncode == 0, result.stderr.strip().splitlines()[-1]
+
+def test_lazy_import():
+    """Importing main opens no connection and leaves pandas and aiohttp unloaded"""
+    print("📦 Testing import side effects...")
+
+    run_check(IMPORT_CHECK)
+
+    print("✅ Import is network-free and lazy")
+    return True
+
+def test_startup_without_network():
+    """The lifespan yields at once even when Binance doesn't answer"""
+    print("🚀 Testing startup without Binance...")
+
+    run_check(LIFESPAN_CHECK)
+
+    print("✅ Startup doesn't wait on the network")
+    return True
+
+def main():
+    """Run all startup tests"""
+    tests = [
+        ("Lazy Import", test_lazy_import),
+        ("Startup Without Network", test_startup_without_network),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except Exception as e:
+            print(f"❌ FAIL {test_name}: {e}")
+
+    print(f"\nPassed: {passed}/{len(tests)} tests")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
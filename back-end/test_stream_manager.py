@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Test script to verify stream sharding, watch/expiry bookkeeping, shard reconnects and the price book
+"""
+
+import asyncio
+import contextlib
+import io
+import sys
+import os
+import time
+
+import websockets
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarks.mock_binance import MockBinance
+from services import stream_manager
+from services.price_book import PriceBook
+from services.stream_manager import StreamManager, StreamShard, stream_name
+from services.universe import parse_assets
+
+def test_sharding():
+    """Streams fill shards up to their capacity and open a new shard only when all are full"""
+    print("🧩 Testing stream sharding...")
+
+    manager = StreamManager(capacity=3, idle_ttl=60)
+    tickers = [f"C{index}USDT" for index in range(7)]
+    for ticker in tickers:
+        manager._add(ticker)
+
+    assert [len(shard.streams) for shard in manager.shards] == [3, 3, 1]
+    assert manager.streaming() == sorted(tickers)
+    assert stream_name("C0USDT") in manager.shards[0].streams
+
+    # A freed slot is reused before a new shard is opened
+    manager._remove("C1USDT")
+    manager._add("C7USDT")
+    assert [len(shard.streams) for shard in manager.shards] == [3, 3, 1]
+    assert stream_name("C7USDT") in manager.shards[0].streams
+
+    print("✅ Streams shard by capacity")
+    return True
+
+def test_watch_expiry():
+    """Watched symbols stream until idle_ttl after the last viewer leaves; pinned ones never stop"""
+    print("⏱️ Testing watch/unwatch expiry...")
+
+    async def scenario():
+        removed = []
+        manager = StreamManager(capacity=10, idle_ttl=0.05)
+        manager.configure(["BTCUSDT", "ETHUSDT", "SOLUSDT"], ["BTCUSDT", "DOGEUSDT"])
+        manager.on_removed = removed.append
+        assert manager.pinned == {"BTCUSDT"}  # Pins outside the universe are ignored
+
+        manager.watch("DOGEUSDT")  # Not in the universe
+        manager.watch("BTCUSDT")
+        manager.watch("ETHUSDT")
+        manager.watch("ETHUSDT")
+        assert manager.streaming() == ["BTCUSDT", "ETHUSDT"]
+
+        manager.unwatch("ETHUSDT")
+        manager.unwatch("BTCUSDT")
+        await asyncio.sleep(0.1)
+        assert manager.streaming() == ["BTCUSDT", "ETHUSDT"], "one viewer is still watching"
+
+        manager.unwatch("ETHUSDT")
+        manager.touch("SOLUSDT")
+        assert manager.streaming() == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+
+        # Watching again before the timer fires keeps the stream
+        manager.watch("ETHUSDT")
+        await asyncio.sleep(0.1)
+        assert manager.streaming() == ["BTCUSDT", "ETHUSDT"]
+        assert removed == ["SOLUSDT"]
+
+        manager.unwatch("ETHUSDT")
+        await asyncio.sleep(0.1)
+        assert manager.streaming() == ["BTCUSDT"]
+        assert removed == ["SOLUSDT", "ETHUSDT"]
+
+    asyncio.run(scenario())
+    print("✅ Streams expire only when unwatched and unpinned")
+    return True
+
+def test_price_book():
+    """The array-backed price book reads like the dict it replaces"""
+    print("💵 Testing price book...")
+
+    book = PriceBook(["btcusdt", "ethusdt"], capacity=2)
+    book.record_trade("btcusdt", 65000.5, 1_700_000_000_000)
+    book["solusdt"] = 150.0  # Registers a new symbol, growing the arrays
+    book["dogeusdt"] = 0.1
+
+    assert len(book) == 4 and list(book) == ["btcusdt", "ethusdt", "solusdt", "dogeusdt"]
+    assert book["btcusdt"] == 65000.5 and book.get("ethusdt") == 0.0
+    assert book.get("xrpusdt") is None
+    assert int(book.trade_times[book.symbol_id("btcusdt")]) == 1_700_000_000_000
+    assert book.live_prices() == {"btcusdt": 65000.5, "solusdt": 150.0, "dogeusdt": 0.1}
+
+    print("✅ Price book matches dict semantics")
+    return True
+
+def test_parse_assets():
+    """Universe lists accept base assets or USDT tickers, deduplicated in order"""
+    print("📋 Testing universe parsing...")
+
+    assert parse_assets("BTC, eth,ADAUSDT,,BTCUSDT") == ["BTC", "ETH", "ADA"]
+    assert parse_assets("") == []
+
+    print("✅ Universe lists parse")
+    return True
+
+@contextlib.contextmanager
+def shard_settings(**values):
+    """Override the stream_manager settings (BINANCE_STREAM_URL, INGEST_*) for one test"""
+    saved = {name: getattr(stream_manager, name) for name in values}
+    for name, value in values.items():
+        setattr(stream_manager, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(stream_manager, name, value)
+
+class NoJitter:
+    """Reconnect delays without the random jitter, so the backoff itself is measured"""
+
+    @staticmethod
+    def uniform(low, high):
+        return 1.0
+
+async def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out"
+        await asyncio.sleep(0.01)
+
+def test_shard_reconnect():
+    """A shard whose connection is dropped reconnects and resumes its streams"""
+    print("\n🔌 Testing shard reconnect...")
+
+    async def scenario():
+        async with MockBinance(rate=200) as mock:
+            trades = []
+
+            async def on_message(payload):
+                trades.append(payload)
+
+            shard = StreamShard(0, on_message)
+            with shard_settings(BINANCE_STREAM_URL=mock.stream_url, INGEST_MIN_BACKOFF=0.05), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                shard.add(stream_name("BTCUSDT"))
+                shard.start()
+                mock.start_trading()
+                await wait_until(lambda: len(trades) >= 10)
+                assert shard.state["status"] == "connected" and shard.state["reconnects"] == 0
+
+                for ws in list(mock.connections):
+                    await ws.close()
+                await wait_until(lambda: shard.state["reconnects"] == 1)
+                assert shard.state["last_error"] is not None
+
+                received = len(trades)
+                await wait_until(lambda: len(trades) >= received + 10 and shard.state["status"] == "connected")
+                assert list(mock.connections.values()) == [{"btcusdt@trade"}], "Streams subscribed again on reconnect"
+                assert {trade["s"] for trade in trades} == {"BTCUSDT"}
+                await shard.stop()
+            assert shard.state["status"] == "stopped"
+
+    asyncio.run(scenario())
+    print("✅ Shard reconnects and resumes")
+    return True
+
+def test_shard_backoff():
+    """Failed sessions are retried after exponentially growing delays, capped at the maximum"""
+    print("\n⏳ Testing reconnect backoff...")
+
+    attempts = []
+
+    async def refuse(connection):
+        attempts.append(time.monotonic())  # Accept, then close at once
+
+    async def scenario():
+        async with websockets.serve(refuse, "127.0.0.1", 0) as server:
+            url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+            async def on_message(payload):
+                pass
+
+            shard = StreamShard(0, on_message)
+            with shard_settings(BINANCE_STREAM_URL=url, INGEST_MIN_BACKOFF=0.1, INGEST_MAX_BACKOFF=0.4,
+                                random=NoJitter), contextlib.redirect_stdout(io.StringIO()):
+                shard.add(stream_name("BTCUSDT"))
+                shard.start()
+                await wait_until(lambda: len(attempts) >= 6)
+                await shard.stop()
+
+    asyncio.run(scenario())
+    gaps = [later - earlier for earlier, later in zip(attempts, attempts[1:])]
+    print(f"   gaps {', '.join(f'{gap:.2f}s' for gap in gaps)}")
+    for gap, expected in zip(gaps, [0.1, 0.2, 0.4, 0.4, 0.4]):
+        assert expected - 0.01 <= gap < expected + 0.15, f"Expected about {expected}s between attempts, got {gap:.2f}s"
+
+    print("✅ Backoff doubles up to the cap")
+    return True
+
+def test_shard_stall():
+    """A quiet but healthy shard stays connected; one whose peer stops answering pings is replaced"""
+    print("\n🧊 Testing stall detection...")
+
+    released = None
+
+    async def unresponsive(connection):
+        connection.transport.pause_reading()  # Pings are never read, so never answered
+        await released.wait()
+        connection.transport.abort()
+
+    async def scenario():
+        async with MockBinance(rate=200) as mock:
+            trades = []
+
+            async def on_message(payload):
+                trades.append(payload)
+
+            shard = StreamShard(0, on_message)
+            with shard_settings(BINANCE_STREAM_URL=mock.stream_url, INGEST_PING_INTERVAL=0.05, INGEST_STALL_TIMEOUT=0.2,
+                                INGEST_MIN_BACKOFF=0.05), contextlib.redirect_stdout(io.StringIO()):
+                shard.add(stream_name("ETHUSDT"))
+                shard.start()
+                # Connected, but nothing trades: several stall timeouts pass without a reconnect
+                await wait_until(lambda: shard.state["status"] == "connected")
+                await asyncio.sleep(1.0)
+                assert shard.state["reconnects"] == 0 and shard.state["status"] == "connected" and trades == []
+
+                mock.start_trading()
+                await wait_until(lambda: len(trades) >= 10)
+                assert shard.state["reconnects"] == 0
+                await shard.stop()
+
+        nonlocal released
+        released = asyncio.Event()
+        async with websockets.serve(unresponsive, "127.0.0.1", 0) as server:
+            url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+            shard = StreamShard(0, on_message)
+            with shard_settings(BINANCE_STREAM_URL=url, INGEST_PING_INTERVAL=0.05, INGEST_STALL_TIMEOUT=0.2,
+                                INGEST_MIN_BACKOFF=0.05), contextlib.redirect_stdout(io.StringIO()):
+                shard.add(stream_name("ETHUSDT"))
+                started = time.monotonic()
+                shard.start()
+                try:
+                    await wait_until(lambda: shard.state["reconnects"] >= 1)
+                    elapsed, error = time.monotonic() - started, shard.state["last_error"]
+                finally:
+                    await shard.stop()
+                    released.set()
+            assert elapsed < 1.0 and "ping" in error, f"{elapsed:.2f}s: {error}"
+
+    asyncio.run(scenario())
+    print("✅ Quiet shards kept, unresponsive connections replaced")
+    return True
+
+def main():
+    """Run all stream manager tests"""
+    tests = [
+        ("Sharding", test_sharding),
+        ("Watch Expiry", test_watch_expiry),
+        ("Shard Reconnect", test_shard_reconnect),
+        ("Shard Backoff", test_shard_backoff),
+        ("Shard Stall", test_shard_stall),
+        ("Price Book", test_price_book),
+        ("Universe Parsing", test_parse_assets),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except Exception as e:
+            print(f"❌ FAIL {test_name}: {e}")
+
+    print(f"\nPassed: {passed}/{len(tests)} tests")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test script for the WebSocket subscription index and idle connection handling
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import sys
+import os
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services import subscriptions
+from services.subscriptions import add_connection, remove_connection, get_subscribers, subscriber_counts, hold_connection
+from utils.frames import BINARY_FRAMES
+
+class ClientWebSocket:
+    """A connected client whose messages to the server are queued by the test"""
+
+    def __init__(self):
+        self.incoming = asyncio.Queue()
+        self.sent = []
+        self.closed = None
+
+    async def receive(self):
+        return await self.incoming.get()
+
+    async def send_text(self, frame):
+        self.sent.append(frame)
+
+    async def send_bytes(self, frame):
+        self.sent.append(frame)
+
+    async def close(self, code=1000):
+        self.closed = code
+
+@contextlib.contextmanager
+def timeouts(idle, pong):
+    saved = subscriptions.IDLE_TIMEOUT, subscriptions.PONG_TIMEOUT
+    subscriptions.IDLE_TIMEOUT, subscriptions.PONG_TIMEOUT = idle, pong
+    try:
+        yield
+    finally:
+        subscriptions.IDLE_TIMEOUT, subscriptions.PONG_TIMEOUT = saved
+
+def test_index():
+    """Connections are indexed by symbol and feed, and fully removed again"""
+    print("🗂️ Testing subscription index...")
+
+    async def scenario():
+        single, batch, binary = ClientWebSocket(), ClientWebSocket(), ClientWebSocket()
+        with contextlib.redirect_stdout(io.StringIO()):
+            single_outbox = add_connection(single, ["BTC"], "data")
+            batch_outbox = add_connection(batch, ["BTC", "ETH"], "data-batch")
+            binary_outbox = add_connection(binary, ["BTC"], "data", 2, BINARY_FRAMES)
+
+        assert get_subscribers("BTC") == {
+            ("data", 1, "json"): [single_outbox],
+            ("data-batch", 1, "json"): [batch_outbox],
+            ("data", 2, BINARY_FRAMES): [binary_outbox],
+        }
+        assert get_subscribers("ETH") == {("data-batch", 1, "json"): [batch_outbox]}
+        assert subscriber_counts() == {"BTC": {"data": 2, "data-batch": 1}, "ETH": {"data-batch": 1}}
+        assert batch_outbox.size >= 3, "Room for one pending update per symbol"
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            remove_connection(batch)
+            remove_connection(batch)  # Removing twice is harmless
+        assert get_subscribers("ETH") == {} and "ETH" not in subscriptions._by_symbol
+        assert batch_outbox._closed
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            remove_connection(single)
+            remove_connection(binary)
+        assert subscriptions._by_symbol == {} and subscriptions.connections == {}
+
+    asyncio.run(scenario())
+    print("   ✅ Index follows connections in and out")
+    return True
+
+def test_idle_reaping():
+    """A silent client is pinged and released when the pong misses; a live one is kept"""
+    print("\n🏓 Testing ping/pong reaping...")
+
+    async def scenario():
+        silent, alive = ClientWebSocket(), ClientWebSocket()
+        with contextlib.redirect_stdout(io.StringIO()):
+            add_connection(silent, ["BTC"], "live-price")
+            add_connection(alive, ["BTC"], "live-price")
+
+        async def serve(websocket):
+            # As the WebSocket routes do: the connection is released however the hold ends
+            try:
+                await hold_connection(websocket)
+            finally:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    remove_connection(websocket)
+
+        async def answer_pings(websocket):
+            answered = 0
+            while True:
+                await asyncio.sleep(0.01)
+                if websocket.sent.count(subscriptions.PING_MESSAGE) > answered:
+                    answered += 1
+                    await websocket.incoming.put({"type": "websocket.receive", "text": json.dumps({"type": "pong"})})
+
+        with timeouts(idle=0.05, pong=0.05):
+            kept = asyncio.create_task(serve(alive))
+            responder = asyncio.create_task(answer_pings(alive))
+            await asyncio.wait_for(serve(silent), 1.0)
+
+            assert silent.sent == [subscriptions.PING_MESSAGE] and silent.closed == 1001
+            assert silent not in subscriptions.connections and alive in subscriptions.connections
+
+            await asyncio.sleep(0.3)
+            assert not kept.done() and alive.closed is None
+            assert alive.sent.count(subscriptions.PING_MESSAGE) >= 2, "Pinged each time it goes quiet"
+
+            responder.cancel()
+            await alive.incoming.put({"type": "websocket.disconnect", "code": 1000})
+            try:
+                await kept
+                assert False, "A disconnect ends the hold"
+            except subscriptions.WebSocketDisconnect:
+                pass
+        assert subscriptions.connections == {} and subscriptions._by_symbol == {}
+
+    asyncio.run(scenario())
+    print("   ✅ Dead connections reaped, live ones kept")
+    return True
+
+def main():
+    """Run all subscription tests"""
+    tests = [
+        ("Subscription Index", test_index),
+        ("Idle Reaping", test_idle_reaping),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except Exception as e:
+            print(f"❌ FAIL {test_name}: {e}")
+
+    print(f"\nPassed: {passed}/{len(tests)} tests")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script for binary WebSocket frames
+"""
+
+import json
+import math
+import sys
+import os
+
+# Add the back-end directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.delta_feed import DeltaFeed
+from utils.frames import BINARY_FRAMES, decode_frame, encode_message, encode_price, encode_rows
+
+def make_records(count):
+    return [
+        {"timestamp": f"2025-{1 + day // 28:02d}-{1 + day % 28:02d} 00:00:00",
+         "Open": 100.0 + day, "High": 110.0 + day, "Low": 90.0 + day, "Close": 105.0 + day,
+         "Volume": 12345.678, "Quote_asset_volume": 1234567.89, "Number_of_trades": 4321 + day}
+        for day in range(count)
+    ]
+
+def test_price_frame():
+    """Live price frames are a fraction of the JSON size"""
+    print("💲 Testing price frames...")
+
+    frame = encode_price("BTC", 65432.1, 1_750_000_000.25, BINARY_FRAMES)
+    decoded = decode_frame(frame)
+    assert decoded == {"kind": "price", "symbol": "BTC", "price": 65432.1, "timestamp": 1_750_000_000.25}
+
+    text = encode_price("BTC", 65432.1, 1_750_000_000.25)
+    print(f"   JSON {len(text)} bytes, binary {len(frame)} bytes")
+    assert len(frame) < len(text) / 2
+
+    print("   ✅ Price frames working")
+    return True
+
+def test_rows_frame():
+    """Row frames keep every column, compressing large ones"""
+    print("\n🧱 Testing row frames...")
+
+    records = make_records(90)
+    frame = encode_rows(records, BINARY_FRAMES)
+    assert frame[1] & 1, "Large frames should be deflated"
+    columns = decode_frame(frame)["columns"]
+    assert list(columns) == list(records[0])
+    assert columns["Close"].tolist() == [record["Close"] for record in records]
+    assert columns["Number_of_trades"].dtype.kind == "i"
+    assert columns["timestamp"][0] == 1_735_689_600_000
+
+    # Indicator rows may hold None for values not yet defined
+    row = {"timestamp": "2025-01-01 00:00:00", "SMA": None, "RSI": 55.5, "Signal": 1}
+    single = decode_frame(encode_rows([row], BINARY_FRAMES))
+    assert math.isnan(single["columns"]["SMA"][0])
+    assert single["columns"]["Signal"][0] == 1
+
+    print(f"   JSON {len(json.dumps(records))} bytes, binary {len(frame)} bytes")
+    print("   ✅ Row frames working")
+    return True
+
+def test_feed_frames():
+    """Snapshots and deltas round trip through the binary format"""
+    print("\n🔁 Testing snapshot/delta frames...")
+
+    feed = DeltaFeed()
+    records = make_records(90)
+    snapshot = decode_frame(encode_message(feed.update(records), BINARY_FRAMES))
+    assert snapshot["kind"] == "snapshot" and snapshot["seq"] == 1 and len(snapshot["columns"]["Close"]) == 90
+
+    records = records[:-1] + [dict(records[-1], Close=1.0)]
+    message = feed.update(records)
+    frame = encode_message(message, BINARY_FRAMES)
+    delta = decode_frame(frame)
+    assert (delta["seq"], delta["base"]) == (message["seq"], message["base"])
+    assert delta["start"] == 1_735_689_600_000 and delta["columns"]["Close"].tolist() == [1.0]
+
+    print(f"   delta JSON {len(encode_message(message))} bytes, binary {len(frame)} bytes")
+    assert len(frame) < len(encode_message(message))
+    print("   ✅ Feed frames working")
+    return True
+
+def main():
+    """Run all WebSocket frame tests"""
+    tests = [
+        ("Price Frames", test_price_frame),
+        ("Row Frames", test_rows_frame),
+        ("Feed Frames", test_feed_frames),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except Exception as e:
+            print(f"❌ FAIL {test_name}: {e}")
+
+    print(f"\nPassed: {passed}/{len(tests)} tests")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -1,106 +1,110 @@
-from binance.client import Client
-from functools import lru_cache
-from dotenv import load_dotenv
-from utils.date import get_date_days_ago
-import pandas as pd
-import os
-from datetime import datetime, timedelta
 import time
+from dotenv import load_dotenv
+from config.settings import KLINE_CACHE_MAX_BYTES, DATA_DIR, KLINE_DATA_DIR
+from core.executors import blocking
+from core.metrics import Counter, Histogram
+from utils.binance_rest import client, KLINE_INTERVAL_1DAY, INTERVAL_MS
+from utils.candle_file import CandleDirectory, SYMBOL
+from utils.candles import Candles
+from utils.kline_store import KlineStore
+from utils.date import get_timestamp_days_ago
 
 load_dotenv()
 
-# Chaves da API (opcional para dados públicos)
-API_KEY = os.getenv("BINANCE_API_KEY")
-API_SECRET = os.getenv("BINANCE_API_SECRET")
+# One canonical candle series per symbol; any `days` window is a slice of it
+CACHE_DURATION = 86400  # Upper bound; a series also goes stale as soon as its open daily candle closes
+STALE_WHILE_REVALIDATE = 86400  # A series stale for less than this is served while its tail refreshes
+CACHE_MAX_BYTES = KLINE_CACHE_MAX_BYTES
+DEFAULT_DAYS = 90
 
-client = Client(API_KEY, API_SECRET)
+FETCH_SECONDS = Histogram("dashboard_kline_fetch_seconds", "Time to fetch daily candles from Binance")
+FETCH_ERRORS = Counter("dashboard_kline_fetch_errors_total", "Daily candle fetches from Binance that failed")
+Counter("dashboard_binance_requests_total", "REST requests sent to Binance", collect=lambda: {(): client.requests_sent})
 
-# Cache with timestamp for invalidation
-_cache_timestamps = {}
-_cache_data = {}
-CACHE_DURATION = 3600  # 1 hour in seconds
+# Reads daily klines: Binance, or with INGEST_MODE=worker the ingest process (see use_kline_source)
+_source = client
 
-def _get_cache_key(symbol, days):
-    return f"{symbol}_{days}"
+def use_kline_source(source):
+    """Read daily klines through ``source`` (anything with ``get_historical_klines``)"""
+    global _source
+    _source = source
 
-def _is_cache_valid(cache_key):
-    if cache_key not in _cache_timestamps:
-        return False
-    return time.time() - _cache_timestamps[cache_key] < CACHE_DURATION
+async def _fetch_klines(symbol, start_ms, end_ms):
+    # Concurrent fetches for the same range share one request
+    started = time.perf_counter()
+    try:
+        klines = await _source.get_historical_klines(
+            symbol,
+            KLINE_INTERVAL_1DAY,
+            start_ms=start_ms,
+            end_ms=end_ms,
+        )
+    except Exception:
+        FETCH_ERRORS.inc()
+        raise
+    FETCH_SECONDS.observe(time.perf_counter() - started)
+    return Candles.from_klines(klines)
+
+# Candles persist across restarts; data/{SYMBOL}.csv seeds a symbol that has no file yet
+_disk = CandleDirectory(KLINE_DATA_DIR, KLINE_INTERVAL_1DAY, seed_dir=DATA_DIR) if KLINE_DATA_DIR else None
+_store = KlineStore(
+    _fetch_klines, max_age=CACHE_DURATION, max_bytes=CACHE_MAX_BYTES, disk=_disk, run_blocking=blocking.run,
+    interval_ms=INTERVAL_MS[KLINE_INTERVAL_1DAY], stale_while_revalidate=STALE_WHILE_REVALIDATE,
+)
+
+# hit: fresh in memory, stale: served while refreshing, disk: loaded from the candle files, miss: went upstream
+Counter("dashboard_kline_lookups_total", "Daily candle reads by where the candles came from", ["result"],
+        collect=lambda: {(result,): count for result, count in _store.lookups.items()})
+
+def _checked(symbol):
+    # The store keeps a lock per symbol it is asked for: only tickers get one
+    if not isinstance(symbol, str) or SYMBOL.fullmatch(symbol) is None:
+        raise ValueError(f"Invalid symbol: {symbol!r}")
+    return symbol
+
+def get_cache_version(symbol, days: int | None = None):
+    """Version of the cached candles for symbol/days, or None if they need a fetch"""
+    return _store.version(symbol, get_timestamp_days_ago(DEFAULT_DAYS if days is None else days))
+
+def get_cache_fetched_at(symbol):
+    """When the cached candles for symbol were fetched (epoch seconds, as stored on disk), or None"""
+    return _store.fetched_at(symbol)
+
+async def get_versioned_candles(symbol, days: int | None = None):
+    """(candles, version) for the last `days` days; the version changes whenever the candles do"""
+    return await _store.get(_checked(symbol), get_timestamp_days_ago(DEFAULT_DAYS if days is None else days))
+
+async def get_candles(symbol, days: int | None = None):
+    """Read-only, zero-copy view of the cached daily candles for the last `days` days"""
+    candles, _ = await get_versioned_candles(symbol, days)
+    return candles
+
+def cached_symbols():
+    return _store.symbols()
+
+async def refresh_candles(symbol):
+    """Top up a cached symbol's daily candles if its open candle has closed since the last fetch"""
+    await _store.refresh(_checked(symbol))
 
 # Pegar histórico de candles (OHLCV) — exemplo: BTC/USDT
-def api_to_df(symbol, days: int | None = None):
-    cache_key = _get_cache_key(symbol, days)
-
-    # Check if we have valid cached data
-    if _is_cache_valid(cache_key) and cache_key in _cache_data:
-        return _cache_data[cache_key].copy()  # Return copy to avoid mutations
-
-    # Fetch fresh data
-    klines = client.get_historical_klines(
-        symbol=symbol,
-        interval=Client.KLINE_INTERVAL_1DAY,
-        start_str=get_date_days_ago(days),
-    )
-
-    df = pd.DataFrame(klines, columns=[
-        "timestamp", "Open", "High", "Low", "Close", "Volume",
-        "Close_time", "Quote_asset_volume", "Number_of_trades",
-        "Taker_buy_base_vol", "Taker_buy_quote_vol", "Ignore"
-    ])
-
-    df = df.drop(columns=["Close_time", "Taker_buy_base_vol", "Taker_buy_quote_vol", "Ignore"])
-
-    df["timestamp"] = pd.to_datetime(df["timestamp"], unit='ms')
-    df["timestamp"] = df["timestamp"].dt.strftime('%Y-%m-%d %H:%M:%S')
-    df[["Open", "High", "Low", "Close", "Volume"]] = df[["Open", "High", "Low", "Close", "Volume"]].astype(float)
-
-    # Cache the processed data
-    _cache_data[cache_key] = df.copy()
-    _cache_timestamps[cache_key] = time.time()
-
-    # LINE BELOW ALLOWS TO SAVE DATA LOCALLY
-    #df.to_csv("data/BTCUSDT.csv", index=False)
-
-    return df
-
-def clear_cache(symbol=None, days=None):
-    """Clear cache for specific symbol/days or all cache"""
-    if symbol and days:
-        cache_key = _get_cache_key(symbol, days)
-        _cache_data.pop(cache_key, None)
-        _cache_timestamps.pop(cache_key, None)
-    else:
-        _cache_data.clear()
-        _cache_timestamps.clear()
+async def api_to_df(symbol, days: int | None = None):
+    candles = await get_candles(symbol, days)
+    return candles.to_frame()
+
+def clear_cache(symbol=None, days=None, files=False):
+    """Clear cached candles for a symbol or for all symbols; the candle files are kept unless ``files``"""
+    _store.clear(symbol, files)
 
 def get_cache_info():
     """Get cache statistics"""
+    symbols = _store.info()
+    fetched = [entry["fetched_at"] for entry in symbols.values()]
     return {
-        "cached_items": len(_cache_data),
-        "cache_keys": list(_cache_data.keys()),
-        "oldest_cache": min(_cache_timestamps.values()) if _cache_timestamps else None,
-        "newest_cache": max(_cache_timestamps.values()) if _cache_timestamps else None
+        "cached_items": len(symbols),
+        "cache_keys": list(symbols.keys()),
+        "cache_bytes": sum(entry["bytes"] for entry in symbols.values()),
+        "cache_max_bytes": CACHE_MAX_BYTES,
+        "symbols": symbols,
+        "oldest_cache": min(fetched) if fetched else None,
+        "newest_cache": max(fetched) if fetched else None
     }
-
-@lru_cache(maxsize=32)
-def get_today_stats(symbol):
-    """Get today's OHLCV data - cached for 5 minutes"""
-    try:
-        # Get 24hr ticker statistics
-        ticker = client.get_ticker(symbol=symbol)
-        
-        return {
-            "symbol": symbol,
-            "open": float(ticker['openPrice']),
-            "high": float(ticker['highPrice']),
-            "low": float(ticker['lowPrice']),
-            "volume": float(ticker['volume']),
-            "price_change": float(ticker['priceChange']),
-            "price_change_percent": float(ticker['priceChangePercent']),
-            "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
-    except Exception as e:
-        print(f"Error fetching today's stats for {symbol}: {e}")
-        return None
-
@@ -0,0 +1,182 @@
+import asyncio
+import importlib
+import sys
+import time
+from config.settings import (
+    BINANCE_API_KEY, BINANCE_REST_URL, BINANCE_REST_POOL_SIZE, BINANCE_REST_TIMEOUT, BINANCE_WEIGHT_LIMIT,
+)
+
+KLINE_INTERVAL_1DAY = "1d"
+MAX_KLINES_PER_REQUEST = 1000
+
+# Request weights from the Binance spot API documentation
+KLINES_WEIGHT = 2
+TICKER_24HR_WEIGHT = 2
+EXCHANGE_INFO_WEIGHT = 20
+
+INTERVAL_MS = {
+    "1m": 60_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "1h": 3_600_000,
+    "4h": 14_400_000,
+    "1d": 86_400_000,
+}
+
+async def _import_aiohttp():
+    # aiohttp takes a few hundred ms to import: done on the first request, in a thread, not at boot
+    module = sys.modules.get("aiohttp")
+    if module is None:
+        module = await asyncio.to_thread(importlib.import_module, "aiohttp")
+    return module
+
+class BinanceRestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(f"Binance REST error {status}: {message}")
+        self.status = status
+        self.message = message
+
+class WeightLimiter:
+    """Client-side view of Binance's per-minute request weight budget.
+
+    Weight is reserved before each request and reconciled with the
+    ``X-MBX-USED-WEIGHT-1M`` header Binance returns, so requests made by other
+    processes sharing the IP are accounted for too.
+    """
+
+    def __init__(self, limit=BINANCE_WEIGHT_LIMIT):
+        self.limit = limit
+        self.used = 0
+        self.minute = int(time.time() // 60)
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _roll(self, now):
+        minute = int(now // 60)
+        if minute != self.minute:
+            self.minute = minute
+            self.used = 0
+
+    async def acquire(self, weight):
+        async with self._lock:
+            while True:
+                now = time.time()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self._roll(now)
+                if self.used + weight <= self.limit:
+                    self.used += weight
+                    return
+                # Budget exhausted - wait for the next minute window
+                await asyncio.sleep(60 - now % 60)
+
+    def update(self, used_weight):
+        if used_weight is not None:
+            self._roll(time.time())
+            self.used = max(self.used, int(used_weight))
+
+    def block(self, seconds):
+        self.blocked_until = max(self.blocked_until, time.time() + seconds)
+
+class BinanceRestClient:
+    """Async Binance REST client with a keep-alive connection pool.
+
+    Concurrent calls for the same resource share a single upstream request.
+    """
+
+    def __init__(self, base_url=BINANCE_REST_URL, api_key=BINANCE_API_KEY, pool_size=BINANCE_REST_POOL_SIZE,
+                 timeout=BINANCE_REST_TIMEOUT, weight_limit=BINANCE_WEIGHT_LIMIT):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.limiter = WeightLimiter(weight_limit)
+        self.requests_sent = 0
+        self._session = None
+        self._session_loop = None
+        self._inflight = {}
+
+    def _session_usable(self, loop):
+        # Sessions are bound to the loop that created them (scripts may call asyncio.run repeatedly)
+        return self._session is not None and not self._session.closed and self._session_loop is loop
+
+    async def _get_session(self):
+        loop = asyncio.get_running_loop()
+        if not self._session_usable(loop):
+            aiohttp = await _import_aiohttp()
+        if not self._session_usable(loop):  # Another request may have opened one during the import
+            self._session_loop = loop
+            headers = {"X-MBX-APIKEY": self.api_key} if self.api_key else None
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=headers,
+            )
+        return self._session
+
+    async def _get(self, path, params, weight):
+        await self.limiter.acquire(weight)
+        self.requests_sent += 1
+        session = await self._get_session()
+        async with session.get(f"{self.base_url}{path}", params=params) as response:
+            self.limiter.update(response.headers.get("X-MBX-USED-WEIGHT-1M"))
+            if response.status in (418, 429):
+                # Rate limited (429) or IP banned (418): stop sending until Retry-After has passed
+                self.limiter.block(int(response.headers.get("Retry-After", "60")))
+                raise BinanceRestError(response.status, await response.text())
+            if response.status >= 400:
+                raise BinanceRestError(response.status, await response.text())
+            return await response.json()
+
+    async def _single_flight(self, key, factory):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one caller giving up doesn't cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    async def get_klines(self, symbol, interval, start_ms=None, end_ms=None, limit=MAX_KLINES_PER_REQUEST):
+        params = {"symbol": symbol, "interval": interval, "limit": limit}
+        if start_ms is not None:
+            params["startTime"] = start_ms
+        if end_ms is not None:
+            params["endTime"] = end_ms
+        return await self._get("/api/v3/klines", params, KLINES_WEIGHT)
+
+    async def get_historical_klines(self, symbol, interval=KLINE_INTERVAL_1DAY, start_ms=None, end_ms=None):
+        """All klines from start_ms (paginated), shared between concurrent identical calls"""
+        key = ("klines", symbol, interval, start_ms, end_ms)
+        return await self._single_flight(key, lambda: self._fetch_historical_klines(symbol, interval, start_ms, end_ms))
+
+    async def _fetch_historical_klines(self, symbol, interval, start_ms, end_ms):
+        klines = []
+        while True:
+            batch = await self.get_klines(symbol, interval, start_ms, end_ms)
+            klines.extend(batch)
+            if len(batch) < MAX_KLINES_PER_REQUEST:
+                return klines
+            start_ms = batch[-1][0] + INTERVAL_MS[interval]
+
+    async def get_ticker(self, symbol):
+        """24hr ticker statistics, shared between concurrent identical calls"""
+        return await self._single_flight(
+            ("ticker", symbol),
+            lambda: self._get("/api/v3/ticker/24hr", {"symbol": symbol}, TICKER_24HR_WEIGHT),
+        )
+
+    async def get_exchange_info(self):
+        """Trading rules and status of every symbol on the exchange"""
+        return await self._single_flight(
+            ("exchange_info",),
+            lambda: self._get("/api/v3/exchangeInfo", {}, EXCHANGE_INFO_WEIGHT),
+        )
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+client = BinanceRestClient()
@@ -0,0 +1,131 @@
+import glob
+import os
+import re
+import struct
+import tempfile
+import zlib
+import numpy as np
+from utils.candles import Candles, FIELDS
+
+# File layout: fixed header followed by one 64-byte little-endian record per candle
+MAGIC = b"KLNS"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHqqdI")  # magic, format version, record size, count, covered_from, fetched_at, crc32
+RECORD = np.dtype([(name, np.dtype(dtype).newbyteorder("<")) for name, dtype, _ in FIELDS])
+# Symbols become file names, so only plain tickers ("BTCUSDT") are accepted
+SYMBOL = re.compile(r"[A-Z0-9]+")
+
+class CandleFileError(Exception):
+    pass
+
+def write_candles(path, candles, covered_from, fetched_at):
+    """Atomically replace ``path`` with the given candles"""
+    records = np.empty(len(candles), dtype=RECORD)
+    for name, _, _ in FIELDS:
+        records[name] = getattr(candles, name)
+    data = records.tobytes()
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.itemsize, len(candles), covered_from, fetched_at, zlib.crc32(data))
+
+    # Write a temp file next to the target and rename it over, so readers never see a partial file.
+    # Each writer gets its own temp file: threads and worker processes may save the same symbol at once
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f"{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    directory_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(directory_fd)
+    finally:
+        os.close(directory_fd)
+
+def read_candles(path):
+    """Memory-map a candle file; returns (candles, covered_from, fetched_at)"""
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise CandleFileError(f"{path}: truncated header")
+
+    magic, version, record_size, count, covered_from, fetched_at, crc = HEADER.unpack(header)
+    if magic != MAGIC or version != FORMAT_VERSION or record_size != RECORD.itemsize:
+        raise CandleFileError(f"{path}: unknown format")
+    if os.path.getsize(path) != HEADER.size + count * RECORD.itemsize:
+        raise CandleFileError(f"{path}: size does not match {count} records")
+    if count == 0:
+        return Candles.empty(), covered_from, fetched_at
+
+    records = np.memmap(path, dtype=RECORD, mode="r", offset=HEADER.size, shape=(count,))
+    if zlib.crc32(records) != crc:
+        raise CandleFileError(f"{path}: checksum mismatch")
+    return Candles(**{name: records[name] for name, _, _ in FIELDS}), covered_from, fetched_at
+
+def read_csv_candles(path):
+    """Candles from a CSV in the raw-data response format (e.g. data/BTCUSDT.csv)"""
+    import pandas as pd
+    df = pd.read_csv(path)
+    open_time = (pd.to_datetime(df["timestamp"]) - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1)
+    return Candles(**{name: df[label].to_numpy() if name != "open_time" else open_time.to_numpy()
+                      for name, _, label in FIELDS})
+
+class CandleDirectory:
+    """One candle file per symbol under ``root``, e.g. data/klines/BTCUSDT_1d.bin.
+
+    Symbols without a file yet can be seeded from ``{seed_dir}/{SYMBOL}.csv``.
+    """
+
+    def __init__(self, root, interval="1d", seed_dir=None):
+        self.root = root
+        self.interval = interval
+        self.seed_dir = seed_dir
+
+    @staticmethod
+    def _checked(symbol):
+        if not isinstance(symbol, str) or SYMBOL.fullmatch(symbol) is None:
+            raise ValueError(f"Invalid symbol for a candle file: {symbol!r}")
+        return symbol
+
+    def path(self, symbol):
+        return os.path.join(self.root, f"{self._checked(symbol)}_{self.interval}.bin")
+
+    def load(self, symbol):
+        """(candles, covered_from, fetched_at) from disk, or None if nothing usable is stored"""
+        path = self.path(symbol)
+        if os.path.exists(path):
+            try:
+                return read_candles(path)
+            except (CandleFileError, OSError, ValueError) as e:
+                print(f"Ignoring kline file for {symbol}: {e}")
+
+        seed = os.path.join(self.seed_dir, f"{self._checked(symbol)}.csv") if self.seed_dir else None
+        if seed and os.path.exists(seed):
+            try:
+                candles = read_csv_candles(seed)
+            except Exception as e:
+                print(f"Ignoring kline seed for {symbol}: {e}")
+                return None
+            if len(candles):
+                # Treat seed data as stale so the tail is topped up on first use
+                return candles, int(candles.open_time[0]), 0.0
+        return None
+
+    def save(self, symbol, candles, covered_from, fetched_at):
+        os.makedirs(self.root, exist_ok=True)
+        write_candles(self.path(symbol), candles, covered_from, fetched_at)
+
+    def remove(self, symbol=None):
+        """Delete the file for one symbol, or all of them"""
+        paths = [self.path(symbol)] if symbol else glob.glob(os.path.join(self.root, f"*_{self.interval}.bin"))
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
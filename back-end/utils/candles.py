@@ -0,0 +1,91 @@
+import numpy as np
+
+# Column name, dtype and the name used in API responses
+FIELDS = [
+    ("open_time", np.int64, "timestamp"),
+    ("open", np.float64, "Open"),
+    ("high", np.float64, "High"),
+    ("low", np.float64, "Low"),
+    ("close", np.float64, "Close"),
+    ("volume", np.float64, "Volume"),
+    ("quote_volume", np.float64, "Quote_asset_volume"),
+    ("trades", np.int64, "Number_of_trades"),
+]
+
+# Index of each field in a Binance REST kline row
+_KLINE_INDEX = {"open_time": 0, "open": 1, "high": 2, "low": 3, "close": 4, "volume": 5, "quote_volume": 7, "trades": 8}
+
+def format_timestamps(open_time):
+    """Epoch milliseconds -> 'YYYY-MM-DD HH:MM:SS' strings"""
+    return [value.replace("T", " ") for value in np.datetime_as_string(np.asarray(open_time).astype("datetime64[ms]"), unit="s")]
+
+class Candles:
+    """A run of candles held as one contiguous typed array per field.
+
+    Arrays are read-only, so slices can be handed out as zero-copy views; strings are
+    only produced when formatting for a response.
+    """
+
+    __slots__ = [name for name, _, _ in FIELDS]
+
+    def __init__(self, **arrays):
+        for name, dtype, _ in FIELDS:
+            array = np.asarray(arrays[name], dtype=dtype)
+            if array.flags.writeable:
+                array.setflags(write=False)
+            setattr(self, name, array)
+
+    def __setstate__(self, state):
+        # Unpickled (e.g. in a worker process) through __init__, so the arrays are read-only again
+        self.__init__(**state[1])
+
+    @classmethod
+    def empty(cls):
+        return cls(**{name: np.empty(0, dtype=dtype) for name, dtype, _ in FIELDS})
+
+    @classmethod
+    def from_klines(cls, klines):
+        """Parse rows as returned by the Binance klines endpoint"""
+        if not klines:
+            return cls.empty()
+        return cls(**{
+            name: np.array([row[_KLINE_INDEX[name]] for row in klines]).astype(dtype)
+            for name, dtype, _ in FIELDS
+        })
+
+    @classmethod
+    def concat(cls, *parts):
+        return cls(**{name: np.concatenate([getattr(part, name) for part in parts]) for name, _, _ in FIELDS})
+
+    def __len__(self):
+        return len(self.open_time)
+
+    def __getitem__(self, index):
+        """Slice of the candles as views over the same memory"""
+        if not isinstance(index, slice):
+            raise TypeError("Candles only support slicing")
+        return Candles(**{name: getattr(self, name)[index] for name, _, _ in FIELDS})
+
+    def since(self, open_time):
+        """Candles opening at or after open_time (a view)"""
+        return self[int(np.searchsorted(self.open_time, open_time)):]
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name, _, _ in FIELDS)
+
+    def columns(self):
+        """{response column: list of values}, with timestamps formatted as strings"""
+        columns = {label: getattr(self, name).tolist() for name, _, label in FIELDS}
+        columns["timestamp"] = format_timestamps(self.open_time)
+        return columns
+
+    def to_records(self):
+        """List of row dicts in the API response format"""
+        columns = self.columns()
+        labels = list(columns)
+        return [dict(zip(labels, row)) for row in zip(*columns.values())]
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.columns())
@@ -1,29 +1,56 @@
+import numpy as np
 import pandas as pd
 
-def calculate_rsi_wilder(prices: pd.Series, period: int = 14) -> pd.Series:
-    delta = prices.diff()
-
-    # ganhos e perdas
-    gain = delta.where(delta > 0, 0.0)
-    loss = -delta.where(delta < 0, 0.0)
-
-    # SMA inicial dos primeiros `period` valores
-    avg_gain = gain.rolling(window=period, min_periods=period).mean()
-    avg_loss = loss.rolling(window=period, min_periods=period).mean()
-
-    # inicializa listas
-    rsi = pd.Series(index=prices.index, dtype=float)
+def rsi_wilder(values, period: int = 14) -> np.ndarray:
+    """Wilder RSI over a 1-D price array or a 2-D (time x symbols) array"""
+    values = np.asarray(values, dtype=float)
+    one_dimensional = values.ndim == 1
+    if one_dimensional:
+        values = values[:, np.newaxis]
+
+    rsi = np.full(values.shape, np.nan)
+    if len(values) > period + 1:
+        delta = np.diff(values, axis=0, prepend=np.nan)
+
+        # ganhos e perdas
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = -np.where(delta < 0, delta, 0.0)
+
+        # primeira média é a SMA dos primeiros `period + 1` valores
+        # (summed along contiguous rows so numpy uses the same pairwise sum as Series.mean)
+        first_gain = np.ascontiguousarray(gain[:period + 1].T).sum(axis=1) / (period + 1)
+        first_loss = np.ascontiguousarray(loss[:period + 1].T).sum(axis=1) / (period + 1)
+
+        # Wilder smoothing is a first-order recursive filter; it runs over time only,
+        # every other step is vectorized (and across symbols for 2-D input)
+        if one_dimensional:
+            avg_gain = _wilder_smooth(first_gain[0], gain[period + 1:, 0].tolist(), period)[:, np.newaxis]
+            avg_loss = _wilder_smooth(first_loss[0], loss[period + 1:, 0].tolist(), period)[:, np.newaxis]
+        else:
+            avg_gain = _wilder_smooth_rows(first_gain, gain[period + 1:], period)
+            avg_loss = _wilder_smooth_rows(first_loss, loss[period + 1:], period)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = np.where(avg_loss != 0, avg_gain / avg_loss, 0)
+        rsi[period + 1:] = 100 - (100 / (1 + rs))
+
+    return rsi[:, 0] if one_dimensional else rsi
+
+def _wilder_smooth(first, values, period):
+    out = []
+    avg = float(first)
+    for value in values:
+        avg = (avg * (period - 1) + value) / period
+        out.append(avg)
+    return np.array(out, dtype=float)
+
+def _wilder_smooth_rows(first, values, period):
+    out = np.empty_like(values)
+    avg = first
+    for i in range(len(values)):
+        avg = (avg * (period - 1) + values[i]) / period
+        out[i] = avg
+    return out
 
-    # primeira média é a SMA
-    avg_gain.iloc[period] = gain.iloc[:period+1].mean()
-    avg_loss.iloc[period] = loss.iloc[:period+1].mean()
-
-    # iteração manual (estilo Wilder)
-    for i in range(period+1, len(prices)):
-        avg_gain.iloc[i] = (avg_gain.iloc[i-1] * (period - 1) + gain.iloc[i]) / period
-        avg_loss.iloc[i] = (avg_loss.iloc[i-1] * (period - 1) + loss.iloc[i]) / period
-
-        rs = avg_gain.iloc[i] / avg_loss.iloc[i] if avg_loss.iloc[i] != 0 else 0
-        rsi.iloc[i] = 100 - (100 / (1 + rs))
-
-    return rsi
+def calculate_rsi_wilder(prices: pd.Series, period: int = 14) -> pd.Series:
+    return pd.Series(rsi_wilder(prices.to_numpy(dtype=float), period), index=prices.index)
@@ -1,4 +1,9 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 def get_date_days_ago(days: int = 90) -> str:
     return (datetime.today() - timedelta(days=days)).strftime("%Y-%m-%d")
+
+def get_timestamp_days_ago(days: int = 90) -> int:
+    """Epoch milliseconds of UTC midnight on the date returned by get_date_days_ago"""
+    date = (datetime.today() - timedelta(days=days)).date()  # Same date, without the string round trip
+    return int(datetime(date.year, date.month, date.day, tzinfo=timezone.utc).timestamp() * 1000)
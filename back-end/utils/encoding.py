@@ -0,0 +1,136 @@
+import json
+import struct
+from collections import OrderedDict
+import numpy as np
+from utils.candles import FIELDS
+
+# Media types a client can ask for in the Accept header
+RECORDS_JSON = "application/json"  # [{"timestamp": ..., "Open": ...}, ...] (default)
+COLUMNS_JSON = "application/vnd.candles.columns+json"  # {"timestamp": [...], "Open": [...], ...}
+BINARY = "application/vnd.candles.binary"  # Raw little-endian columns, see pack_columns
+
+CANDLE_MEDIA_TYPES = [RECORDS_JSON, COLUMNS_JSON, BINARY]
+_ALIASES = {"application/octet-stream": BINARY, "*/*": RECORDS_JSON, "application/*": RECORDS_JSON}
+
+# Binary layout: header, then a descriptor per column, then each column's values back to back
+BINARY_MAGIC = b"CNDL"
+BINARY_VERSION = 2
+BINARY_HEADER = struct.Struct("<4sBBI")  # magic, format version, column count, row count
+BINARY_COLUMN = struct.Struct("<Bc")  # name length, dtype code (q = int64, d = float64), then the ASCII name
+
+def negotiate(accept, supported=CANDLE_MEDIA_TYPES):
+    """Pick the supported media type the Accept header prefers (JSON records if none match)"""
+    best, best_q = supported[0], 0.0
+    for part in (accept or "").split(","):
+        media_type, *params = [item.strip() for item in part.split(";")]
+        media_type = _ALIASES.get(media_type.lower(), media_type.lower())
+        if media_type not in supported:
+            continue
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if q > best_q:
+            best, best_q = media_type, q
+    return best
+
+def dumps(content):
+    """JSON bytes, encoded the same way as JSONResponse"""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def pack_columns(columns):
+    """Encode {name: int64/float64 array} as one little-endian binary blob"""
+    rows = len(next(iter(columns.values()))) if columns else 0
+    parts = [BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(columns), rows)]
+    arrays = []
+    for name, array in columns.items():
+        array = np.asarray(array)
+        code = b"q" if array.dtype.kind in "iu" else b"d"
+        encoded_name = name.encode("ascii")
+        parts.append(BINARY_COLUMN.pack(len(encoded_name), code) + encoded_name)
+        arrays.append(array.astype("<i8" if code == b"q" else "<f8", copy=False))
+    parts.extend(array.tobytes() for array in arrays)
+    return b"".join(parts)
+
+def unpack_columns(data, offset=0):
+    """Inverse of pack_columns, returns {name: array}"""
+    magic, version, count, rows = BINARY_HEADER.unpack_from(data, offset)
+    if magic != BINARY_MAGIC:
+        raise ValueError("Not a candle payload")
+    if version != BINARY_VERSION:
+        raise ValueError(f"Unsupported candle payload version {version}")
+    offset += BINARY_HEADER.size
+    descriptors = []
+    for _ in range(count):
+        length, code = BINARY_COLUMN.unpack_from(data, offset)
+        offset += BINARY_COLUMN.size
+        name = bytes(data[offset:offset + length]).decode("ascii")
+        descriptors.append((name, "<i8" if code == b"q" else "<f8"))
+        offset += length
+    columns = {}
+    for name, dtype in descriptors:
+        columns[name] = np.frombuffer(data, dtype=dtype, count=rows, offset=offset)
+        offset += rows * 8
+    return columns
+
+def encode_candles(candles, media_type):
+    """Candles in the requested representation, as bytes"""
+    if media_type == BINARY:
+        # Timestamps stay epoch milliseconds; no per-value formatting at all
+        return pack_columns({label: getattr(candles, name) for name, _, label in FIELDS})
+    if media_type == COLUMNS_JSON:
+        return dumps(candles.columns())
+    return dumps(candles.to_records())
+
+def encode_rows(rows, media_type):
+    """Row dicts (e.g. indicator rows) as JSON records or JSON columns"""
+    if media_type == COLUMNS_JSON:
+        return dumps({column: [row[column] for row in rows] for column in (rows[0] if rows else {})})
+    return dumps(rows)
+
+class EncodedCache:
+    """Encoded response bodies keyed by request, valid while the data version is unchanged"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # {key: (version, body)}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version, build):
+        body = self.lookup(key, version)
+        if body is None:
+            body = self.put(key, version, build())
+        return body
+
+    def lookup(self, key, version):
+        """The cached body for key at version, or None (counted as a miss)"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(self, key, version, body):
+        if version is not None:
+            self._entries[key] = (version, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return body
+
+    def clear(self):
+        self._entries.clear()
+
+    def info(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": sum(len(body) for _, body in self._entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
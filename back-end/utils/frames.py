@@ -0,0 +1,89 @@
+import json
+import struct
+import zlib
+import numpy as np
+from config.settings import WS_COMPRESS_MIN_BYTES
+from utils.encoding import pack_columns, unpack_columns
+
+# WebSocket frame formats a client can ask for (?format=binary or the candles.binary subprotocol)
+JSON_FRAMES = "json"
+BINARY_FRAMES = "binary"
+BINARY_SUBPROTOCOL = "candles.binary"
+
+# Binary frame: a header, then a kind-specific body; the body may be raw-deflated as a whole
+FRAME_HEADER = struct.Struct("<BB")  # kind, flags
+FLAG_DEFLATE = 0x01
+KIND_PRICE = 1  # <12sdd: symbol (NUL padded), price, timestamp in seconds
+KIND_ROWS = 2  # packed columns
+KIND_SNAPSHOT = 3  # <I seq, then packed columns
+KIND_DELTA = 4  # <IIq seq, base, start (epoch ms), then packed columns
+PRICE_BODY = struct.Struct("<12sdd")
+SNAPSHOT_BODY = struct.Struct("<I")
+DELTA_BODY = struct.Struct("<IIq")
+
+def _timestamp_ms(values):
+    return np.array(values, dtype="datetime64[ms]").astype(np.int64)
+
+def pack_records(records):
+    """Row dicts as packed columns; timestamps become epoch milliseconds, None becomes NaN"""
+    columns = {}
+    for name in (records[0] if records else {}):
+        values = [record[name] for record in records]
+        if name == "timestamp":
+            columns[name] = _timestamp_ms(values)
+        elif all(type(value) is int for value in values):
+            columns[name] = np.array(values, dtype=np.int64)
+        else:
+            columns[name] = np.array(values, dtype=np.float64)
+    return pack_columns(columns)
+
+def _frame(kind, body):
+    flags = 0
+    if len(body) >= WS_COMPRESS_MIN_BYTES:
+        # Raw deflate, so browsers can inflate it with DecompressionStream("deflate-raw")
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+        body = compressor.compress(body) + compressor.flush()
+        flags |= FLAG_DEFLATE
+    return FRAME_HEADER.pack(kind, flags) + body
+
+def encode_price(symbol, price, timestamp, fmt=JSON_FRAMES):
+    if fmt == BINARY_FRAMES:
+        return _frame(KIND_PRICE, PRICE_BODY.pack(symbol.encode("ascii"), price, timestamp))
+    return json.dumps({"symbol": symbol, "price": price, "timestamp": timestamp})
+
+def encode_rows(records, fmt=JSON_FRAMES):
+    if fmt == BINARY_FRAMES:
+        return _frame(KIND_ROWS, pack_records(records))
+    return json.dumps(records)
+
+def encode_message(message, fmt=JSON_FRAMES):
+    """A snapshot/delta feed message (see services.delta_feed)"""
+    if fmt != BINARY_FRAMES:
+        return json.dumps(message)
+    if message["type"] == "snapshot":
+        body = SNAPSHOT_BODY.pack(message["seq"])
+        return _frame(KIND_SNAPSHOT, body + pack_records(message["data"]))
+    start = int(_timestamp_ms([message["start"]])[0])
+    body = DELTA_BODY.pack(message["seq"], message["base"], start)
+    return _frame(KIND_DELTA, body + pack_records(message["data"]))
+
+def decode_frame(data):
+    """Inverse of the binary encoders: a dict with ``kind`` and the decoded fields"""
+    kind, flags = FRAME_HEADER.unpack_from(data)
+    body = bytes(data[FRAME_HEADER.size:])
+    if flags & FLAG_DEFLATE:
+        body = zlib.decompress(body, -15)
+
+    if kind == KIND_PRICE:
+        symbol, price, timestamp = PRICE_BODY.unpack_from(body)
+        return {"kind": "price", "symbol": symbol.rstrip(b"\0").decode("ascii"), "price": price, "timestamp": timestamp}
+    if kind == KIND_ROWS:
+        return {"kind": "rows", "columns": unpack_columns(body)}
+    if kind == KIND_SNAPSHOT:
+        (seq,) = SNAPSHOT_BODY.unpack_from(body)
+        return {"kind": "snapshot", "seq": seq, "columns": unpack_columns(body, SNAPSHOT_BODY.size)}
+    if kind == KIND_DELTA:
+        seq, base, start = DELTA_BODY.unpack_from(body)
+        return {"kind": "delta", "seq": seq, "base": base, "start": start,
+                "columns": unpack_columns(body, DELTA_BODY.size)}
+    raise ValueError(f"Unknown frame kind {kind}")
@@ -0,0 +1,104 @@
+import gzip
+import hashlib
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import Request, Response
+from config.settings import HTTP_COMPRESS_MIN_BYTES
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip is always available
+    brotli = None
+
+def _compress(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+def supported_encodings():
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+class EncodedBody:
+    """An encoded response body with its validators and lazily built compressed variants"""
+
+    __slots__ = ("body", "etag", "last_modified", "_variants")
+
+    def __init__(self, body, last_modified=None):
+        self.body = body
+        self.etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+        self.last_modified = int(last_modified if last_modified is not None else time.time())
+        self._variants = {}  # {content coding: bytes}, compressed once and then reused
+
+    def __len__(self):
+        return len(self.body) + sum(len(variant) for variant in self._variants.values())
+
+    def has_variant(self, encoding):
+        return encoding is None or encoding in self._variants
+
+    def variant(self, encoding):
+        if encoding is None:
+            return self.body
+        compressed = self._variants.get(encoding)
+        if compressed is None:
+            compressed = self._variants[encoding] = _compress(self.body, encoding)
+        return compressed
+
+def negotiate_encoding(accept_encoding, size):
+    """Best content coding for a body of ``size`` bytes, or None for identity"""
+    if size < HTTP_COMPRESS_MIN_BYTES or not accept_encoding:
+        return None
+    preferences = {}
+    for part in accept_encoding.split(","):
+        coding, *params = [item.strip() for item in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        preferences[coding.lower()] = q
+    best, best_q = None, 0.0
+    for coding in supported_encodings():  # Server preference breaks ties
+        q = preferences.get(coding, preferences.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+def _etag_matches(if_none_match, etag):
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        # Weak comparison; compressed variants share the identity tag's opaque prefix
+        tag = tag.removeprefix("W/").strip('"').split("-")[0]
+        if tag == etag:
+            return True
+    return False
+
+def is_not_modified(request: Request, encoded: EncodedBody):
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, encoded.etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return encoded.last_modified <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+def conditional_response(request: Request, encoded: EncodedBody, media_type, max_age):
+    """200 with validators and compression, or 304 if the client's copy is current"""
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), len(encoded.body))
+    headers = {
+        "ETag": f'"{encoded.etag}-{encoding}"' if encoding else f'"{encoded.etag}"',
+        "Last-Modified": formatdate(encoded.last_modified, usegmt=True),
+        "Cache-Control": f"public, max-age={max(int(max_age), 0)}",
+        "Vary": "Accept, Accept-Encoding",
+    }
+    if is_not_modified(request, encoded):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=encoded.variant(encoding), media_type=media_type, headers=headers)
@@ -0,0 +1,266 @@
+import asyncio
+import itertools
+import time
+from collections import OrderedDict
+from utils.candles import Candles
+
+# Global so a series that is dropped and refetched never reuses an old version
+_versions = itertools.count(1)
+
+class KlineSeries:
+    """All cached candles for one symbol, sorted by open time"""
+
+    def __init__(self, symbol, candles, covered_from):
+        self.symbol = symbol
+        self.candles = candles
+        self.covered_from = covered_from  # Earliest start time already requested upstream
+        self.fetched_at = time.time()
+        self.failed_at = 0.0  # Last time upstream could not be reached
+        self.version = next(_versions)
+
+    @property
+    def nbytes(self):
+        return self.candles.nbytes
+
+    def replace(self, candles, covered_from=None):
+        self.candles = candles
+        if covered_from is not None:
+            self.covered_from = covered_from
+        self.version = next(_versions)
+
+class KlineStore:
+    """One canonical candle series per symbol, served to any ``days`` request as a slice.
+
+    Older history is fetched only for the range not yet covered, the tail is topped up
+    from the last (still open) candle once the series is stale, and whole symbols are
+    evicted least-recently-used first once ``max_bytes`` is exceeded.
+
+    A series goes stale ``max_age`` seconds after it was fetched and, with
+    ``interval_ms``, as soon as the candle that was open then has closed. For
+    ``stale_while_revalidate`` seconds after that, requests are served the stale
+    candles at once while one background task tops up the tail; after it, they wait.
+
+    ``fetch(symbol, start_ms, end_ms)`` must return ``Candles`` sorted by open time.
+
+    With a ``disk`` store (see ``utils.candle_file.CandleDirectory``) series are loaded
+    from disk before going upstream and written back after every fetch. If upstream is
+    unreachable, whatever is held is served and the fetch is retried after ``retry_after``.
+    Disk reads and writes go through ``run_blocking(func, *args)``, off the event loop.
+    """
+
+    def __init__(self, fetch, max_age, max_bytes, disk=None, retry_after=60, run_blocking=asyncio.to_thread,
+                 interval_ms=None, stale_while_revalidate=0):
+        self.fetch = fetch
+        self.run_blocking = run_blocking
+        self.max_age = max_age
+        self.interval_ms = interval_ms
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self.retry_after = retry_after
+        self._series = OrderedDict()  # {symbol: KlineSeries}, least recently used first
+        self._locks = {}  # {symbol: lock}, only while the symbol is cached or being read
+        self._refreshes = {}  # {symbol: background top-up task}, while it runs
+        self.lookups = {"hit": 0, "stale": 0, "disk": 0, "miss": 0}  # get() calls by where the candles came from
+
+    def _stale_since(self, series):
+        """When the series went (or will go) stale, in epoch seconds"""
+        expires = series.fetched_at + self.max_age
+        if self.interval_ms:
+            fetched_ms = int(series.fetched_at * 1000)
+            next_close_ms = fetched_ms - fetched_ms % self.interval_ms + self.interval_ms
+            expires = min(expires, next_close_ms / 1000)
+        return expires
+
+    def _fresh(self, series):
+        now = time.time()
+        return now < self._stale_since(series) or now - series.failed_at < self.retry_after
+
+    def _servable(self, series):
+        # Fresh, or stale recently enough to be served while it is refreshed
+        return self._fresh(series) or time.time() - self._stale_since(series) < self.stale_while_revalidate
+
+    def symbols(self):
+        return list(self._series)
+
+    def fetched_at(self, symbol):
+        """When the held series was last fetched from upstream (epoch seconds), or None"""
+        series = self._series.get(symbol)
+        return series.fetched_at if series is not None else None
+
+    def version(self, symbol, start_ms):
+        """Version of the candles a get() would return now, or None if it would go upstream first"""
+        series = self._series.get(symbol)
+        if series is None or start_ms < series.covered_from or not self._servable(series):
+            return None
+        if not self._fresh(series):
+            self._revalidate(symbol)
+        return series.version
+
+    async def get(self, symbol, start_ms):
+        """Read-only view of the candles with open time >= start_ms, fetching only what is missing"""
+        lock = self._locks.setdefault(symbol, asyncio.Lock())
+        try:
+            async with lock:
+                series = self._series.get(symbol)
+                source = "hit"
+                if series is None:
+                    series = await self._load(symbol)
+                    source = "disk"
+
+                if series is None:
+                    source = "miss"
+                    series = KlineSeries(symbol, await self.fetch(symbol, start_ms, None), start_ms)
+                    await self._save(series)
+                elif time.time() - series.failed_at >= self.retry_after:
+                    version = series.version
+                    try:
+                        if start_ms < series.covered_from:
+                            source = "miss"
+                            await self._extend(series, start_ms)
+                        if not self._servable(series):
+                            source = "miss"
+                            await self._top_up(series)
+                    except Exception as e:
+                        # Keep serving what we have rather than failing the request
+                        series.failed_at = time.time()
+                        print(f"Serving cached {symbol} klines, upstream fetch failed: {e}")
+                    if series.version != version:
+                        await self._save(series)
+
+                self._series[symbol] = series
+                self._series.move_to_end(symbol)
+                self._evict(keep=symbol)
+        finally:
+            self._release(symbol, lock)
+
+        if not self._fresh(series):
+            if source == "hit":
+                source = "stale"
+            self._revalidate(symbol)  # Served stale; the tail is topped up in the background
+        self.lookups[source] += 1
+        return series.candles.since(start_ms), series.version
+
+    def _revalidate(self, symbol):
+        task = self._refreshes.get(symbol)
+        if task is None or task.done():
+            task = self._refreshes[symbol] = asyncio.ensure_future(self._refresh(symbol))
+
+            def finished(done):
+                if self._refreshes.get(symbol) is done:  # Not a newer refresh started meanwhile
+                    del self._refreshes[symbol]
+
+            task.add_done_callback(finished)
+        return task
+
+    def _release(self, symbol, lock):
+        # A symbol that did not make it into the cache (its fetch failed) leaves no lock behind
+        if symbol not in self._series and self._locks.get(symbol) is lock and not lock.locked():
+            del self._locks[symbol]
+
+    async def refresh(self, symbol):
+        """Top up a cached symbol if it is stale, joining a refresh already in flight"""
+        await asyncio.shield(self._revalidate(symbol))
+
+    async def _refresh(self, symbol):
+        if symbol not in self._series:
+            return
+        lock = self._locks.setdefault(symbol, asyncio.Lock())
+        async with lock:
+            series = self._series.get(symbol)
+            if series is None or self._fresh(series):
+                return
+            version = series.version
+            try:
+                if await self._reload(series):
+                    return  # Already on disk
+                await self._top_up(series)
+            except Exception as e:
+                series.failed_at = time.time()
+                print(f"Serving cached {symbol} klines, upstream fetch failed: {e}")
+            if series.version != version:
+                await self._save(series)
+
+    async def _reload(self, series):
+        # Another process sharing the directory may have refreshed this symbol already
+        if self.disk is None:
+            return False
+        stored = await self._load(series.symbol)
+        if stored is None or stored.fetched_at <= series.fetched_at or not self._fresh(stored) \
+                or stored.covered_from > series.covered_from:
+            return False
+        series.replace(stored.candles, covered_from=stored.covered_from)
+        series.fetched_at = stored.fetched_at
+        return True
+
+    async def _load(self, symbol):
+        if self.disk is None:
+            return None
+        stored = await self.run_blocking(self.disk.load, symbol)
+        if stored is None:
+            return None
+        candles, covered_from, fetched_at = stored
+        series = KlineSeries(symbol, candles, covered_from)
+        series.fetched_at = fetched_at
+        return series
+
+    async def _save(self, series):
+        if self.disk is None:
+            return
+        try:
+            # File I/O and fsync off the event loop
+            await self.run_blocking(self.disk.save, series.symbol, series.candles, series.covered_from, series.fetched_at)
+        except Exception as e:
+            print(f"Could not persist {series.symbol} klines: {e}")
+
+    async def _extend(self, series, start_ms):
+        # Only the range before the first cached candle is missing
+        candles = series.candles
+        end_ms = int(candles.open_time[0]) - 1 if len(candles) else None
+        older = await self.fetch(series.symbol, start_ms, end_ms)
+        series.replace(Candles.concat(older, candles), covered_from=start_ms)
+
+    async def _top_up(self, series):
+        # Re-fetch from the last cached candle: it was still open, and newer ones get appended
+        candles = series.candles
+        if len(candles) == 0:
+            newer = await self.fetch(series.symbol, series.covered_from, None)
+            series.replace(newer)
+        else:
+            last_open = int(candles.open_time[-1])
+            newer = await self.fetch(series.symbol, last_open, None)
+            series.replace(Candles.concat(candles[:-1], newer))
+        series.fetched_at = time.time()
+
+    def _evict(self, keep):
+        total = sum(series.nbytes for series in self._series.values())
+        for symbol in list(self._series):
+            if total <= self.max_bytes:
+                break
+            if symbol == keep:
+                continue
+            total -= self._series.pop(symbol).nbytes
+            self._locks.pop(symbol, None)
+            print(f"Evicted {symbol} klines from cache")
+
+    def clear(self, symbol=None, files=False):
+        """Drop cached series from memory; with ``files`` their stored candle files go too"""
+        if symbol:
+            self._series.pop(symbol, None)
+            self._locks.pop(symbol, None)
+        else:
+            self._series.clear()
+            self._locks.clear()
+        if files and self.disk is not None:
+            self.disk.remove(symbol)
+
+    def info(self):
+        return {
+            symbol: {
+                "candles": len(series.candles),
+                "covered_from": series.covered_from,
+                "fetched_at": series.fetched_at,
+                "bytes": series.nbytes,
+            }
+            for symbol, series in self._series.items()
+        }
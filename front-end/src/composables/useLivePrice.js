@@ -40,6 +40,11 @@ export function useLivePrice(baseUrl) {
       socket.onmessage = (event) => {
         try {
           const data = JSON.parse(event.data);
+          // Answer keep-alive pings so the server doesn't reap the connection
+          if (data.type === 'ping') {
+            socket.send(JSON.stringify({ type: 'pong' }));
+            return;
+          }
           if (data.price) {
             price.value = data.price;
           }
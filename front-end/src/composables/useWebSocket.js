@@ -13,6 +13,30 @@ export function useWebSocket(baseUrl, endpoint = "data") {
   let currentSymbol = null;
   let reconnectTimeout = null;
   let fallbackUsed = false;
+  let seq = null; // Sequence number of the snapshot/delta last applied
+
+  function applyMessage(message) {
+    if (seq !== null && message.seq <= seq) return; // Already have it
+    if (message.type === "snapshot") {
+      data.value = message.data;
+    } else {
+      // A delta needs its base (or anything newer); otherwise ask for a snapshot
+      if (seq === null || seq < message.base) {
+        socket.send(JSON.stringify({ type: "resync" }));
+        return;
+      }
+      const firstChanged = message.data.length ? message.data[0].timestamp : null;
+      data.value = data.value
+        .filter(
+          (row) =>
+            row.timestamp >= message.start &&
+            (firstChanged === null || row.timestamp < firstChanged)
+        )
+        .concat(message.data);
+    }
+    seq = message.seq;
+    isLoading.value = false;
+  }
 
   async function connect(symbol, options = { days: 90 }) {
     // Avoid multiple simultaneous connection attempts
@@ -41,7 +65,9 @@ export function useWebSocket(baseUrl, endpoint = "data") {
 
       // Create new WebSocket connection
       // Use the provided endpoint (data or raw-data)
-      const url = `${baseUrl}/ws/${endpoint}?ticker=${symbol}USDT&days=${options.days}`;
+      // protocol=2: full snapshot on subscribe, then only the changed candles
+      const url = `${baseUrl}/ws/${endpoint}?ticker=${symbol}USDT&days=${options.days}&protocol=2`;
+      seq = null;
       socket = new WebSocket(url);
 
       // Configure event handlers
@@ -58,8 +84,19 @@ export function useWebSocket(baseUrl, endpoint = "data") {
       socket.onmessage = (event) => {
         try {
           const json = JSON.parse(event.data);
+
+          // Answer keep-alive pings so the server doesn't reap the connection
+          if (json && json.type === "ping") {
+            socket.send(JSON.stringify({ type: "pong" }));
+            return;
+          }
           console.log(json);
 
+          if (json && (json.type === "snapshot" || json.type === "delta")) {
+            applyMessage(json);
+            return;
+          }
+
           // Check if data is valid
           if (Array.isArray(json) && json.length > 0) {
             console.log(